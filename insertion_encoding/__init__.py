@@ -1,22 +1,64 @@
 """Package for enumerating Cayley permutations and restricted growth functions
-using the insertion encodings."""
+using the insertion encodings.
 
-from .tilescope import (
-    HorizontalSearcher,
-    VerticalSearcher,
-    RGFHorizontalSearcher,
-    RGFVerticalSearcher,
-    MatchingHorizontalSearcher,
-)
-from .vatters_method import (
-    VatterVerticalSearcher,
-    VatterHorizontalSearcher,
-    HorizontalConfiguration,
-)
+The attributes are loaded lazily, so importing the regularity checks does not
+import the searchers or comb_spec_searcher."""
+
+from typing import TYPE_CHECKING
+
+from ._lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from .tilescope import (
+        HorizontalSearcher,
+        VerticalSearcher,
+        RGFHorizontalSearcher,
+        RGFVerticalSearcher,
+        MatchingHorizontalSearcher,
+        MultiBasisSearcher,
+    )
+    from .vatters_method import (
+        VatterVerticalSearcher,
+        VatterHorizontalSearcher,
+        HorizontalConfiguration,
+        ConfigurationAutomaton,
+        Sampler,
+        read_automaton,
+        write_automaton,
+    )
+    from .check_regular import (
+        rgf_regular_vertical_insertion_encoding,
+        rgf_regular_horizontal_insertion_encoding,
+    )
+    from .spec_cache import SpecificationCache
+    from .budget import PartialSearchResult, SearchBudget
+    from .growth import GrowthMonitor
+    from .symmetries import search_orbits
 
-from .check_regular import (
-    rgf_regular_vertical_insertion_encoding,
-    rgf_regular_horizontal_insertion_encoding,
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "rgf_regular_vertical_insertion_encoding": ".check_regular",
+        "rgf_regular_horizontal_insertion_encoding": ".check_regular",
+        "HorizontalSearcher": ".tilescope",
+        "VerticalSearcher": ".tilescope",
+        "RGFHorizontalSearcher": ".tilescope",
+        "RGFVerticalSearcher": ".tilescope",
+        "MatchingHorizontalSearcher": ".tilescope",
+        "MultiBasisSearcher": ".tilescope",
+        "VatterVerticalSearcher": ".vatters_method",
+        "VatterHorizontalSearcher": ".vatters_method",
+        "HorizontalConfiguration": ".vatters_method",
+        "ConfigurationAutomaton": ".vatters_method",
+        "Sampler": ".vatters_method",
+        "read_automaton": ".vatters_method",
+        "write_automaton": ".vatters_method",
+        "SpecificationCache": ".spec_cache",
+        "SearchBudget": ".budget",
+        "PartialSearchResult": ".budget",
+        "GrowthMonitor": ".growth",
+        "search_orbits": ".symmetries",
+    },
 )
 
 __all__ = [
@@ -27,7 +69,17 @@ __all__ = [
     "RGFHorizontalSearcher",
     "RGFVerticalSearcher",
     "MatchingHorizontalSearcher",
+    "MultiBasisSearcher",
     "VatterVerticalSearcher",
     "VatterHorizontalSearcher",
     "HorizontalConfiguration",
+    "ConfigurationAutomaton",
+    "Sampler",
+    "read_automaton",
+    "write_automaton",
+    "SpecificationCache",
+    "SearchBudget",
+    "PartialSearchResult",
+    "GrowthMonitor",
+    "search_orbits",
 ]
@@ -0,0 +1,38 @@
+"""Lazy loading of the attributes of a package, as described in PEP 562.
+
+The searchers import comb_spec_searcher and gridded_cayley_permutations,
+which take much longer to import than the regularity checks, so the packages
+only import the module defining an attribute when it is first used."""
+
+import importlib
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_attributes(
+    package: str, attributes: Dict[str, str]
+) -> Tuple[Callable[[str], object], Callable[[], List[str]]]:
+    """Returns the module level __getattr__ and __dir__ of a package whose
+    attributes are imported from the relative module given for each name when
+    first used. Subpackages and modules of the package are also imported on
+    attribute access."""
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str) -> object:
+        if name in attributes:
+            value = getattr(importlib.import_module(attributes[name], package), name)
+        else:
+            try:
+                value = importlib.import_module(f".{name}", package)
+            except ModuleNotFoundError as error:
+                if error.name != f"{package}.{name}":
+                    raise
+                raise AttributeError(
+                    f"module {package!r} has no attribute {name!r}"
+                ) from None
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(attributes))
+
+    return __getattr__, __dir__
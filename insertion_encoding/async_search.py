@@ -0,0 +1,138 @@
+"""Running searches from an asyncio event loop.
+
+Each search runs in its own subprocess, the insertion-encoding command line
+tool with --progress, so a search never blocks the event loop and many can run
+at once without a thread each. The events the subprocess prints are yielded
+as they arrive. If the task consuming them is cancelled, or the iteration is
+closed early, the subprocess is killed and waited for."""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from .budget import SearchBudget
+from .cli import MAX_EXPANSION_TIME
+
+Event = Dict[str, Any]
+
+# The specification is sent as a single line of JSON, which can be long.
+LINE_LIMIT = 2**30
+
+
+async def search_events(
+    basis: str,
+    searcher: str = "vertical",
+    max_expansion_time: int = MAX_EXPANSION_TIME,
+    progress_interval: float = 1.0,
+    cache: Optional[str | Path] = None,
+    budget: Optional[SearchBudget] = None,
+    stop_on_growth: bool = False,
+) -> AsyncIterator[Event]:
+    """Searches for a specification of the class in a subprocess, yielding
+    a progress event, with the time elapsed and the number of classes found,
+    queued and expanded and of rules found, every progress_interval seconds.
+    The last event is {"event": "result", "result": {"specification": ...}}
+    or {"event": "error", "error": ...}, and if the search exceeds the budget,
+    or its growth is unbounded when stop_on_growth is set, the result is
+    {"partial": ...} instead.
+
+    The searcher is one of the names in insertion_encoding.cli.SEARCHERS.
+    To kill the subprocess as soon as the iteration stops early, iterate
+    inside contextlib.aclosing."""
+    command = [
+        sys.executable,
+        "-m",
+        "insertion_encoding.cli",
+        "search",
+        basis,
+        "--searcher",
+        searcher,
+        "--max-expansion-time",
+        str(max_expansion_time),
+        "--progress",
+        str(progress_interval),
+    ]
+    if cache is not None:
+        command += ["--cache", str(cache)]
+    if budget is not None:
+        for field, value in budget.to_jsonable().items():
+            if value is not None:
+                command += [f"--{field.replace('_', '-')}", str(value)]
+    if stop_on_growth:
+        command.append("--stop-on-growth")
+    process = await asyncio.create_subprocess_exec(
+        *command,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        limit=LINE_LIMIT,
+    )
+    assert process.stdout is not None and process.stderr is not None
+    errors = asyncio.ensure_future(process.stderr.read())
+    finished = False
+    try:
+        async for line in process.stdout:
+            event = json.loads(line)
+            finished = event["event"] in ("result", "error")
+            yield event
+        await process.wait()
+        if not finished:
+            message = (await errors).decode().strip().splitlines()
+            yield {
+                "event": "error",
+                "error": message[-1]
+                if message
+                else f"The search exited with status {process.returncode}.",
+            }
+    finally:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        errors.cancel()
+
+
+async def async_search(
+    basis: str,
+    searcher: str = "vertical",
+    max_expansion_time: int = MAX_EXPANSION_TIME,
+    progress: Optional[Callable[[Event], None]] = None,
+    progress_interval: float = 1.0,
+    cache: Optional[str | Path] = None,
+    budget: Optional[SearchBudget] = None,
+    stop_on_growth: bool = False,
+):
+    """Returns the InsertionEncodingSpecification found for the class by a
+    search in a subprocess, calling progress with each progress event. A
+    ValueError is raised if the search fails or is stopped early.
+    Cancelling the task awaiting this kills the subprocess."""
+    # pylint: disable=import-outside-toplevel
+    from comb_spec_searcher import CombinatorialSpecification
+
+    from .enumeration import InsertionEncodingSpecification
+
+    events = search_events(
+        basis,
+        searcher,
+        max_expansion_time,
+        progress_interval,
+        cache,
+        budget,
+        stop_on_growth,
+    )
+    try:
+        async for event in events:
+            if event["event"] == "result":
+                if "partial" in event["result"]:
+                    raise ValueError(event["result"]["partial"]["reason"])
+                spec = CombinatorialSpecification.from_dict(
+                    event["result"]["specification"]
+                )
+                return InsertionEncodingSpecification.from_specification(spec)
+            if event["event"] == "error":
+                raise ValueError(event["error"])
+            if progress is not None:
+                progress(event)
+    finally:
+        await events.aclose()
+    raise ValueError("The search ended without a result.")
@@ -0,0 +1,112 @@
+"""Resource budgets for searches.
+
+A search with a SearchBudget stops when it uses more resident memory, finds
+more classes or rules, or spends longer applying strategies while expanding
+one class than the budget allows, and the searcher returns a
+PartialSearchResult describing the search so far instead of a specification.
+The budget is checked between the rules found, so a single strategy
+application which never yields a rule can not be interrupted. Memory is that
+of the whole process, so a search sharing its process with other work should
+be given a larger budget."""
+
+from typing import Any, Dict, Optional, Tuple
+
+
+def _format(value: float) -> str:
+    return f"{value:.3g}" if isinstance(value, float) else f"{value:,}"
+
+
+class SearchBudget:
+    """The limits on a search, each of which is unlimited if None.
+
+    Example:
+    >>> SearchBudget(max_classes=10).exceeded({"classes": 11, "rules": 3})[0]
+    'max_classes'
+    """
+
+    def __init__(
+        self,
+        max_memory: Optional[int] = None,
+        max_classes: Optional[int] = None,
+        max_rules: Optional[int] = None,
+        max_class_seconds: Optional[float] = None,
+    ):
+        self.max_memory = max_memory
+        self.max_classes = max_classes
+        self.max_rules = max_rules
+        self.max_class_seconds = max_class_seconds
+
+    def exceeded(self, statistics: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """Returns the name of the first limit exceeded by the statistics of a
+        search, with a message describing it, or None if all of them hold."""
+        for name, key, description in (
+            ("max_memory", "memory", "bytes of memory"),
+            ("max_classes", "classes", "classes"),
+            ("max_rules", "rules", "rules"),
+            ("max_class_seconds", "class_seconds", "seconds expanding one class"),
+        ):
+            limit = getattr(self, name)
+            if limit is not None and statistics.get(key, 0) > limit:
+                return name, (
+                    f"The search used {_format(statistics[key])} {description}, "
+                    f"more than the budget of {_format(limit)}."
+                )
+        return None
+
+    def to_jsonable(self) -> dict:
+        """Return a dictionary form of the budget."""
+        return {
+            "max_memory": self.max_memory,
+            "max_classes": self.max_classes,
+            "max_rules": self.max_rules,
+            "max_class_seconds": self.max_class_seconds,
+        }
+
+    def __repr__(self) -> str:
+        limits = ", ".join(
+            f"{name}={value!r}"
+            for name, value in self.to_jsonable().items()
+            if value is not None
+        )
+        return f"SearchBudget({limits})"
+
+
+class PartialSearchResult:
+    """The state of a search stopped because it exceeded its budget, or
+    because its growth was unbounded: the limit exceeded ("growth" for
+    unbounded growth), a message describing it and the statistics of the
+    search, with the metrics of the strategies if the searcher is
+    instrumented."""
+
+    def __init__(
+        self,
+        exceeded: str,
+        reason: str,
+        statistics: Dict[str, Any],
+        metrics: Optional[dict] = None,
+    ):
+        self.exceeded = exceeded
+        self.reason = reason
+        self.statistics = statistics
+        self.metrics = metrics
+
+    def to_jsonable(self) -> dict:
+        """Return a dictionary form of the result."""
+        return {
+            "exceeded": self.exceeded,
+            "reason": self.reason,
+            "statistics": self.statistics,
+            "metrics": self.metrics,
+        }
+
+    def __str__(self) -> str:
+        return self.reason
+
+
+class SearchStopped(Exception):
+    """Raised inside a search to stop it when it exceeds its budget or grows
+    without bound."""
+
+    def __init__(self, result: PartialSearchResult):
+        super().__init__(result.reason)
+        self.result = result
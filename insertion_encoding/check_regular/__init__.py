@@ -2,12 +2,28 @@
 on Cayley permutations, restricted growth functions and restricted
 growth functions of mapplings are regular."""
 
-from .check_regular_hori import (
-    rgf_regular_horizontal_insertion_encoding,
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from .check_regular_hori import (
+        rgf_regular_horizontal_insertion_encoding,
+    )
+    from .rgf_vert_regular_check import rgf_regular_vertical_insertion_encoding
+    from .census import census
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "rgf_regular_horizontal_insertion_encoding": ".check_regular_hori",
+        "rgf_regular_vertical_insertion_encoding": ".rgf_vert_regular_check",
+        "census": ".census",
+    },
 )
-from .rgf_vert_regular_check import rgf_regular_vertical_insertion_encoding
 
 __all__ = [
     "rgf_regular_horizontal_insertion_encoding",
     "rgf_regular_vertical_insertion_encoding",
+    "census",
 ]
@@ -0,0 +1,202 @@
+"""Counting the classes whose basis is drawn from a set of patterns and which
+have a regular insertion encoding.
+
+Only antichains are visited, that is bases in which no pattern contains
+another, so every class is counted exactly once. Having a regular insertion
+encoding is closed under taking subclasses, so adding patterns to a basis can
+only make it regular. The search uses this in both directions: once a basis
+is regular every basis extending it is counted without being checked, and if
+a basis together with every pattern which could still be added to it is not
+regular, none of its extensions are checked.
+
+The search is split into shards by the first pattern of the basis, which are
+run in separate processes, and the tallies of each shard are appended to a
+JSON lines file as they finish so an interrupted census can be resumed."""
+
+import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from cayley_permutations import CayleyPermutation
+from check_regular_ins_enc import (
+    regular_horizontal_insertion_encoding,
+    regular_vertical_insertion_encoding,
+)
+
+from .check_regular_hori import rgf_regular_horizontal_insertion_encoding
+from .rgf_vert_regular_check import rgf_regular_vertical_insertion_encoding
+
+CHECKS: Dict[str, Callable[[Tuple[CayleyPermutation, ...]], bool]] = {
+    "vertical": regular_vertical_insertion_encoding,
+    "horizontal": regular_horizontal_insertion_encoding,
+    "RGF vertical": rgf_regular_vertical_insertion_encoding,
+    "RGF horizontal": rgf_regular_horizontal_insertion_encoding,
+}
+
+UNKNOWN, SATISFIED, IMPOSSIBLE = 0, 1, 2
+
+
+def comparabilities(
+    patterns: Tuple[CayleyPermutation, ...]
+) -> Tuple[FrozenSet[int], ...]:
+    """Returns for each pattern the indices of the other patterns which it
+    contains or is contained in."""
+    comparable: List[set] = [set() for _ in patterns]
+    for i, patt in enumerate(patterns):
+        for j in range(i + 1, len(patterns)):
+            other = patterns[j]
+            if patt.contains([other]) or other.contains([patt]):
+                comparable[i].add(j)
+                comparable[j].add(i)
+    return tuple(frozenset(indices) for indices in comparable)
+
+
+class _Shard:
+    """The search of the antichains whose first pattern is given."""
+
+    def __init__(
+        self,
+        patterns: Tuple[CayleyPermutation, ...],
+        comparable: Tuple[FrozenSet[int], ...],
+        checks: Tuple[str, ...],
+    ):
+        self.patterns = patterns
+        self.comparable = comparable
+        self.checks = checks
+        self.tallies = dict.fromkeys(("total", "any") + checks, 0)
+        self._antichains: Dict[Tuple[int, ...], int] = {}
+
+    def count_antichains(self, remaining: Tuple[int, ...]) -> int:
+        """Returns the number of antichains, including the empty one, among
+        the patterns with the given indices."""
+        if remaining in self._antichains:
+            return self._antichains[remaining]
+        for idx in remaining:
+            if self.comparable[idx].intersection(remaining):
+                break
+        else:
+            return 2 ** len(remaining)
+        without = tuple(i for i in remaining if i != idx)
+        with_idx = tuple(i for i in without if i not in self.comparable[idx])
+        count = self.count_antichains(without) + self.count_antichains(with_idx)
+        self._antichains[remaining] = count
+        return count
+
+    def _check(self, check: str, indices: Iterable[int]) -> bool:
+        return CHECKS[check](tuple(self.patterns[i] for i in indices))
+
+    def tally(
+        self,
+        basis: Tuple[int, ...],
+        remaining: Tuple[int, ...],
+        statuses: Tuple[int, ...],
+    ) -> None:
+        """Tallies the antichains made of the basis and any antichain among
+        the remaining patterns."""
+        statuses = tuple(
+            SATISFIED if status == UNKNOWN and self._check(check, basis) else status
+            for check, status in zip(self.checks, statuses)
+        )
+        statuses = tuple(
+            (
+                IMPOSSIBLE
+                if status == UNKNOWN and not self._check(check, basis + remaining)
+                else status
+            )
+            for check, status in zip(self.checks, statuses)
+        )
+        if UNKNOWN in statuses:
+            self._add(statuses, 1)
+            for idx, patt in enumerate(remaining):
+                self.tally(
+                    basis + (patt,),
+                    tuple(
+                        other
+                        for other in remaining[idx + 1 :]
+                        if other not in self.comparable[patt]
+                    ),
+                    statuses,
+                )
+        else:
+            self._add(statuses, self.count_antichains(remaining))
+
+    def _add(self, statuses: Tuple[int, ...], num: int) -> None:
+        self.tallies["total"] += num
+        if SATISFIED in statuses:
+            self.tallies["any"] += num
+        for check, status in zip(self.checks, statuses):
+            if status == SATISFIED:
+                self.tallies[check] += num
+
+
+def _census_shard(
+    patterns: Tuple[CayleyPermutation, ...],
+    comparable: Tuple[FrozenSet[int], ...],
+    checks: Tuple[str, ...],
+    first: int,
+) -> Dict[str, int]:
+    shard = _Shard(patterns, comparable, checks)
+    remaining = tuple(
+        idx for idx in range(first + 1, len(patterns)) if idx not in comparable[first]
+    )
+    shard.tally((first,), remaining, tuple(UNKNOWN for _ in checks))
+    return shard.tallies
+
+
+def census(
+    patterns: Iterable[CayleyPermutation],
+    checks: Iterable[str] = ("vertical", "horizontal"),
+    output: Optional[str | Path] = None,
+    processes: Optional[int] = None,
+) -> Dict[str, int]:
+    """Counts the non-empty bases drawn from the patterns, and those for which
+    each of the checks in CHECKS is satisfied, with "any" counting the bases
+    satisfying at least one of them.
+
+    If output is given, the tallies of each shard are appended to it as a
+    line of JSON, and shards already in the file from a census with the same
+    checks are not searched again, so the file should only be reused for the
+    same patterns.
+
+    Example:
+    >>> census(CayleyPermutation.of_size(2), ["vertical"], processes=1)["total"]
+    7
+    """
+    patterns = tuple(
+        sorted(set(patterns), key=lambda cperm: (len(cperm), tuple(cperm)))
+    )
+    checks = tuple(checks)
+    for check in checks:
+        if check not in CHECKS:
+            raise ValueError(f"Unknown check {check}, expected one of {list(CHECKS)}")
+    comparable = comparabilities(patterns)
+    tallies = dict.fromkeys(("total", "any") + checks, 0)
+    done = set()
+    if output is not None and Path(output).exists():
+        with open(output, encoding="utf-8") as fp:
+            for line in fp:
+                record = json.loads(line)
+                if record["checks"] == list(checks):
+                    done.add(tuple(record["pattern"]))
+                    for key, num in record["tallies"].items():
+                        tallies[key] += num
+    todo = [idx for idx, patt in enumerate(patterns) if tuple(patt) not in done]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = {
+            executor.submit(_census_shard, patterns, comparable, checks, idx): idx
+            for idx in todo
+        }
+        for future in as_completed(futures):
+            shard_tallies = future.result()
+            for key, num in shard_tallies.items():
+                tallies[key] += num
+            if output is not None:
+                record = {
+                    "pattern": list(patterns[futures[future]]),
+                    "checks": list(checks),
+                    "tallies": shard_tallies,
+                }
+                with open(output, "a", encoding="utf-8") as fp:
+                    fp.write(json.dumps(record) + "\n")
+    return tallies
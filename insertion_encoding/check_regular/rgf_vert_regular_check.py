@@ -1,4 +1,21 @@
-"""Functions to check if a basis of a RGF class has a regular insertion encoding."""
+"""Functions to check if a basis of a RGF class has a regular insertion encoding.
+
+A basis gives a regular encoding if each of the predicates in PREDICATES is
+satisfied by some pattern in the basis. The predicates satisfied by a pattern
+are computed together and stored as the bits of a mask, so checking a basis is
+the bitwise or of the masks of its patterns. The prefix scans shared by the
+grid predicates are done in one pass over the pattern, while the predicates
+imported from check_regular_ins_enc are called on the pieces it finds.
+
+The masks of all short patterns can be written to a table with
+write_predicate_table. A table at PREDICATE_TABLE_PATH, in the same directory
+as the SpecificationCache by default, is loaded the first time a mask is
+needed, and others can be loaded with load_predicate_table."""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Iterable
 
 from cayley_permutations import string_to_basis, CayleyPermutation
 from check_regular_ins_enc.check_regular_vert import (
@@ -12,6 +29,10 @@ from check_regular_ins_enc.check_regular_vert import (
 )
 from check_regular_ins_enc.check_regular_hori import is_decreasing
 
+PREDICATE_TABLE_PATH = (
+    Path.home() / ".cache" / "insertion_encoding" / "predicate_table.json"
+)
+
 
 def rgf_regular_vertical_insertion_encoding(
     basis: str | tuple[CayleyPermutation, ...],
@@ -23,46 +44,140 @@ def rgf_regular_vertical_insertion_encoding(
     True
     """
     basis = string_to_basis(basis) if isinstance(basis, str) else basis
-    if not check_jux(basis):
-        return False
-    if not check_greedy_grids(basis):
-        return False
-    if not check_grids(basis):
-        return False
-    return True
+    return basis_mask(basis) == FULL_MASK
 
 
 def check_grids(basis: tuple[CayleyPermutation, ...]) -> bool:
     """checks for the grid classes"""
-    if not any(grid_dec_dec(list(cperm)) for cperm in basis):
-        return False
-    if not any(grid_inc_dec(list(cperm)) for cperm in basis):
-        return False
-    if not any(grid_inc_con(list(cperm)) for cperm in basis):
-        return False
-    if not any(grid_dec_con(list(cperm)) for cperm in basis):
-        return False
-    return True
+    return basis_mask(basis) & GRIDS_MASK == GRIDS_MASK
 
 
 def check_greedy_grids(basis: tuple[CayleyPermutation, ...]) -> bool:
     """Checks for the grid classes which are greedy left gridded."""
-    if not any(greedy_grid_left(list(cperm), 0) for cperm in basis):
-        return False
-    if not any(greedy_grid_left(list(cperm), 1) for cperm in basis):
-        return False
-    return True
+    return basis_mask(basis) & GREEDY_GRIDS_MASK == GREEDY_GRIDS_MASK
 
 
 def check_jux(basis: tuple[CayleyPermutation, ...]) -> bool:
     """Checks for the vertical juxtapositions"""
-    if not any(con_dec(list(cperm)) for cperm in basis):
-        return False
-    if not any(con_con(list(cperm)) for cperm in basis):
-        return False
-    if not any(con_inc(list(cperm)) for cperm in basis):
-        return False
-    return True
+    return basis_mask(basis) & JUX_MASK == JUX_MASK
+
+
+def basis_mask(basis: Iterable[CayleyPermutation]) -> int:
+    """Returns the bitwise or of the masks of the patterns in the basis, stopping
+    early once every predicate is satisfied."""
+    mask = 0
+    for cperm in basis:
+        mask |= pattern_mask(cperm)
+        if mask == FULL_MASK:
+            break
+    return mask
+
+
+def pattern_mask(cperm: Iterable[int]) -> int:
+    """Returns the mask with a bit set for each predicate satisfied by the pattern.
+
+    Example:
+    >>> masks = pattern_mask(CayleyPermutation([0, 1])), pattern_mask([1, 0])
+    >>> masks[0] | masks[1] == FULL_MASK
+    True
+    """
+    if not _TABLE_LOADED:
+        _load_default_table()
+    key = tuple(cperm)
+    mask = _PREDICATE_TABLE.get(key)
+    if mask is None:
+        mask = _pattern_mask(key)
+    return mask
+
+
+@lru_cache(maxsize=2**20)
+def _pattern_mask(key: tuple[int, ...]) -> int:
+    """Returns the mask of the pattern, scanning it once for the end of its
+    increasing prefix and the first index of its maximum, which are where
+    greedy_grid_left, grid_inc_con and grid_dec_con split it."""
+    seq = list(key)
+    size = len(seq)
+    mask = 0
+    if con_dec(seq):
+        mask |= 0b000000001
+    if con_con(seq):
+        mask |= 0b000000010
+    if con_inc(seq):
+        mask |= 0b000000100
+    if size < 3:
+        return mask | GREEDY_GRIDS_MASK | GRIDS_MASK
+    run = size
+    max_idx = 0
+    for idx in range(1, size):
+        if run == size and seq[idx - 1] >= seq[idx]:
+            run = idx
+        if seq[idx] > seq[max_idx]:
+            max_idx = idx
+    if run == size or size - run < 2:
+        mask |= GREEDY_GRIDS_MASK
+    else:
+        remaining = seq[run:]
+        if dec_inc(remaining, seq[run - 1]):
+            mask |= 0b000001000
+        if inc_inc(remaining, seq[run - 1]):
+            mask |= 0b000010000
+    reverse = seq[::-1]
+    if _grid_dec_dec(reverse):
+        mask |= 0b000100000
+    if _grid_inc_dec(reverse):
+        mask |= 0b001000000
+    remaining = seq[1:] if max_idx == 0 else seq[min(run, max_idx) :]
+    if inc_con(remaining):
+        mask |= 0b010000000
+    if dec_con(remaining):
+        mask |= 0b100000000
+    return mask
+
+
+def write_predicate_table(
+    path: str | Path = PREDICATE_TABLE_PATH, max_length: int = 7
+) -> None:
+    """Writes the masks of every Cayley permutation of length at most max_length
+    to a JSON file which can be loaded with load_predicate_table. By default
+    the table is written to PREDICATE_TABLE_PATH, to be loaded on first use."""
+    path = Path(path).expanduser()
+    masks = {
+        ",".join(map(str, cperm)): pattern_mask(cperm)
+        for length in range(max_length + 1)
+        for cperm in CayleyPermutation.of_size(length)
+    }
+    table = {
+        "predicates": [name for name, _ in PREDICATES],
+        "max_length": max_length,
+        "masks": masks,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fp:
+        json.dump(table, fp)
+
+
+def load_predicate_table(path: str | Path) -> None:
+    """Loads a table written by write_predicate_table so the masks of the
+    patterns in it are looked up rather than computed."""
+    with open(path, encoding="utf-8") as fp:
+        table = json.load(fp)
+    if table["predicates"] != [name for name, _ in PREDICATES]:
+        raise ValueError(f"The predicate table at {path} is out of date.")
+    _PREDICATE_TABLE.update(
+        (tuple(int(val) for val in cperm.split(",") if val), mask)
+        for cperm, mask in table["masks"].items()
+    )
+
+
+def _load_default_table() -> None:
+    global _TABLE_LOADED  # pylint: disable=global-statement
+    _TABLE_LOADED = True
+    if PREDICATE_TABLE_PATH.exists():
+        try:
+            load_predicate_table(PREDICATE_TABLE_PATH)
+        except ValueError:
+            # A table for other predicates is ignored and the masks computed.
+            pass
 
 
 def greedy_grid_left(cperm: list[int], type_of_seq: int) -> bool:
@@ -142,7 +257,11 @@ def grid_inc_dec(cperm: list[int]) -> bool:
     (everything in grids)."""
     if len(cperm) < 3:
         return True
-    cperm = cperm[::-1]
+    return _grid_inc_dec(cperm[::-1])
+
+
+def _grid_inc_dec(cperm: list[int]) -> bool:
+    """grid_inc_dec of the reverse of the sequence."""
     middle_val = cperm[0]
     last_val_top = middle_val
     last_val_bottom = middle_val
@@ -170,10 +289,14 @@ def grid_dec_dec(cperm: list[int]) -> bool:
     """Returns True if the sequence is decreasing on bottom
     and decreasing on top. with increasing sequence at the start
     (everything in grids)."""
-    # pylint: disable=too-many-branches
     if len(cperm) < 3:
         return True
-    cperm = cperm[::-1]
+    return _grid_dec_dec(cperm[::-1])
+
+
+def _grid_dec_dec(cperm: list[int]) -> bool:
+    """grid_dec_dec of the reverse of the sequence."""
+    # pylint: disable=too-many-branches
     top_seq = []
     bottom_seq = []
     idx = 0
@@ -208,3 +331,23 @@ def grid_dec_dec(cperm: list[int]) -> bool:
     if not is_decreasing(remaining) or not line > max(remaining):
         return False
     return True
+
+
+PREDICATES: tuple[tuple[str, Callable[[list[int]], bool]], ...] = (
+    ("con_dec", con_dec),
+    ("con_con", con_con),
+    ("con_inc", con_inc),
+    ("greedy_grid_left_dec", lambda cperm: greedy_grid_left(cperm, 0)),
+    ("greedy_grid_left_inc", lambda cperm: greedy_grid_left(cperm, 1)),
+    ("grid_dec_dec", grid_dec_dec),
+    ("grid_inc_dec", grid_inc_dec),
+    ("grid_inc_con", grid_inc_con),
+    ("grid_dec_con", grid_dec_con),
+)
+JUX_MASK = 0b000000111
+GREEDY_GRIDS_MASK = 0b000011000
+GRIDS_MASK = 0b111100000
+FULL_MASK = JUX_MASK | GREEDY_GRIDS_MASK | GRIDS_MASK
+
+_PREDICATE_TABLE: dict[tuple[int, ...], int] = {}
+_TABLE_LOADED = False
@@ -0,0 +1,454 @@
+"""The insertion-encoding command line tool.
+
+The subcommands check, search, count and validate each answer one request and
+print the result as JSON. The serve subcommand answers many requests: it
+starts a pool of worker processes which import the searchers once, and
+accepts JSON requests on a Unix socket, one per line, or over HTTP, one per
+POST. A request is an object with a "command" and the arguments of that
+command, for example
+    {"command": "count", "basis": "12_11", "searcher": "vatter-horizontal", "n": 10}
+and is answered with {"id": ..., "result": ...} or {"id": ..., "error": ...},
+where the id is copied from the request.
+
+With --progress, the search, count and validate subcommands print a JSON
+line describing the state of the search every so many seconds, and then a
+line {"event": "result", "result": ...} or {"event": "error", "error": ...}."""
+
+import argparse
+import json
+import logging
+import os
+import socketserver
+import stat
+import sys
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib import import_module
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .budget import PartialSearchResult, SearchBudget
+from .growth import GrowthMonitor
+
+logger = logging.getLogger(__name__)
+
+SEARCHERS = {
+    "vertical": "VerticalSearcher",
+    "horizontal": "HorizontalSearcher",
+    "rgf-vertical": "RGFVerticalSearcher",
+    "rgf-horizontal": "RGFHorizontalSearcher",
+    "matching-horizontal": "MatchingHorizontalSearcher",
+    "vatter-vertical": "VatterVerticalSearcher",
+    "vatter-horizontal": "VatterHorizontalSearcher",
+}
+DEFAULT_CHECKS = ("vertical", "horizontal")
+MAX_EXPANSION_TIME = 600
+BUDGET_FIELDS = ("max_memory", "max_classes", "max_rules", "max_class_seconds")
+
+Request = Dict[str, Any]
+Progress = Optional[Callable[[Dict[str, Any]], None]]
+
+
+def _field(request: Request, name: str, default: Any = None) -> Any:
+    if name in request:
+        return request[name]
+    if default is None:
+        raise ValueError(f"The request has no {name}.")
+    return default
+
+
+def _searcher(request: Request, progress: Progress = None):
+    """Returns the searcher for the basis of the request, reporting its
+    progress to the callback if one is given. If the request has
+    stop_on_growth the search is stopped when its growth is unbounded."""
+    name = _field(request, "searcher", "vertical")
+    if name not in SEARCHERS:
+        raise ValueError(f"Unknown searcher {name}, expected one of {list(SEARCHERS)}.")
+    package = import_module("insertion_encoding")
+    cache = None
+    if request.get("cache") is not None:
+        cache = package.SpecificationCache(request["cache"])
+    budget = None
+    if any(request.get(field) is not None for field in BUDGET_FIELDS):
+        budget = SearchBudget(**{field: request.get(field) for field in BUDGET_FIELDS})
+    return getattr(package, SEARCHERS[name])(
+        _field(request, "basis"),
+        cache=cache,
+        progress=progress,
+        progress_interval=_field(request, "progress_interval", 1.0),
+        budget=budget,
+        growth=GrowthMonitor() if request.get("stop_on_growth") else None,
+    )
+
+
+def _auto_search(request: Request, progress: Progress):
+    return _searcher(request, progress).auto_search(
+        max_expansion_time=_field(request, "max_expansion_time", MAX_EXPANSION_TIME)
+    )
+
+
+def check(request: Request, progress: Progress = None) -> Dict[str, bool]:
+    """Returns whether the class has a regular insertion encoding of each of
+    the types in the checks of the request."""
+    # pylint: disable=import-outside-toplevel
+    from cayley_permutations import string_to_basis
+
+    from .check_regular.census import CHECKS
+
+    basis = string_to_basis(_field(request, "basis"))
+    result = {}
+    for name in _field(request, "checks", DEFAULT_CHECKS):
+        if name not in CHECKS:
+            raise ValueError(f"Unknown check {name}, expected one of {list(CHECKS)}.")
+        result[name] = bool(CHECKS[name](basis))
+    return result
+
+
+def search(request: Request, progress: Progress = None) -> Dict[str, Any]:
+    """Returns the specification found for the class, or the partial result
+    if the search is stopped by its budget or its growth."""
+    spec = _auto_search(request, progress)
+    if isinstance(spec, PartialSearchResult):
+        return {"partial": spec.to_jsonable()}
+    return {"specification": spec.to_jsonable()}
+
+
+def count(request: Request, progress: Progress = None) -> Dict[str, List[int]]:
+    """Returns the number of objects in the class of each size less than n."""
+    return {
+        "counts": _searcher(request, progress).counts(
+            _field(request, "n"),
+            max_expansion_time=_field(
+                request, "max_expansion_time", MAX_EXPANSION_TIME
+            ),
+            modulus=request.get("modulus"),
+        )
+    }
+
+
+def validate(request: Request, progress: Progress = None) -> Dict[str, bool]:
+    """Returns whether the specification found for the class agrees with
+    generating the objects of each size up to the length by brute force."""
+    spec = _auto_search(request, progress)
+    if isinstance(spec, PartialSearchResult):
+        raise ValueError(spec.reason)
+    return {"valid": bool(spec.sanity_check(_field(request, "length", 5)))}
+
+
+COMMANDS: Dict[str, Callable[[Request, Progress], Any]] = {
+    "check": check,
+    "search": search,
+    "count": count,
+    "validate": validate,
+}
+
+
+def handle(request: Request, progress: Progress = None) -> Dict[str, Any]:
+    """Answers a request, reporting invalid requests, classes which can not
+    be enumerated and searches which fail as an error. The progress of any
+    search is reported to the callback if one is given."""
+    if not isinstance(request, dict):
+        return {"id": None, "error": "A request must be a JSON object."}
+    response = {"id": request.get("id")}
+    try:
+        command = _field(request, "command")
+        if command not in COMMANDS:
+            raise ValueError(
+                f"Unknown command {command}, expected one of {list(COMMANDS)}."
+            )
+        response["result"] = COMMANDS[command](request, progress)
+    except (TypeError, ValueError, NotImplementedError) as error:
+        response["error"] = str(error)
+    except Exception as error:  # pylint: disable=broad-except
+        response["error"] = f"{type(error).__name__}: {error}"
+    return response
+
+
+def warm_up() -> None:
+    """Imports everything the commands use, so that the first request a
+    worker answers does not pay for it."""
+    package = import_module("insertion_encoding")
+    for name in SEARCHERS.values():
+        getattr(package, name)
+    import_module("insertion_encoding.check_regular.census")
+
+
+def _ready() -> int:
+    return os.getpid()
+
+
+class WorkerPool:
+    """A pool of worker processes, each warmed up before any request is
+    submitted. The keyword arguments are defaults for the fields of the
+    requests, such as a cache directory so that workers share the
+    specifications they find, or a budget for every search."""
+
+    def __init__(self, workers: Optional[int] = None, **defaults: Any):
+        self.defaults = {
+            key: value for key, value in defaults.items() if value is not None
+        }
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=warm_up
+        )
+        for future in [self.executor.submit(_ready) for _ in range(self.workers)]:
+            future.result()
+
+    def submit(self, request: Request) -> "Future[Dict[str, Any]]":
+        """Submits a request, returning a future of the response."""
+        if isinstance(request, dict):
+            request = {**self.defaults, **request}
+        return self.executor.submit(handle, request)
+
+    def run(self, request: Request) -> Dict[str, Any]:
+        """Returns the response to a request."""
+        try:
+            return self.submit(request).result()
+        except BrokenProcessPool as error:
+            request_id = request.get("id") if isinstance(request, dict) else None
+            return {"id": request_id, "error": f"The worker pool failed: {error}"}
+
+    def shutdown(self) -> None:
+        """Stops the workers once they finish their requests."""
+        self.executor.shutdown()
+
+
+def _respond(pool: WorkerPool, data: bytes) -> Dict[str, Any]:
+    try:
+        request = json.loads(data)
+    except ValueError as error:
+        return {"id": None, "error": f"Invalid JSON: {error}"}
+    return pool.run(request)
+
+
+class _SocketHandler(socketserver.StreamRequestHandler):
+    server: "_UnixServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = _respond(self.server.pool, line)
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, pool: WorkerPool):
+        self.pool = pool
+        super().__init__(path, _SocketHandler)
+
+
+class _HTTPHandler(BaseHTTPRequestHandler):
+    server: "_HTTPServer"
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        length = int(self.headers.get("Content-Length", 0))
+        response = _respond(self.server.pool, self.rfile.read(length))
+        body = json.dumps(response).encode()
+        self.send_response(400 if "error" in response else 200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # pylint: disable=redefined-builtin
+        logger.debug(format, *args)
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    def __init__(self, host: str, port: int, pool: WorkerPool):
+        self.pool = pool
+        super().__init__((host, port), _HTTPHandler)
+
+
+def make_server(
+    pool: WorkerPool,
+    socket_path: Optional[str] = None,
+    host: str = "127.0.0.1",
+    port: Optional[int] = None,
+) -> socketserver.BaseServer:
+    """Returns a server answering requests with the pool, on the Unix socket
+    if a path is given and otherwise over HTTP on the host and port. A stale
+    socket left at the path by a previous server is replaced."""
+    if socket_path is not None:
+        path = Path(socket_path)
+        if path.exists() and stat.S_ISSOCK(path.stat().st_mode):
+            path.unlink()
+        return _UnixServer(socket_path, pool)
+    if port is None:
+        raise ValueError("A server needs a socket path or a port.")
+    return _HTTPServer(host, port, pool)
+
+
+def serve(
+    socket_path: Optional[str] = None,
+    host: str = "127.0.0.1",
+    port: Optional[int] = None,
+    workers: Optional[int] = None,
+    **defaults: Any,
+) -> None:
+    """Answers requests until interrupted, with the defaults for the fields
+    of the requests."""
+    pool = WorkerPool(workers, **defaults)
+    server = make_server(pool, socket_path, host, port)
+    logger.info("Serving with %s warm workers", pool.workers)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.shutdown()
+        if socket_path is not None:
+            Path(socket_path).unlink(missing_ok=True)
+
+
+def _size(text: str) -> int:
+    """Parses a number of bytes with an optional suffix K, M or G."""
+    multiplier = 1024 ** (" KMG".find(text[-1].upper()) if text[-1].isalpha() else 0)
+    if multiplier < 1:
+        raise argparse.ArgumentTypeError(f"Invalid size {text}.")
+    return int(float(text.rstrip("KMGkmg")) * multiplier)
+
+
+def _add_budget_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--max-memory",
+        type=_size,
+        metavar="BYTES",
+        help="stop when the process uses more memory, e.g. 2G",
+    )
+    parser.add_argument(
+        "--max-classes", type=int, help="stop when more classes are found"
+    )
+    parser.add_argument("--max-rules", type=int, help="stop when more rules are found")
+    parser.add_argument(
+        "--max-class-seconds",
+        type=float,
+        metavar="SECONDS",
+        help="stop when expanding one class takes longer",
+    )
+    parser.add_argument(
+        "--stop-on-growth",
+        action="store_true",
+        default=None,
+        help="stop when the classes found keep growing or are rarely verified",
+    )
+
+
+def _add_searcher_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("basis", help="the basis, e.g. '231, 312, 2121'")
+    parser.add_argument("--searcher", choices=list(SEARCHERS), default="vertical")
+    parser.add_argument(
+        "--max-expansion-time", type=int, default=MAX_EXPANSION_TIME, metavar="SECONDS"
+    )
+    parser.add_argument(
+        "--cache", metavar="DIRECTORY", help="a specification cache directory"
+    )
+    _add_budget_arguments(parser)
+    parser.add_argument(
+        "--progress",
+        dest="progress_interval",
+        type=float,
+        nargs="?",
+        const=1.0,
+        metavar="SECONDS",
+        help="print the progress of the search as JSON lines, every second by default",
+    )
+
+
+def _print_event(event: Dict[str, Any]) -> None:
+    print(json.dumps(event), flush=True)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Returns the parser of the command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="insertion-encoding",
+        description="Enumerate classes of Cayley permutations with the insertion "
+        "encodings. Results are printed as JSON.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    check_parser = subparsers.add_parser(
+        "check", help="check if a class has a regular insertion encoding"
+    )
+    check_parser.add_argument("basis", help="the basis, e.g. '231, 312, 2121'")
+    check_parser.add_argument(
+        "--check",
+        dest="checks",
+        action="append",
+        help="a type of insertion encoding, vertical and horizontal by default",
+    )
+
+    search_parser = subparsers.add_parser(
+        "search", help="find a specification for a class"
+    )
+    _add_searcher_arguments(search_parser)
+
+    count_parser = subparsers.add_parser(
+        "count", help="count a class for each size less than n"
+    )
+    _add_searcher_arguments(count_parser)
+    count_parser.add_argument("n", type=int)
+    count_parser.add_argument("--modulus", type=int)
+
+    validate_parser = subparsers.add_parser(
+        "validate", help="compare a specification with brute force"
+    )
+    _add_searcher_arguments(validate_parser)
+    validate_parser.add_argument("--length", type=int, default=5)
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="answer JSON requests with a pool of warm workers"
+    )
+    address = serve_parser.add_mutually_exclusive_group(required=True)
+    address.add_argument("--socket", metavar="PATH", help="a Unix socket to listen on")
+    address.add_argument("--port", type=int, help="an HTTP port to listen on")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--workers", type=int, help="the number of workers")
+    serve_parser.add_argument(
+        "--cache", metavar="DIRECTORY", help="a specification cache directory"
+    )
+    _add_budget_arguments(serve_parser)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Runs the command line tool, returning the exit status."""
+    args = build_parser().parse_args(argv)
+    if args.command == "serve":
+        logging.basicConfig(level=logging.INFO)
+        serve(
+            args.socket,
+            args.host,
+            args.port,
+            args.workers,
+            cache=args.cache,
+            stop_on_growth=args.stop_on_growth,
+            **{field: getattr(args, field) for field in BUDGET_FIELDS},
+        )
+        return 0
+    request = {key: value for key, value in vars(args).items() if value is not None}
+    if "progress_interval" in request:
+        response = handle(request, _print_event)
+        if "error" in response:
+            _print_event({"event": "error", "error": response["error"]})
+            return 1
+        _print_event({"event": "result", "result": response["result"]})
+        return 0
+    response = handle(request)
+    if "error" in response:
+        print(response["error"], file=sys.stderr)
+        return 1
+    print(json.dumps(response["result"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
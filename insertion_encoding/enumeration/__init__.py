@@ -0,0 +1,43 @@
+"""Enumerating the classes with a specification found by the searchers."""
+
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from .asymptotics import Asymptotics, asymptotics, transfer_matrix
+    from .counting import InsertionEncodingSpecification, counts
+    from .recurrences import LinearRecurrence, berlekamp_massey
+    from .rational_genf import RationalGeneratingFunction, rational_generating_function
+    from .standalone import standalone_module, write_standalone_module
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "Asymptotics": ".asymptotics",
+        "asymptotics": ".asymptotics",
+        "transfer_matrix": ".asymptotics",
+        "InsertionEncodingSpecification": ".counting",
+        "counts": ".counting",
+        "LinearRecurrence": ".recurrences",
+        "berlekamp_massey": ".recurrences",
+        "RationalGeneratingFunction": ".rational_genf",
+        "rational_generating_function": ".rational_genf",
+        "standalone_module": ".standalone",
+        "write_standalone_module": ".standalone",
+    },
+)
+
+__all__ = [
+    "Asymptotics",
+    "asymptotics",
+    "transfer_matrix",
+    "InsertionEncodingSpecification",
+    "counts",
+    "LinearRecurrence",
+    "berlekamp_massey",
+    "RationalGeneratingFunction",
+    "rational_generating_function",
+    "standalone_module",
+    "write_standalone_module",
+]
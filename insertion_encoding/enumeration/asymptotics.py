@@ -0,0 +1,104 @@
+"""The growth rate and polynomial correction of the counting sequence.
+
+The counting sequence of a class with a rational generating function P/Q has
+the transfer matrix given by the companion matrix of Q, whose eigenvalues are
+the reciprocals of the roots of Q. If the dominant eigenvalue has modulus r and
+multiplicity m, the number of objects of size n grows like r^n n^(m-1). The
+eigenvalues are found with NumPy, and the multiplicity exactly, from the
+repeated factors of the characteristic polynomial."""
+
+from fractions import Fraction
+from typing import NamedTuple, Tuple
+
+from comb_spec_searcher import CombinatorialSpecification
+
+from .rational_genf import (
+    Poly,
+    RationalGeneratingFunction,
+    _divmod,
+    _gcd,
+    _trim,
+    rational_generating_function,
+)
+
+TOLERANCE = 1e-6
+
+
+class Asymptotics(NamedTuple):
+    """The number of objects of size n grows like growth_rate^n n^exponent."""
+
+    growth_rate: float
+    exponent: int
+
+
+def _characteristic_polynomial(genf: RationalGeneratingFunction) -> Poly:
+    """The monic polynomial whose roots are the reciprocals of the non-zero
+    roots of the denominator, from the constant term up."""
+    denominator = _trim(Fraction(coeff) for coeff in genf.denominator)
+    lowest = next(idx for idx, coeff in enumerate(denominator) if coeff)
+    denominator = denominator[lowest:]
+    return tuple(coeff / denominator[0] for coeff in reversed(denominator))
+
+
+def _companion(poly: Poly):
+    # pylint: disable=import-outside-toplevel
+    import numpy
+
+    order = len(poly) - 1
+    matrix = numpy.zeros((order, order))
+    if order:
+        matrix[0, :] = [-float(coeff) for coeff in reversed(poly[:-1])]
+        matrix[1:, :-1] = numpy.eye(order - 1)
+    return matrix
+
+
+def transfer_matrix(genf: RationalGeneratingFunction):
+    """Returns the transfer matrix of the counting sequence, the companion
+    matrix of its characteristic polynomial, as a NumPy array."""
+    return _companion(_characteristic_polynomial(genf))
+
+
+def _spectral_radius(poly: Poly) -> float:
+    """The largest modulus of a root of the polynomial. Repeated roots are
+    removed first as NumPy can only find them to the square root of the
+    machine precision."""
+    # pylint: disable=import-outside-toplevel
+    import numpy
+
+    poly = _divmod(poly, _gcd(poly, _derivative(poly)))[0]
+    if len(poly) <= 1:
+        return 0.0
+    return float(max(abs(numpy.linalg.eigvals(_companion(poly)))))
+
+
+def asymptotics(
+    spec: CombinatorialSpecification | RationalGeneratingFunction,
+) -> Asymptotics:
+    """Returns the growth rate and polynomial correction exponent of the
+    counting sequence of a specification or rational generating function.
+
+    Example:
+    >>> asymptotics(RationalGeneratingFunction((1,), (1, -4, 4)))
+    Asymptotics(growth_rate=2.0, exponent=1)
+    """
+    genf = (
+        spec
+        if isinstance(spec, RationalGeneratingFunction)
+        else rational_generating_function(spec)
+    )
+    characteristic = _characteristic_polynomial(genf)
+    growth_rate = _spectral_radius(characteristic)
+    if growth_rate == 0:
+        return Asymptotics(0.0, 0)
+    exponent = 0
+    repeated = characteristic
+    while len(repeated) > 1:
+        repeated = _gcd(repeated, _derivative(repeated))
+        if _spectral_radius(repeated) < growth_rate * (1 - TOLERANCE):
+            break
+        exponent += 1
+    return Asymptotics(growth_rate, exponent)
+
+
+def _derivative(poly: Poly) -> Tuple[Fraction, ...]:
+    return tuple(idx * coeff for idx, coeff in enumerate(poly))[1:]
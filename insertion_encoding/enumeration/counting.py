@@ -0,0 +1,215 @@
+"""Counting the objects of every size up to a bound in one pass.
+
+The specifications found by the searchers are built from disjoint unions and
+cartesian products, so the counting sequence of every class in a
+specification is a truncated power series which is either a sum or a product
+of the series of its children, or for a complement rule of a forest
+specification the difference of them. The series are extended one size at a
+time, with the classes at each size visited in an order in which the terms of
+that size they depend on have already been computed. The term of a quotient
+rule can need a larger term of its parent, so it is counted by the rule, as
+are the terms of verified classes."""
+
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from comb_spec_searcher import CombinatorialSpecification
+
+from .system import (
+    ATOM,
+    COMPLEMENT,
+    EMPTY,
+    INFINITY,
+    PRODUCT,
+    UNION,
+    SpecificationSystem,
+)
+
+if TYPE_CHECKING:
+    from .asymptotics import Asymptotics
+    from .rational_genf import RationalGeneratingFunction
+    from .recurrences import LinearRecurrence
+
+
+class _Counter(SpecificationSystem):
+    """The truncated power series of every class in a specification."""
+
+    def __init__(self, spec: CombinatorialSpecification, modulus: Optional[int]):
+        super().__init__(spec)
+        self.modulus = modulus
+        self.order = self._order()
+        self.series: Dict[int, List[int]] = {label: [] for label in self.labels}
+        self.partials: Dict[int, List[List[int]]] = {
+            label: [[] for _ in self.children[label][1:]]
+            for label in self.labels
+            if self.types[label] == PRODUCT
+        }
+
+    def _same_size_dependencies(self, label: int) -> List[int]:
+        """The children whose term of size n is needed for the term of size n."""
+        children = self.children[label]
+        if self.types[label] in (UNION, COMPLEMENT):
+            return children
+        if self.types[label] == PRODUCT:
+            return [
+                child
+                for idx, child in enumerate(children)
+                if all(
+                    self.min_sizes[other] == 0
+                    for jdx, other in enumerate(children)
+                    if jdx != idx
+                )
+            ]
+        return []
+
+    def _order(self) -> List[int]:
+        """The labels ordered so that each comes after its same size dependencies."""
+        order: List[int] = []
+        state: Dict[int, int] = {}
+        for start in self.labels:
+            if start in state:
+                continue
+            stack = [(start, iter(self._same_size_dependencies(start)))]
+            state[start] = 1
+            while stack:
+                label, dependencies = stack[-1]
+                for child in dependencies:
+                    if state.get(child) == 1:
+                        raise ValueError(
+                            "The specification is not productive, the class "
+                            f"{child} depends on itself at the same size."
+                        )
+                    if child not in state:
+                        state[child] = 1
+                        stack.append((child, iter(self._same_size_dependencies(child))))
+                        break
+                else:
+                    stack.pop()
+                    state[label] = 2
+                    order.append(label)
+        return order
+
+    def _reduce(self, value: int) -> int:
+        return value if self.modulus is None else value % self.modulus
+
+    def _extend_partial(self, label: int, idx: int, size: float) -> None:
+        """Extends the product of the first idx + 1 children of the rule up to
+        the given size. The terms of the product of the first idx children and
+        of the child idx that this uses have already been computed."""
+        children = self.children[label]
+        if idx == 0:
+            return
+        previous = (
+            self.series[children[0]] if idx == 1 else self.partials[label][idx - 2]
+        )
+        previous_min = sum(self.min_sizes[child] for child in children[:idx])
+        child = self.series[children[idx]]
+        child_min = self.min_sizes[children[idx]]
+        product = self.partials[label][idx - 1]
+        while len(product) <= size:
+            size_ = len(product)
+            product.append(
+                self._reduce(
+                    sum(
+                        previous[i] * child[size_ - i]
+                        for i in range(int(previous_min), int(size_ - child_min) + 1)
+                    )
+                )
+            )
+
+    def extend(self) -> None:
+        """Computes the next term of every series."""
+        n = len(self.series[self.order[0]]) if self.order else 0
+        for label in self.order:
+            rule_type = self.types[label]
+            children = self.children[label]
+            if rule_type == UNION:
+                term = sum(self.series[child][n] for child in children)
+            elif rule_type == COMPLEMENT:
+                term = self.series[children[0]][n] - sum(
+                    self.series[child][n] for child in children[1:]
+                )
+            elif rule_type == PRODUCT:
+                if self.min_sizes[label] == INFINITY:
+                    term = 0
+                else:
+                    for idx in range(1, len(children)):
+                        tail = sum(
+                            self.min_sizes[child] for child in children[idx + 1 :]
+                        )
+                        self._extend_partial(label, idx, n - tail)
+                    term = (
+                        self.partials[label][-1][n]
+                        if len(children) > 1
+                        else self.series[children[0]][n]
+                    )
+            elif rule_type == ATOM:
+                term = int(n == self.min_sizes[label])
+            elif rule_type == EMPTY:
+                term = 0
+            else:
+                term = self.rules[label].count_objects_of_size(n)
+            self.series[label].append(self._reduce(term))
+
+
+def counts(
+    spec: CombinatorialSpecification, n: int, modulus: Optional[int] = None
+) -> List[int]:
+    """Returns the number of objects of each size less than n in the class at
+    the root of the specification, reduced modulo the modulus if given."""
+    counter = _Counter(spec, modulus)
+    for _ in range(n):
+        counter.extend()
+    return counter.series[spec.get_label(spec.root)]
+
+
+class InsertionEncodingSpecification(CombinatorialSpecification):
+    """A CombinatorialSpecification which can count the objects of every size
+    up to a bound in one pass."""
+
+    @classmethod
+    def from_specification(
+        cls, spec: CombinatorialSpecification
+    ) -> "InsertionEncodingSpecification":
+        """Returns the specification with the same rules."""
+        return cls(spec.root, spec.rules_dict.values(), group_equiv=False)
+
+    def counts(self, n: int, modulus: Optional[int] = None) -> List[int]:
+        """Returns the number of objects of each size less than n, reduced
+        modulo the modulus if given."""
+        return counts(self, n, modulus)
+
+    def recurrence(self, modulus: Optional[int] = None) -> "LinearRecurrence":
+        """Returns the linear recurrence satisfied by the counting sequence."""
+        # pylint: disable=import-outside-toplevel
+        from .recurrences import LinearRecurrence
+
+        return LinearRecurrence.from_specification(self, modulus=modulus)
+
+    def rational_generating_function(
+        self, modular: bool = False
+    ) -> "RationalGeneratingFunction":
+        """Returns the generating function as a numerator and denominator,
+        found by solving the linear system of the specification, or from the
+        counts modulo several primes if modular is True."""
+        # pylint: disable=import-outside-toplevel
+        from .rational_genf import rational_generating_function
+
+        return rational_generating_function(self, modular)
+
+    def asymptotics(self) -> "Asymptotics":
+        """Returns the growth rate and polynomial correction exponent of the
+        counting sequence, found from the eigenvalues of its transfer matrix.
+        This needs NumPy."""
+        # pylint: disable=import-outside-toplevel
+        from .asymptotics import asymptotics
+
+        return asymptotics(self)
+
+    def standalone_module(self, method: str = "auto") -> str:
+        """Returns the source of a Python module with no imports which counts
+        the class, using its linear recurrence if it has one and the equations
+        of the specification otherwise."""
+        # pylint: disable=import-outside-toplevel
+        from .standalone import standalone_module
+
+        return standalone_module(self, method)
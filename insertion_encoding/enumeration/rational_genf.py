@@ -0,0 +1,448 @@
+"""Solving specifications for their rational generating functions.
+
+The encodings of the classes the searchers accept are regular, so the system
+of equations given by a specification is linear once the classes it depends
+on are known: within a strongly connected component of the specification a
+product has at most one factor in the component, and the class of a quotient
+rule times its other children is the parent. The components are solved
+in turn, children first, by sparse Gaussian elimination over rational
+functions in x.
+
+Alternatively the generating function can be reconstructed from the counts
+modulo several primes, finding the denominator with the Berlekamp-Massey
+algorithm and lifting the coefficients with the Chinese remainder theorem and
+rational reconstruction."""
+
+from fractions import Fraction
+from functools import reduce
+from math import gcd, isqrt, lcm
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from comb_spec_searcher import CombinatorialSpecification
+
+from .counting import counts
+from .recurrences import berlekamp_massey
+from .system import (
+    ATOM,
+    COMPLEMENT,
+    EMPTY,
+    PRODUCT,
+    QUOTIENT,
+    UNION,
+    SpecificationSystem,
+)
+
+Poly = Tuple[Fraction, ...]
+
+PRIMES = (
+    2147483647,
+    2147483629,
+    2147483587,
+    2147483579,
+    2147483563,
+    2147483549,
+    2147483543,
+    2147483497,
+)
+
+
+def _trim(poly: Iterable[Fraction]) -> Poly:
+    poly = list(poly)
+    while poly and poly[-1] == 0:
+        poly.pop()
+    return tuple(poly)
+
+
+def _add(first: Poly, second: Poly) -> Poly:
+    if len(first) < len(second):
+        first, second = second, first
+    return _trim(a + (second[i] if i < len(second) else 0) for i, a in enumerate(first))
+
+
+def _mul(first: Poly, second: Poly) -> Poly:
+    if not first or not second:
+        return ()
+    product = [Fraction(0)] * (len(first) + len(second) - 1)
+    for i, a in enumerate(first):
+        if a:
+            for j, b in enumerate(second):
+                product[i + j] += a * b
+    return _trim(product)
+
+
+def _scale(poly: Poly, value: Fraction) -> Poly:
+    return _trim(a * value for a in poly)
+
+
+def _divmod(first: Poly, second: Poly) -> Tuple[Poly, Poly]:
+    remainder = list(first)
+    quotient = [Fraction(0)] * max(0, len(first) - len(second) + 1)
+    while len(remainder) >= len(second) and remainder:
+        factor = remainder[-1] / second[-1]
+        shift = len(remainder) - len(second)
+        quotient[shift] = factor
+        for i, b in enumerate(second):
+            remainder[shift + i] -= factor * b
+        remainder = list(_trim(remainder))
+    return _trim(quotient), tuple(remainder)
+
+
+def _gcd(first: Poly, second: Poly) -> Poly:
+    while second:
+        first, second = second, _divmod(first, second)[1]
+    return _scale(first, 1 / first[-1]) if first else (Fraction(1),)
+
+
+class _RationalFunction:
+    """A quotient of polynomials in x with rational coefficients, in lowest
+    terms with a monic denominator."""
+
+    __slots__ = ("num", "den")
+
+    def __init__(self, num: Poly, den: Poly = (Fraction(1),)):
+        if not den:
+            raise ZeroDivisionError("The denominator of a rational function is 0.")
+        common = _gcd(num, den) if num else den
+        num, den = _divmod(num, common)[0], _divmod(den, common)[0]
+        lead = den[-1]
+        self.num = _scale(num, 1 / lead)
+        self.den = _scale(den, 1 / lead)
+
+    def __bool__(self) -> bool:
+        return bool(self.num)
+
+    def __add__(self, other: "_RationalFunction") -> "_RationalFunction":
+        if not self:
+            return other
+        if not other:
+            return self
+        if self.den == other.den:
+            return _RationalFunction(_add(self.num, other.num), self.den)
+        return _RationalFunction(
+            _add(_mul(self.num, other.den), _mul(other.num, self.den)),
+            _mul(self.den, other.den),
+        )
+
+    def __neg__(self) -> "_RationalFunction":
+        return _RationalFunction(_scale(self.num, Fraction(-1)), self.den)
+
+    def __sub__(self, other: "_RationalFunction") -> "_RationalFunction":
+        return self + (-other)
+
+    def __mul__(self, other: "_RationalFunction") -> "_RationalFunction":
+        if not self or not other:
+            return _ZERO
+        return _RationalFunction(_mul(self.num, other.num), _mul(self.den, other.den))
+
+    def __truediv__(self, other: "_RationalFunction") -> "_RationalFunction":
+        return _RationalFunction(_mul(self.num, other.den), _mul(self.den, other.num))
+
+
+_ZERO = _RationalFunction(())
+_ONE = _RationalFunction((Fraction(1),))
+
+
+class RationalGeneratingFunction:
+    """A rational generating function, stored as a numerator and denominator
+    with coprime integer coefficients, listed from the constant term, and a
+    positive constant term in the denominator.
+
+    Example:
+    >>> genf = RationalGeneratingFunction((1,), (1, -1, -1))
+    >>> genf.series(8)
+    [1, 1, 2, 3, 5, 8, 13, 21]
+    """
+
+    def __init__(self, numerator: Sequence[int | Fraction], denominator: Sequence):
+        numerator, denominator = _trim(map(Fraction, numerator)), _trim(
+            map(Fraction, denominator)
+        )
+        if not denominator:
+            raise ZeroDivisionError("The denominator of a rational function is 0.")
+        scale = lcm(*(coeff.denominator for coeff in numerator + denominator))
+        numerator = tuple(int(coeff * scale) for coeff in numerator)
+        denominator = tuple(int(coeff * scale) for coeff in denominator)
+        content = reduce(gcd, numerator + denominator)
+        lowest = next(coeff for coeff in denominator if coeff)
+        if lowest < 0:
+            content = -content
+        self.numerator = tuple(coeff // content for coeff in numerator)
+        self.denominator = tuple(coeff // content for coeff in denominator)
+
+    def series(self, n: int) -> List[int | Fraction]:
+        """Returns the coefficients of x^0, ..., x^(n-1) in the power series."""
+        if self.denominator[0] == 0:
+            raise ValueError("The generating function has no power series.")
+        coefficients: List[Fraction] = []
+        for i in range(n):
+            value = Fraction(self.numerator[i] if i < len(self.numerator) else 0)
+            for j in range(1, min(i, len(self.denominator) - 1) + 1):
+                value -= self.denominator[j] * coefficients[i - j]
+            coefficients.append(value / self.denominator[0])
+        return [
+            int(coeff) if coeff.denominator == 1 else coeff for coeff in coefficients
+        ]
+
+    def as_sympy(self):
+        """Returns the generating function as a sympy expression in x."""
+        # pylint: disable=import-outside-toplevel
+        import sympy
+
+        x = sympy.var("x")
+        numerator = sum(coeff * x**i for i, coeff in enumerate(self.numerator))
+        denominator = sum(coeff * x**i for i, coeff in enumerate(self.denominator))
+        return numerator / denominator
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RationalGeneratingFunction):
+            return NotImplemented
+        return (self.numerator, self.denominator) == (
+            other.numerator,
+            other.denominator,
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.numerator, self.denominator))
+
+    def __iter__(self):
+        yield self.numerator
+        yield self.denominator
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.numerator}, {self.denominator})"
+
+
+def _strongly_connected_components(system: SpecificationSystem) -> List[List[int]]:
+    """Returns the strongly connected components of the specification, with
+    every component after the components of the children of its classes."""
+    index: Dict[int, int] = {}
+    lowlink: Dict[int, int] = {}
+    on_stack = set()
+    stack: List[int] = []
+    components: List[List[int]] = []
+    for start in system.labels:
+        if start in index:
+            continue
+        index[start] = lowlink[start] = len(index)
+        stack.append(start)
+        on_stack.add(start)
+        work = [(start, iter(system.children[start]))]
+        while work:
+            label, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = lowlink[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(system.children[child])))
+                    break
+                if child in on_stack:
+                    lowlink[label] = min(lowlink[label], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[label])
+                if lowlink[label] == index[label]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == label:
+                            break
+                    components.append(component)
+    return components
+
+
+def _solve_component(
+    system: SpecificationSystem,
+    component: List[int],
+    solved: Dict[int, _RationalFunction],
+) -> None:
+    """Solves the linear equations of the classes in the component, given the
+    generating functions of the classes they depend on outside it."""
+    members = set(component)
+    rows: Dict[int, Dict[int, _RationalFunction]] = {}
+    constants: Dict[int, _RationalFunction] = {}
+    for label in component:
+        rule_type = system.types[label]
+        row: Dict[int, _RationalFunction] = {label: _ONE}
+        constant = _ZERO
+        children = system.children[label]
+        if rule_type == UNION:
+            for child in children:
+                if child in members:
+                    row[child] = row.get(child, _ZERO) - _ONE
+                else:
+                    constant = constant + solved[child]
+        elif rule_type == PRODUCT:
+            inside = [child for child in children if child in members]
+            if len(inside) > 1:
+                raise NotImplementedError(
+                    "The specification is not linear, the rule of class "
+                    f"{label} has {len(inside)} factors depending on it."
+                )
+            factor = _ONE
+            for child in children:
+                if child not in members:
+                    factor = factor * solved[child]
+            if inside:
+                row[inside[0]] = row.get(inside[0], _ZERO) - factor
+            else:
+                constant = factor
+        elif rule_type == COMPLEMENT:
+            for idx, child in enumerate(children):
+                sign = _ONE if idx == 0 else -_ONE
+                if child in members:
+                    row[child] = row.get(child, _ZERO) - sign
+                else:
+                    constant = constant + sign * solved[child]
+        elif rule_type == QUOTIENT:
+            parent, others = children[0], children[1:]
+            if any(child in members for child in others):
+                raise NotImplementedError(
+                    "The specification is not linear, the rule of class "
+                    f"{label} divides by a class depending on it."
+                )
+            factor = _ONE
+            for child in others:
+                factor = factor * solved[child]
+            row[label] = factor
+            if parent in members:
+                row[parent] = row.get(parent, _ZERO) - _ONE
+            else:
+                constant = solved[parent]
+        elif rule_type == ATOM:
+            constant = _RationalFunction(
+                (Fraction(0),) * int(system.min_sizes[label]) + (Fraction(1),)
+            )
+        elif rule_type != EMPTY:
+            raise NotImplementedError(
+                f"The generating function of the verified class {label} is unknown."
+            )
+        rows[label] = {var: coeff for var, coeff in row.items() if coeff}
+        constants[label] = constant
+    pivots: Dict[int, int] = {}
+    unused = set(component)
+    for var in component:
+        candidates = [label for label in unused if var in rows[label]]
+        if not candidates:
+            raise ValueError(f"The equations for the class {var} are singular.")
+        pivot = min(candidates, key=lambda label: len(rows[label]))
+        unused.remove(pivot)
+        pivots[var] = pivot
+        inverse = _ONE / rows[pivot][var]
+        rows[pivot] = {key: coeff * inverse for key, coeff in rows[pivot].items()}
+        constants[pivot] = constants[pivot] * inverse
+        for label, row in rows.items():
+            if label == pivot or var not in row:
+                continue
+            factor = row[var]
+            for key, coeff in rows[pivot].items():
+                row[key] = row.get(key, _ZERO) - factor * coeff
+                if not row[key]:
+                    del row[key]
+            constants[label] = constants[label] - factor * constants[pivot]
+    for var, pivot in pivots.items():
+        solved[var] = constants[pivot]
+
+
+def _solve_linear(spec: CombinatorialSpecification) -> RationalGeneratingFunction:
+    system = SpecificationSystem(spec)
+    solved: Dict[int, _RationalFunction] = {}
+    for component in _strongly_connected_components(system):
+        _solve_component(system, component, solved)
+    genf = solved[system.root]
+    return RationalGeneratingFunction(genf.num, genf.den)
+
+
+def _rational_reconstruction(value: int, modulus: int) -> Optional[Fraction]:
+    """Returns the fraction with numerator and denominator at most
+    sqrt(modulus / 2) congruent to the value, or None if there isn't one."""
+    bound = isqrt(modulus // 2)
+    old_r, r = modulus, value % modulus
+    old_t, t = 0, 1
+    while r > bound:
+        quotient = old_r // r
+        old_r, r = r, old_r - quotient * r
+        old_t, t = t, old_t - quotient * t
+    if abs(t) > bound or gcd(r, abs(t)) != 1:
+        return None
+    return Fraction(r, t)
+
+
+def _solve_modular(
+    spec: CombinatorialSpecification, primes: Sequence[int]
+) -> RationalGeneratingFunction:
+    num_terms = 2 * spec.number_of_rules() + 10
+    residues: List[Tuple[int, List[int], List[int]]] = []
+    previous = None
+    for prime in primes:
+        while True:
+            terms = counts(spec, num_terms, prime)
+            recurrence = berlekamp_massey(terms, prime)
+            if 2 * len(recurrence) + 10 <= num_terms:
+                break
+            num_terms *= 2
+            residues.clear()
+        denominator = [1] + [-coeff % prime for coeff in recurrence]
+        numerator = [
+            sum(
+                denominator[j] * terms[i - j]
+                for j in range(min(i, len(recurrence)) + 1)
+            )
+            % prime
+            for i in range(len(recurrence))
+        ]
+        residues.append((prime, numerator, denominator))
+        # the order found modulo a prime dividing a coefficient can be too low
+        order = max(len(den) for _, _, den in residues)
+        residues = [residue for residue in residues if len(residue[2]) == order]
+        genf = _combine(residues)
+        if genf is not None and genf == previous:
+            return genf
+        previous = genf
+    raise ValueError(
+        "The generating function could not be reconstructed, try more primes."
+    )
+
+
+def _combine(
+    residues: List[Tuple[int, List[int], List[int]]]
+) -> Optional[RationalGeneratingFunction]:
+    """Combines the coefficients modulo each prime with the Chinese remainder
+    theorem and reconstructs them as fractions."""
+    modulus = 1
+    numerator = [0] * len(residues[0][1])
+    denominator = [0] * len(residues[0][2])
+    for prime, num, den in residues:
+        inverse = pow(modulus, -1, prime)
+        for coeffs, new in ((numerator, num), (denominator, den)):
+            for i, value in enumerate(new):
+                coeffs[i] += modulus * ((value - coeffs[i]) * inverse % prime)
+        modulus *= prime
+    reconstructed = [
+        _rational_reconstruction(value, modulus) for value in numerator + denominator
+    ]
+    if any(value is None for value in reconstructed):
+        return None
+    return RationalGeneratingFunction(
+        reconstructed[: len(numerator)], reconstructed[len(numerator) :]
+    )
+
+
+def rational_generating_function(
+    spec: CombinatorialSpecification,
+    modular: bool = False,
+    primes: Sequence[int] = PRIMES,
+) -> RationalGeneratingFunction:
+    """Returns the generating function of the class at the root of the
+    specification.
+
+    By default the linear system of the specification is solved exactly. If
+    modular is True it is instead reconstructed from the counts modulo the
+    primes, stopping once two successive reconstructions agree."""
+    if modular:
+        return _solve_modular(spec, primes)
+    return _solve_linear(spec)
@@ -0,0 +1,226 @@
+"""Linear recurrences satisfied by the counting sequences of regular classes.
+
+The classes with a regular insertion encoding have rational generating
+functions, so their counting sequences satisfy linear recurrences with
+constant coefficients. The recurrence is found from enough initial terms with
+the Berlekamp-Massey algorithm, over the rationals or modulo a prime, and the
+nth term is then computed with O(d^2 log n) arithmetic operations for a
+recurrence of order d by reducing x^n modulo the characteristic polynomial."""
+
+from fractions import Fraction
+from typing import List, Optional, Sequence, Tuple
+
+from comb_spec_searcher import CombinatorialSpecification
+
+from .counting import counts
+
+CHECK_TERMS = 10
+
+
+def berlekamp_massey(
+    terms: Sequence[int], modulus: Optional[int] = None
+) -> List[int | Fraction]:
+    """Returns the coefficients c_1, ..., c_d of the shortest linear recurrence
+    a_n = c_1 a_{n-1} + ... + c_d a_{n-d} satisfied by the terms. The
+    arithmetic is over the rationals, or modulo the modulus if given, which
+    must be prime.
+
+    Example:
+    >>> berlekamp_massey([1, 1, 2, 3, 5, 8, 13])
+    [1, 1]
+    >>> berlekamp_massey([1, 1, 2, 3, 5, 8, 13], modulus=101)
+    [1, 1]
+    """
+
+    def inverse(value):
+        if modulus is None:
+            return 1 / Fraction(value)
+        return pow(value, -1, modulus)
+
+    def reduce(value):
+        return value if modulus is None else value % modulus
+
+    terms = [reduce(term if modulus is not None else Fraction(term)) for term in terms]
+    current: List = [reduce(1)]
+    previous: List = [reduce(1)]
+    length, shift, previous_discrepancy = 0, 1, reduce(1)
+    for n, term in enumerate(terms):
+        discrepancy = term
+        for i in range(1, length + 1):
+            discrepancy = reduce(discrepancy + current[i] * terms[n - i])
+        if discrepancy == 0:
+            shift += 1
+            continue
+        coefficient = reduce(discrepancy * inverse(previous_discrepancy))
+        updated = current + [reduce(0)] * max(0, len(previous) + shift - len(current))
+        for i, value in enumerate(previous):
+            updated[i + shift] = reduce(updated[i + shift] - coefficient * value)
+        if 2 * length <= n:
+            previous, length = current, n + 1 - length
+            previous_discrepancy, shift = discrepancy, 1
+        else:
+            shift += 1
+        current = updated
+    current += [reduce(0)] * (length + 1 - len(current))
+    return [_normalise(reduce(-value)) for value in current[1 : length + 1]]
+
+
+def _multiply_mod(
+    first: List, second: List, recurrence: Sequence, modulus: Optional[int]
+) -> List:
+    """Returns the product of two polynomials of degree less than d modulo
+    x^d - c_1 x^{d-1} - ... - c_d, as lists of coefficients of x^0, x^1, ..."""
+    order = len(recurrence)
+    product = [0] * (2 * order - 1)
+    for i, a in enumerate(first):
+        if a:
+            for j, b in enumerate(second):
+                product[i + j] += a * b
+    for k in range(2 * order - 2, order - 1, -1):
+        top = product[k]
+        if top:
+            for i, coefficient in enumerate(recurrence, start=1):
+                product[k - i] += top * coefficient
+    product = product[:order]
+    if modulus is not None:
+        product = [value % modulus for value in product]
+    return product
+
+
+class LinearRecurrence:
+    """A linear recurrence a_n = c_1 a_{n-1} + ... + c_d a_{n-d}, holding for
+    n >= d + offset, together with the initial terms a_0, ..., a_{d+offset-1}.
+
+    Example:
+    >>> fibonacci = LinearRecurrence.from_terms([1, 1, 2, 3, 5, 8, 13, 21])
+    >>> fibonacci.nth_term(100)
+    573147844013817084101
+    """
+
+    def __init__(
+        self,
+        coefficients: Sequence[int | Fraction],
+        initial_terms: Sequence[int | Fraction],
+        modulus: Optional[int] = None,
+    ):
+        self.coefficients = tuple(_normalise(value) for value in coefficients)
+        self.initial_terms = tuple(_normalise(value) for value in initial_terms)
+        self.modulus = modulus
+        if len(self.initial_terms) < len(self.coefficients):
+            raise ValueError(
+                "A recurrence of order d needs at least d initial terms, "
+                f"got {len(self.initial_terms)} for order {len(self.coefficients)}."
+            )
+
+    @property
+    def order(self) -> int:
+        """The number of terms each term depends on."""
+        return len(self.coefficients)
+
+    @property
+    def offset(self) -> int:
+        """The number of initial terms not determined by the recurrence."""
+        return len(self.initial_terms) - self.order
+
+    @classmethod
+    def from_terms(
+        cls, terms: Sequence[int], modulus: Optional[int] = None
+    ) -> "LinearRecurrence":
+        """Returns the shortest recurrence satisfied by the terms.
+
+        The recurrence of order d is only determined by 2d terms, so at least
+        twice as many terms as the expected order should be given. The
+        recurrence is checked to hold on the remaining terms, and a ValueError
+        is raised if there are too few terms to check it."""
+        recurrence = berlekamp_massey(terms, modulus)
+        if 2 * len(recurrence) >= len(terms):
+            raise ValueError(
+                f"{len(terms)} terms are not enough to determine a recurrence "
+                f"of order {len(recurrence)}."
+            )
+        return cls(recurrence, terms[: len(recurrence)], modulus)
+
+    @classmethod
+    def from_specification(
+        cls,
+        spec: CombinatorialSpecification,
+        num_terms: Optional[int] = None,
+        modulus: Optional[int] = None,
+    ) -> "LinearRecurrence":
+        """Returns the recurrence satisfied by the counting sequence of a
+        specification.
+
+        If the number of terms to use is not given, more terms are computed
+        until the recurrence found is checked on at least CHECK_TERMS terms
+        beyond the 2d terms determining a recurrence of order d."""
+        if num_terms is not None:
+            return cls.from_terms(counts(spec, num_terms, modulus), modulus)
+        num_terms = 2 * spec.number_of_rules() + CHECK_TERMS
+        while True:
+            terms = counts(spec, num_terms, modulus)
+            recurrence = berlekamp_massey(terms, modulus)
+            if 2 * len(recurrence) + CHECK_TERMS <= num_terms:
+                return cls(recurrence, terms[: len(recurrence)], modulus)
+            num_terms *= 2
+
+    def _reduce(self, value):
+        return value if self.modulus is None else value % self.modulus
+
+    def nth_term(self, n: int) -> int | Fraction:
+        """Returns the term of size n, computed with O(d^2 log n) operations."""
+        if n < len(self.initial_terms):
+            return self.initial_terms[n]
+        if self.order == 0:
+            return self._reduce(0)
+        # x^(n - offset) mod the characteristic polynomial gives a_n in terms
+        # of a_offset, ..., a_(offset + d - 1)
+        power = n - self.offset
+        result = [1] + [0] * (self.order - 1)
+        if self.order == 1:
+            base = [self._reduce(self.coefficients[0])]
+        else:
+            base = [0, 1] + [0] * (self.order - 2)
+        while power:
+            if power & 1:
+                result = _multiply_mod(result, base, self.coefficients, self.modulus)
+            base = _multiply_mod(base, base, self.coefficients, self.modulus)
+            power >>= 1
+        value = sum(
+            coefficient * term
+            for coefficient, term in zip(result, self.initial_terms[self.offset :])
+        )
+        return _normalise(self._reduce(value))
+
+    def terms(self, n: int) -> List[int | Fraction]:
+        """Returns the terms of size less than n, computed with O(dn) operations."""
+        terms = list(self.initial_terms[:n])
+        while len(terms) < n:
+            terms.append(
+                _normalise(
+                    self._reduce(
+                        sum(
+                            coefficient * terms[-i]
+                            for i, coefficient in enumerate(self.coefficients, 1)
+                        )
+                    )
+                )
+            )
+        return terms
+
+    def characteristic_polynomial(self) -> Tuple[int | Fraction, ...]:
+        """Returns the coefficients of 1 - c_1 x - ... - c_d x^d, the denominator
+        of the generating function."""
+        return (1,) + tuple(_normalise(-value) for value in self.coefficients)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}({list(self.coefficients)}, "
+            f"{list(self.initial_terms)}, modulus={self.modulus})"
+        )
+
+
+def _normalise(value: int | Fraction) -> int | Fraction:
+    """Returns integral fractions as integers."""
+    if isinstance(value, Fraction) and value.denominator == 1:
+        return value.numerator
+    return value
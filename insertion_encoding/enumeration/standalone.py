@@ -0,0 +1,260 @@
+"""Compiling a specification into a standalone Python module which counts the
+class without importing anything.
+
+If the class has a rational generating function the module holds the linear
+recurrence read off from its denominator, with enough initial terms, and
+computes the nth term with O(d^2 log n) operations. Otherwise it holds the
+equations of the specification as a table of rules, and extends the series of
+every class one size at a time as counts does, remembering the terms found."""
+
+from pathlib import Path
+from string import Template
+from typing import List, Optional
+
+from comb_spec_searcher import CombinatorialSpecification
+
+from .counting import _Counter
+from .rational_genf import rational_generating_function
+from .system import (
+    ATOM,
+    COMPLEMENT,
+    EMPTY,
+    INFINITY,
+    PRODUCT,
+    QUOTIENT,
+    UNION,
+    VERIFIED,
+)
+
+METHODS = ("auto", "recurrence", "system")
+
+_RECURRENCE_MODULE = Template(
+    '''"""Counting $description.
+
+Generated by insertion_encoding. The number of objects of size n is
+a_n = c_1 a_(n-1) + ... + c_d a_(n-d) for n at least len(INITIAL_TERMS),
+where the c_i are COEFFICIENTS."""
+
+COEFFICIENTS = $coefficients
+INITIAL_TERMS = $initial_terms
+
+
+def _multiply(first, second, modulus):
+    order = len(COEFFICIENTS)
+    product = [0] * (2 * order - 1)
+    for i, a in enumerate(first):
+        if a:
+            for j, b in enumerate(second):
+                product[i + j] += a * b
+    for k in range(2 * order - 2, order - 1, -1):
+        top = product[k]
+        if top:
+            for i, coefficient in enumerate(COEFFICIENTS, start=1):
+                product[k - i] += top * coefficient
+    product = product[:order]
+    if modulus is not None:
+        product = [value % modulus for value in product]
+    return product
+
+
+def count(n, modulus=None):
+    """Returns the number of objects of size n, reduced modulo the modulus
+    if given, computed with O(d^2 log n) operations."""
+    if n < len(INITIAL_TERMS):
+        value = INITIAL_TERMS[n]
+    elif not COEFFICIENTS:
+        value = 0
+    else:
+        order = len(COEFFICIENTS)
+        offset = len(INITIAL_TERMS) - order
+        power = n - offset
+        result = [1] + [0] * (order - 1)
+        base = [COEFFICIENTS[0]] if order == 1 else [0, 1] + [0] * (order - 2)
+        while power:
+            if power & 1:
+                result = _multiply(result, base, modulus)
+            base = _multiply(base, base, modulus)
+            power >>= 1
+        value = sum(a * b for a, b in zip(result, INITIAL_TERMS[offset:]))
+    return value if modulus is None else value % modulus
+
+
+def counts(n, modulus=None):
+    """Returns the number of objects of each size less than n, reduced modulo
+    the modulus if given."""
+    terms = list(INITIAL_TERMS[:n])
+    while len(terms) < n:
+        terms.append(
+            sum(c * terms[-i] for i, c in enumerate(COEFFICIENTS, start=1))
+        )
+    if modulus is not None:
+        terms = [term % modulus for term in terms]
+    return terms
+'''
+)
+
+_SYSTEM_MODULE = Template(
+    '''"""Counting $description.
+
+Generated by insertion_encoding. RULES holds each class of the specification
+as its label, the type of its rule, the labels of its children and the minimum
+size of an object in it, or None if it is empty. Every class comes after the
+classes whose term of the same size it depends on."""
+
+ROOT = $root
+RULES = $rules
+
+_MIN_SIZES = {label: size for label, _, _, size in RULES}
+_SERIES = {label: [] for label, _, _, _ in RULES}
+_PARTIALS = {
+    label: [[] for _ in children[1:]]
+    for label, kind, children, _ in RULES
+    if kind == "product"
+}
+
+
+def _extend_partial(label, children, idx, size):
+    # Extends the product of the first idx + 1 children up to the size.
+    previous = _SERIES[children[0]] if idx == 1 else _PARTIALS[label][idx - 2]
+    previous_min = sum(_MIN_SIZES[child] for child in children[:idx])
+    child = _SERIES[children[idx]]
+    child_min = _MIN_SIZES[children[idx]]
+    product = _PARTIALS[label][idx - 1]
+    while len(product) <= size:
+        size_ = len(product)
+        product.append(
+            sum(
+                previous[i] * child[size_ - i]
+                for i in range(previous_min, size_ - child_min + 1)
+            )
+        )
+
+
+def _extend():
+    n = len(_SERIES[ROOT])
+    for label, kind, children, min_size in RULES:
+        if kind == "union":
+            term = sum(_SERIES[child][n] for child in children)
+        elif kind == "complement":
+            term = _SERIES[children[0]][n] - sum(
+                _SERIES[child][n] for child in children[1:]
+            )
+        elif kind == "product":
+            if min_size is None:
+                term = 0
+            else:
+                for idx in range(1, len(children)):
+                    tail = sum(_MIN_SIZES[child] for child in children[idx + 1 :])
+                    _extend_partial(label, children, idx, n - tail)
+                term = (
+                    _PARTIALS[label][-1][n]
+                    if len(children) > 1
+                    else _SERIES[children[0]][n]
+                )
+        elif kind == "atom":
+            term = int(n == min_size)
+        else:
+            term = 0
+        _SERIES[label].append(term)
+
+
+def count(n):
+    """Returns the number of objects of size n."""
+    while len(_SERIES[ROOT]) <= n:
+        _extend()
+    return _SERIES[ROOT][n]
+
+
+def counts(n):
+    """Returns the number of objects of each size less than n."""
+    while len(_SERIES[ROOT]) < n:
+        _extend()
+    return _SERIES[ROOT][:n]
+'''
+)
+
+_KINDS = {
+    UNION: "union",
+    PRODUCT: "product",
+    ATOM: "atom",
+    EMPTY: "empty",
+    COMPLEMENT: "complement",
+}
+
+
+def _description(spec: CombinatorialSpecification) -> str:
+    return " ".join(str(spec.root).split()).replace('"""', "'''")
+
+
+def _recurrence_module(spec: CombinatorialSpecification) -> Optional[str]:
+    """The source of the recurrence module, or None if the generating function
+    is not rational or the recurrence does not have integer coefficients."""
+    try:
+        genf = rational_generating_function(spec)
+    except NotImplementedError:
+        return None
+    if genf.denominator[0] != 1:
+        return None
+    order = len(genf.denominator) - 1
+    coefficients = tuple(-coeff for coeff in genf.denominator[1:])
+    initial_terms = tuple(genf.series(max(order, len(genf.numerator))))
+    return _RECURRENCE_MODULE.substitute(
+        description=_description(spec),
+        coefficients=repr(coefficients),
+        initial_terms=repr(initial_terms),
+    )
+
+
+def _system_module(spec: CombinatorialSpecification) -> str:
+    counter = _Counter(spec, None)
+    rules: List[str] = []
+    for label in counter.order:
+        if counter.types[label] == VERIFIED:
+            raise NotImplementedError(
+                "A standalone module can not count the verified class "
+                f"{counter.rules[label].comb_class}."
+            )
+        if counter.types[label] == QUOTIENT:
+            raise NotImplementedError(
+                "A standalone module can not count the quotient rule of the class "
+                f"{counter.rules[label].comb_class}."
+            )
+        min_size = counter.min_sizes[label]
+        rules.append(
+            f'    ({label}, "{_KINDS[counter.types[label]]}", '
+            f"{tuple(counter.children[label])!r}, "
+            f"{None if min_size == INFINITY else int(min_size)}),\n"
+        )
+    return _SYSTEM_MODULE.substitute(
+        description=_description(spec),
+        root=counter.root,
+        rules="(\n" + "".join(rules) + ")",
+    )
+
+
+def standalone_module(spec: CombinatorialSpecification, method: str = "auto") -> str:
+    """Returns the source of a Python module with no imports which counts the
+    class at the root of the specification with count(n) and counts(n).
+
+    With method "recurrence" the module uses the linear recurrence of the
+    class, and a ValueError is raised if there is none with integer
+    coefficients. With method "system" it uses the equations of the
+    specification. By default the recurrence is used when there is one."""
+    if method not in METHODS:
+        raise ValueError(f"Unknown method {method}, expected one of {METHODS}.")
+    if method != "system":
+        source = _recurrence_module(spec)
+        if source is not None:
+            return source
+        if method == "recurrence":
+            raise ValueError(
+                "The class does not have a linear recurrence with integer coefficients."
+            )
+    return _system_module(spec)
+
+
+def write_standalone_module(
+    spec: CombinatorialSpecification, path: str | Path, method: str = "auto"
+) -> None:
+    """Writes the standalone counting module of the specification to a file."""
+    Path(path).write_text(standalone_module(spec, method), encoding="utf-8")
@@ -0,0 +1,102 @@
+"""The system of equations given by a specification.
+
+The specifications found by the searchers are made of disjoint unions,
+cartesian products, atoms and empty classes. Those found with a forest rule
+database, as by MatchingHorizontalSearcher, can also use a union or product
+rule the other way around, giving a class as the complement of the other
+children of a union in its parent or as the quotient of the parent of a
+product by its other children. A SpecificationSystem records for each class in
+a specification which of these its rule is, the labels of its children and the
+minimum size of an object in it. The children of a complement or quotient rule
+are the parent of the original rule followed by its other children."""
+
+from typing import Dict, List
+
+from comb_spec_searcher import AtomStrategy, CombinatorialSpecification
+from comb_spec_searcher.strategies.constructor import (
+    CartesianProduct,
+    Complement,
+    DisjointUnion,
+    Quotient,
+)
+from comb_spec_searcher.strategies.rule import AbstractRule, VerificationRule
+from comb_spec_searcher.strategies.strategy import EmptyStrategy
+
+INFINITY = float("inf")
+
+UNION, PRODUCT, ATOM, EMPTY, VERIFIED, COMPLEMENT, QUOTIENT = range(7)
+
+
+def _rule_type(rule: AbstractRule) -> int:
+    if isinstance(rule, VerificationRule) or not rule.children:
+        if isinstance(rule.strategy, AtomStrategy):
+            return ATOM
+        if isinstance(rule.strategy, EmptyStrategy):
+            return EMPTY
+        return VERIFIED
+    if any(any(params) for params in rule.constructor.extra_parameters):
+        raise NotImplementedError(
+            "Counting rules with extra parameters is not supported."
+        )
+    if isinstance(rule.constructor, DisjointUnion):
+        return UNION
+    if isinstance(rule.constructor, CartesianProduct):
+        return PRODUCT
+    if isinstance(rule.constructor, Complement):
+        return COMPLEMENT
+    if isinstance(rule.constructor, Quotient):
+        return QUOTIENT
+    raise NotImplementedError(
+        f"Counting rules with the constructor {rule.constructor} is not supported."
+    )
+
+
+class SpecificationSystem:
+    """The classes of a specification reachable from the root, with the type
+    of the rule, the children and the minimum size of each."""
+
+    def __init__(self, spec: CombinatorialSpecification):
+        self.spec = spec
+        self.root = spec.get_label(spec.root)
+        self.labels: List[int] = []
+        self.rules: Dict[int, AbstractRule] = {}
+        self.types: Dict[int, int] = {}
+        self.children: Dict[int, List[int]] = {}
+        todo = [self.root]
+        while todo:
+            label = todo.pop()
+            if label in self.rules:
+                continue
+            rule = spec.get_rule(label)
+            self.labels.append(label)
+            self.rules[label] = rule
+            self.types[label] = _rule_type(rule)
+            self.children[label] = [spec.get_label(child) for child in rule.children]
+            todo.extend(self.children[label])
+        self.min_sizes = self._minimum_sizes()
+
+    def _minimum_sizes(self) -> Dict[int, float]:
+        """The minimum size of an object in each class, or infinity if empty,
+        found as the least fixed point of the equations of the unions and
+        products. The other classes give it themselves."""
+        min_sizes: Dict[int, float] = {}
+        for label in self.labels:
+            if self.types[label] in (ATOM, VERIFIED, COMPLEMENT, QUOTIENT):
+                min_sizes[label] = self.rules[label].comb_class.minimum_size_of_object()
+            else:
+                min_sizes[label] = INFINITY
+        changed = True
+        while changed:
+            changed = False
+            for label in self.labels:
+                children = [min_sizes[child] for child in self.children[label]]
+                if self.types[label] == UNION:
+                    size = min(children, default=INFINITY)
+                elif self.types[label] == PRODUCT:
+                    size = sum(children)
+                else:
+                    continue
+                if size < min_sizes[label]:
+                    min_sizes[label] = size
+                    changed = True
+        return min_sizes
@@ -1,31 +1,20 @@
 """This module is used for counting the number of
 Cayley permutation classes with a regular insertion encoding."""
 
-from itertools import combinations
 from cayley_permutations import CayleyPermutation
-from check_regular_ins_enc import (
-    regular_vertical_insertion_encoding,
-    regular_horizontal_insertion_encoding,
-)
+from insertion_encoding.check_regular.census import census
 
-v_reg = 0
-h_reg = 0
-both = 0
-total = 0
-for m in range(1, 14):
-    bases_size_3 = set(combinations(CayleyPermutation.of_size(3), m))
-    for basis in bases_size_3:
-        total += 1
-        if regular_vertical_insertion_encoding(
-            basis
-        ) or regular_horizontal_insertion_encoding(basis):
-            both += 1
-        if regular_vertical_insertion_encoding(basis):
-            v_reg += 1
-        if regular_horizontal_insertion_encoding(basis):
-            h_reg += 1
+if __name__ == "__main__":
+    tallies = census(
+        CayleyPermutation.of_size(3),
+        ["vertical", "horizontal"],
+        output="census_cayley_perms_3.jsonl",
+    )
 
-print("Classes with a vertical insertion encoding", v_reg)
-print("Classes with a horizontal insertion encoding", h_reg)
-print("Classes with either a vertical or horizontal insertion encoding", both)
-print("Total classes", total)
+    print("Classes with a vertical insertion encoding", tallies["vertical"])
+    print("Classes with a horizontal insertion encoding", tallies["horizontal"])
+    print(
+        "Classes with either a vertical or horizontal insertion encoding",
+        tallies["any"],
+    )
+    print("Total classes", tallies["total"])
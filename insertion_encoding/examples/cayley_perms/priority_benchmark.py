@@ -0,0 +1,52 @@
+"""This file compares the time taken to find a specification, and the number of
+classes expanded and found, when the searcher expands classes in the default
+order and when it expands the class with the lowest expansion cost first.
+
+Change the bases and the searchers to compare other classes, or add another
+priority, any function from a tiling or configuration to a comparable value."""
+
+import time
+
+from insertion_encoding import (
+    HorizontalSearcher,
+    PartialSearchResult,
+    VatterVerticalSearcher,
+    VerticalSearcher,
+)
+from insertion_encoding.priority import expansion_cost
+
+bases = ["231, 312, 2121", "210, 012, 100", "100, 012, 210"]
+searchers = [VerticalSearcher, HorizontalSearcher, VatterVerticalSearcher]
+priorities = {"default": None, "expansion cost": expansion_cost}
+
+
+def time_to_specification(searcher_class, basis, priority):
+    """Returns the seconds taken to find a specification, and the numbers of
+    classes expanded and found, or None if the class is not regular."""
+    last_event = {}
+    try:
+        searcher = searcher_class(
+            basis, priority=priority, progress=last_event.update, progress_interval=0
+        )
+    except ValueError:
+        return None
+    start = time.perf_counter()
+    spec = searcher.auto_search(max_expansion_time=600)
+    seconds = time.perf_counter() - start
+    assert not isinstance(spec, PartialSearchResult)
+    return seconds, last_event.get("expanded", 0), last_event.get("classes", 1)
+
+
+if __name__ == "__main__":
+    print(f"{'searcher':<24}{'basis':<18}{'priority':<16}seconds  expanded  classes")
+    for searcher_class in searchers:
+        for basis in bases:
+            for name, priority in priorities.items():
+                result = time_to_specification(searcher_class, basis, priority)
+                if result is None:
+                    break
+                seconds, expanded, classes = result
+                print(
+                    f"{searcher_class.__name__:<24}{basis:<18}{name:<16}"
+                    f"{seconds:7.2f}{expanded:10d}{classes:9d}"
+                )
@@ -10,6 +10,7 @@ print the specification, print the generating function, and print how many Cayle
 permutations there are in the class up to size n for any n.
 """
 
+from cayley_permutations import CayleyPermutation
 from insertion_encoding import VatterVerticalSearcher
 
 basis = "231, 312, 2121"
@@ -25,4 +26,8 @@ spec.get_genf()
 
 # Print the counts up to size n
 n = 10
-print([spec.count_objects_of_size(i) for i in range(n)])
+print(spec.counts(n))
+
+# Check if a Cayley permutation is in the class in linear time
+automaton = VatterVerticalSearcher(basis).automaton()
+print(automaton.in_class(CayleyPermutation([0, 1, 0, 2])))
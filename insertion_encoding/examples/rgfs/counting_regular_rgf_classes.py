@@ -2,30 +2,19 @@
 that have a regular insertion encoding, either vertical or horizontal."""
 
 from cayley_permutations import CayleyPermutation
-from itertools import combinations
-from insertion_encoding import (
-    rgf_regular_vertical_insertion_encoding,
-    rgf_regular_horizontal_insertion_encoding,
-)
+from insertion_encoding.check_regular.census import census
 
-v_reg = 0
-h_reg = 0
-both = 0
-total = 0
-for m in range(1, 14):
-    bases_size_3 = set(combinations(CayleyPermutation.of_size(3), m))
-    for basis in bases_size_3:
-        total += 1
-        if rgf_regular_vertical_insertion_encoding(
-            basis
-        ) or rgf_regular_horizontal_insertion_encoding(basis):
-            both += 1
-        if rgf_regular_vertical_insertion_encoding(basis):
-            v_reg += 1
-        if rgf_regular_horizontal_insertion_encoding(basis):
-            h_reg += 1
+if __name__ == "__main__":
+    tallies = census(
+        CayleyPermutation.of_size(3),
+        ["RGF vertical", "RGF horizontal"],
+        output="census_rgfs_3.jsonl",
+    )
 
-print("RGF classes with a vertical insertion encoding", v_reg)
-print("RGF classes with a horizontal insertion encoding", h_reg)
-print("RGF classes with either a vertical or horizontal insertion encoding", both)
-print("Total RGF classes", total)
+    print("RGF classes with a vertical insertion encoding", tallies["RGF vertical"])
+    print("RGF classes with a horizontal insertion encoding", tallies["RGF horizontal"])
+    print(
+        "RGF classes with either a vertical or horizontal insertion encoding",
+        tallies["any"],
+    )
+    print("Total RGF classes", tallies["total"])
@@ -25,5 +25,5 @@ spec.get_genf()
 
 # Print the counts up to size n
 n = 10
-spec_counts = [spec.count_objects_of_size(i) for i in range(n)]
+spec_counts = spec.counts(n)
 print(spec_counts)
@@ -26,4 +26,4 @@ spec.get_genf()
 
 # Print the counts up to size n
 n = 10
-print([spec.count_objects_of_size(i) for i in range(n)])
+print(spec.counts(n))
@@ -0,0 +1,151 @@
+"""Detecting searches which grow without bound.
+
+A class with a regular insertion encoding only ever meets classes of bounded
+size: tilings with boundedly many cells and obstructions, or configurations
+whose length and number of slots are bounded. When the strategy pack does not
+fit the class the search instead keeps finding larger classes, until it runs
+out of time or memory. The GrowthMonitor splits the search into windows of
+expansions and records the largest value of each measure among the classes
+found in each window. The growth is taken to be unbounded when a measure
+reaches a new maximum in each of the last patience windows, or when fewer
+than min_verified_fraction of the classes found are verified in each of the
+last patience windows, so the frontier of the search only grows.
+
+The defaults are chosen so that a search is only stopped after thousands of
+expansions of steady growth."""
+
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+MEASURES = {
+    "cells": "number of cells",
+    "obstructions": "number of obstructions",
+    "length": "configuration length",
+    "slots": "maximum number of slots in the evolution of a configuration",
+}
+
+
+def class_measures(comb_class: Any) -> Dict[str, int]:
+    """Returns the structural measures of a tiling or a configuration, which
+    are bounded for a search which finishes.
+
+    The slots of a vertical configuration are the most slots of any
+    configuration on the way to it, and of a horizontal configuration its
+    number of slots."""
+    dimensions = getattr(comb_class, "dimensions", None)
+    if dimensions is not None:
+        return {
+            "cells": dimensions[0] * dimensions[1],
+            "obstructions": len(comb_class.obstructions),
+        }
+    config = getattr(comb_class, "config", None)
+    if config is None:
+        return {}
+    if hasattr(config, "max_slots_of_evolution"):
+        slots = config.max_slots_of_evolution()
+    else:
+        slots = len(config.slots)
+    return {"length": len(config), "slots": slots}
+
+
+class GrowthMonitor:
+    """Watches the classes found by a search for unbounded growth. A monitor
+    records one search, so each search needs a new one.
+
+    Example:
+    >>> monitor = GrowthMonitor(window=1, patience=3)
+    >>> for size in range(3):
+    ...     monitor.observe_measures({"length": size})
+    ...     monitor.observe_verified()
+    ...     diagnosis = monitor.observe_expansion()
+    >>> monitor.maxima, monitor.streaks["length"]
+    ({'length': 2}, 3)
+    >>> diagnosis.startswith("The largest configuration length")
+    True
+    """
+
+    def __init__(
+        self,
+        window: int = 1000,
+        patience: int = 8,
+        min_verified_fraction: float = 0.01,
+    ):
+        self.window = window
+        self.patience = patience
+        self.min_verified_fraction = min_verified_fraction
+        self.maxima: Dict[str, int] = {}
+        self.streaks: Counter = Counter()
+        self.unverified_streak = 0
+        self.expansions = 0
+        self.history: List[Dict[str, Any]] = []
+        self._window_maxima: Dict[str, int] = {}
+        self._found = 0
+        self._verified = 0
+
+    def observe_class(self, comb_class: Any) -> None:
+        """Records a new class found by the search."""
+        self.observe_measures(class_measures(comb_class))
+
+    def observe_measures(self, measures: Dict[str, int]) -> None:
+        """Records the measures of a new class found by the search."""
+        self._found += 1
+        for name, value in measures.items():
+            if value > self._window_maxima.get(name, -1):
+                self._window_maxima[name] = value
+
+    def observe_verified(self) -> None:
+        """Records that the search verified a class."""
+        self._verified += 1
+
+    def observe_expansion(self) -> Optional[str]:
+        """Records the expansion of a class, returning the diagnosis if the
+        growth of the search is unbounded."""
+        self.expansions += 1
+        if self.expansions % self.window:
+            return None
+        for name, value in self._window_maxima.items():
+            if value > self.maxima.get(name, -1):
+                self.maxima[name] = value
+                self.streaks[name] += 1
+            else:
+                self.streaks[name] = 0
+        if self._found and self._verified < self.min_verified_fraction * self._found:
+            self.unverified_streak += 1
+        else:
+            self.unverified_streak = 0
+        self.history.append(
+            {
+                "found": self._found,
+                "verified": self._verified,
+                "maxima": self._window_maxima,
+            }
+        )
+        self._window_maxima = {}
+        self._found = self._verified = 0
+        return self.diagnosis()
+
+    def diagnosis(self) -> Optional[str]:
+        """Returns a description of the unbounded growth of the search, or
+        None if none has been seen."""
+        for name, streak in self.streaks.items():
+            if streak >= self.patience:
+                return (
+                    f"The largest {MEASURES.get(name, name)} of the classes found "
+                    f"grew in each of the last {streak} windows of {self.window} "
+                    f"expansions, to {self.maxima[name]}."
+                )
+        if self.unverified_streak >= self.patience:
+            return (
+                f"Fewer than {self.min_verified_fraction:.0%} of the classes found "
+                f"were verified in each of the last {self.unverified_streak} windows "
+                f"of {self.window} expansions."
+            )
+        return None
+
+    def to_jsonable(self) -> dict:
+        """Return a dictionary form of what the monitor has seen."""
+        return {
+            "expansions": self.expansions,
+            "maxima": dict(self.maxima),
+            "history": self.history,
+        }
@@ -0,0 +1,327 @@
+"""Opt-in instrumentation of the strategies applied during a search.
+
+For each strategy class the number of applications, the time spent, the number
+of children produced and the distribution of the sizes of the children are
+recorded. The size of a tiling is its number of cells and the size of a
+configuration is its length.
+
+Separately, a search can report its progress, the number of classes found,
+queued and expanded and the number of rules found, to a callback, and can be
+stopped when it exceeds a SearchBudget or a GrowthMonitor finds its growth
+unbounded."""
+
+import json
+import time
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from comb_spec_searcher import CombinatorialSpecificationSearcher
+from comb_spec_searcher.class_queue import CSSQueue
+from comb_spec_searcher.rule_db import RuleDBForest
+from comb_spec_searcher.rule_db.abstract import RuleDBAbstract
+from comb_spec_searcher.strategies.rule import AbstractRule, VerificationRule
+from comb_spec_searcher.utils import get_mem
+
+from .budget import PartialSearchResult, SearchBudget, SearchStopped
+from .growth import GrowthMonitor
+
+
+def class_size(comb_class: Any) -> int:
+    """Returns the number of cells of a tiling or the length of a configuration."""
+    dimensions = getattr(comb_class, "dimensions", None)
+    if dimensions is not None:
+        return dimensions[0] * dimensions[1]
+    return len(comb_class.config)
+
+
+class StrategyMetrics:
+    """The metrics recorded for one strategy class."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        self.children = 0
+        self.child_sizes: Counter = Counter()
+
+    def record(
+        self, seconds: float, children: Iterable[Any] = (), call: bool = True
+    ) -> None:
+        """Record an application of the strategy."""
+        self.calls += int(call)
+        self.seconds += seconds
+        for child in children:
+            self.children += 1
+            self.child_sizes[class_size(child)] += 1
+
+    def to_jsonable(self) -> dict:
+        """Return a dictionary form of the metrics."""
+        return {
+            "calls": self.calls,
+            "seconds": self.seconds,
+            "children": self.children,
+            "child_sizes": {
+                str(size): num for size, num in sorted(self.child_sizes.items())
+            },
+        }
+
+
+class SearchMetrics:
+    """The metrics recorded for each strategy class during a search."""
+
+    def __init__(self) -> None:
+        self.strategies: Dict[str, StrategyMetrics] = defaultdict(StrategyMetrics)
+
+    def record(
+        self,
+        strategy: Any,
+        seconds: float,
+        children: Iterable[Any] = (),
+        call: bool = True,
+    ) -> None:
+        """Record an application of the strategy (or strategy factory)."""
+        self.strategies[type(strategy).__name__].record(seconds, children, call)
+
+    def to_jsonable(self) -> dict:
+        """Return a dictionary form of the metrics."""
+        return {
+            name: metrics.to_jsonable()
+            for name, metrics in sorted(self.strategies.items())
+        }
+
+    def to_json(self) -> str:
+        """Return the metrics as a JSON string."""
+        return json.dumps(self.to_jsonable(), indent=2)
+
+    def to_prometheus(self, prefix: str = "insertion_encoding") -> str:
+        """Return the metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric, description, attr in (
+            ("strategy_calls_total", "Number of applications.", "calls"),
+            ("strategy_seconds_total", "Time spent applying.", "seconds"),
+            ("strategy_children_total", "Number of children produced.", "children"),
+        ):
+            lines.append(f"# HELP {prefix}_{metric} {description}")
+            lines.append(f"# TYPE {prefix}_{metric} counter")
+            for name, metrics in sorted(self.strategies.items()):
+                value = getattr(metrics, attr)
+                lines.append(f'{prefix}_{metric}{{strategy="{name}"}} {value}')
+        metric = f"{prefix}_strategy_child_size"
+        lines.append(f"# HELP {metric} Sizes of the children produced.")
+        lines.append(f"# TYPE {metric} histogram")
+        for name, metrics in sorted(self.strategies.items()):
+            cumulative = 0
+            for size, num in sorted(metrics.child_sizes.items()):
+                cumulative += num
+                lines.append(
+                    f'{metric}_bucket{{strategy="{name}",le="{size}"}} {cumulative}'
+                )
+            lines.append(
+                f'{metric}_bucket{{strategy="{name}",le="+Inf"}} {metrics.children}'
+            )
+            total = sum(size * num for size, num in metrics.child_sizes.items())
+            lines.append(f'{metric}_sum{{strategy="{name}"}} {total}')
+            lines.append(f'{metric}_count{{strategy="{name}"}} {metrics.children}')
+        return "\n".join(lines) + "\n"
+
+
+class InstrumentedSpecificationSearcher(CombinatorialSpecificationSearcher):
+    """A CombinatorialSpecificationSearcher recording SearchMetrics.
+
+    The time taken to produce a rule is recorded against the class of the
+    strategy of the rule, and any time spent after the last rule, such as
+    a strategy factory yielding no rules, against the strategy generator."""
+
+    def __init__(self, *args, **kwargs):
+        self.metrics = SearchMetrics()
+        super().__init__(*args, **kwargs)
+
+    def _expand_class_with_strategy(
+        self,
+        comb_class: Any,
+        strategy_generator: Any,
+        label: Optional[int] = None,
+        initial: bool = False,
+    ) -> Iterator[Tuple[int, Tuple[int, ...], AbstractRule]]:
+        expansion = super()._expand_class_with_strategy(
+            comb_class, strategy_generator, label, initial
+        )
+        yielded = False
+        while True:
+            start = time.perf_counter()
+            try:
+                start_label, end_labels, rule = next(expansion)
+            except StopIteration:
+                self.metrics.record(
+                    strategy_generator, time.perf_counter() - start, call=not yielded
+                )
+                return
+            self.metrics.record(
+                rule.strategy, time.perf_counter() - start, rule.children
+            )
+            yielded = True
+            yield start_label, end_labels, rule
+
+
+def queue_size(classqueue: CSSQueue) -> int:
+    """Returns the number of labels waiting in the queue of a search."""
+    size = len(getattr(classqueue, "working", ()))
+    size += sum(len(queue) for queue in getattr(classqueue, "curr_level", ()))
+    size += len(getattr(classqueue, "heap", ()))
+    return size + len(getattr(classqueue, "next_level", ()))
+
+
+def rule_count(ruledb: RuleDBAbstract) -> int:
+    """Returns the number of rules added to the rule database of a search."""
+    if isinstance(ruledb, RuleDBForest):
+        return ruledb._num_rules  # pylint: disable=protected-access
+    return len(ruledb.rule_to_strategy)
+
+
+def search_statistics(searcher: CombinatorialSpecificationSearcher) -> Dict[str, int]:
+    """Returns the number of classes found, queued and rules found by a search."""
+    return {
+        "classes": len(searcher.classdb.label_to_info),
+        "queue": queue_size(searcher.classqueue),
+        "rules": rule_count(searcher.ruledb),
+    }
+
+
+class MonitoredSpecificationSearcher(CombinatorialSpecificationSearcher):
+    """A CombinatorialSpecificationSearcher which reports its progress and
+    stops when it exceeds its budget or its growth is unbounded.
+
+    After expanding a class, progress is called with a dictionary describing
+    the state of the search, at most once every progress_interval seconds.
+    The budget is checked after each rule found while expanding a class, with
+    the memory checked at most once every MEMORY_INTERVAL seconds. The growth
+    monitor is shown every new class and verification, and asked for a
+    diagnosis after each expansion. SearchStopped is raised with the partial
+    result when the search is stopped."""
+
+    MEMORY_INTERVAL = 0.1
+
+    def __init__(
+        self,
+        *args,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        progress_interval: float = 1.0,
+        budget: Optional[SearchBudget] = None,
+        growth: Optional[GrowthMonitor] = None,
+        **kwargs,
+    ):
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self.budget = budget
+        self.growth = growth
+        self.expanded = 0
+        self.expanding = False
+        self.labels_seen = 0
+        self.start_time = self.last_progress = time.perf_counter()
+        self.class_start = self.start_time
+        self.last_memory_check = float("-inf")
+        self.memory = 0
+        super().__init__(*args, **kwargs)
+
+    def statistics(self) -> Dict[str, Any]:
+        """Returns the current state of the search."""
+        return {
+            "elapsed": time.perf_counter() - self.start_time,
+            "expanded": self.expanded,
+            **search_statistics(self),
+        }
+
+    def progress_event(self) -> Dict[str, Any]:
+        """Returns the current state of the search as a progress event."""
+        return {"event": "progress", **self.statistics()}
+
+    def stop(self, exceeded: str, reason: str, statistics: Dict[str, Any]) -> None:
+        """Raises SearchStopped with the partial result of the search."""
+        statistics["memory"] = get_mem()
+        if self.growth is not None:
+            statistics["maxima"] = dict(self.growth.maxima)
+        metrics = getattr(self, "metrics", None)
+        raise SearchStopped(
+            PartialSearchResult(
+                exceeded,
+                reason,
+                statistics,
+                None if metrics is None else metrics.to_jsonable(),
+            )
+        )
+
+    def check_budget(self) -> None:
+        """Stops the search if it has exceeded its budget."""
+        assert self.budget is not None
+        now = time.perf_counter()
+        if (
+            self.budget.max_memory is not None
+            and now - self.last_memory_check >= self.MEMORY_INTERVAL
+        ):
+            self.memory = get_mem()
+            self.last_memory_check = now
+        statistics = {
+            **self.statistics(),
+            "memory": self.memory,
+            "class_seconds": now - self.class_start,
+        }
+        exceeded = self.budget.exceeded(statistics)
+        if exceeded is not None:
+            self.stop(*exceeded, statistics)
+
+    def observe_rule(self, end_labels: Tuple[int, ...], rule: AbstractRule) -> None:
+        """Shows the growth monitor the new classes and verifications."""
+        assert self.growth is not None
+        if isinstance(rule, VerificationRule):
+            self.growth.observe_verified()
+        for child, child_label in zip(rule.children, end_labels):
+            if child_label >= self.labels_seen:
+                self.labels_seen = child_label + 1
+                self.growth.observe_class(child)
+
+    def _expand(self, comb_class: Any, label: int, strategies: Any, inferral: bool):
+        self.class_start = time.perf_counter()
+        self.expanding = True
+        try:
+            super()._expand(comb_class, label, strategies, inferral)
+        finally:
+            self.expanding = False
+        self.expanded += 1
+        if self.progress is not None:
+            now = time.perf_counter()
+            if now - self.last_progress >= self.progress_interval:
+                self.last_progress = now
+                self.progress(self.progress_event())
+        if self.growth is not None:
+            diagnosis = self.growth.observe_expansion()
+            if diagnosis is not None:
+                self.stop("growth", diagnosis, self.statistics())
+
+    def _expand_class_with_strategy(
+        self,
+        comb_class: Any,
+        strategy_generator: Any,
+        label: Optional[int] = None,
+        initial: bool = False,
+    ) -> Iterator[Tuple[int, Tuple[int, ...], AbstractRule]]:
+        expansion = super()._expand_class_with_strategy(
+            comb_class, strategy_generator, label, initial
+        )
+        if self.budget is None and self.growth is None:
+            yield from expansion
+            return
+        for start_label, end_labels, rule in expansion:
+            if self.growth is not None:
+                self.observe_rule(end_labels, rule)
+            if self.budget is not None and self.expanding:
+                self.check_budget()
+            yield start_label, end_labels, rule
+        if self.budget is not None and self.expanding:
+            self.check_budget()
+
+
+class InstrumentedMonitoredSpecificationSearcher(
+    InstrumentedSpecificationSearcher, MonitoredSpecificationSearcher
+):
+    """A CombinatorialSpecificationSearcher recording SearchMetrics, reporting
+    its progress and stopping when it exceeds its budget or its growth is
+    unbounded."""
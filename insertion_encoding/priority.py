@@ -0,0 +1,82 @@
+"""Expanding the simplest classes of a search first.
+
+The default queue of comb_spec_searcher expands the classes in levels, in the
+order they were found. A specification is usually made of small classes:
+tilings with few active cells and obstructions, or short configurations, which
+are soon verified as atoms. The PriorityQueue instead always expands the class
+with the lowest cost, so the small classes are expanded, and the
+specification closes, before the search spends time on the larger ones.
+
+A class is only left unexpanded while cheaper classes keep being found, so
+the cost should be one which only finitely many classes fall below, as the
+size of a tiling or configuration is."""
+
+import heapq
+from typing import Any, Callable, List, Set, Tuple
+
+from comb_spec_searcher.class_db import ClassDB
+from comb_spec_searcher.class_queue import DefaultQueue
+from comb_spec_searcher.strategies.strategy_pack import StrategyPack
+
+from .growth import class_measures
+
+Priority = Callable[[Any], Any]
+
+
+def expansion_cost(comb_class: Any) -> Tuple[int, ...]:
+    """Returns the cost of expanding a tiling, its numbers of active cells,
+    obstructions and requirements, or of a configuration, its length and
+    number of slots. Classes with a lower cost are expanded first."""
+    active_cells = getattr(comb_class, "active_cells", None)
+    if active_cells is not None:
+        return (
+            len(active_cells),
+            len(comb_class.obstructions),
+            len(comb_class.requirements),
+        )
+    measures = class_measures(comb_class)
+    return tuple(measures[name] for name in ("length", "slots") if name in measures)
+
+
+class PriorityQueue(DefaultQueue):
+    """A queue for a CombinatorialSpecificationSearcher which expands the
+    class with the lowest priority first, breaking ties by how often the
+    class was found and then by the order in which it was found.
+
+    The classes are looked up in the ClassDB given to the searcher, and the
+    priority of each class is computed once, when it first waits to be
+    expanded. The inferral and initial strategies are still applied to a
+    class as soon as it is found."""
+
+    def __init__(self, pack: StrategyPack, classdb: ClassDB, priority: Priority):
+        super().__init__(pack)
+        self.classdb = classdb
+        self.priority = priority
+        self.heap: List[Tuple[Any, int, int]] = []
+        self.queued: Set[int] = set()
+
+    def _change_level(self) -> None:
+        assert not (self.staging or self.working or any(self.curr_level))
+        for label, found in self.next_level.items():
+            if label not in self.queued:
+                self.queued.add(label)
+                heapq.heappush(
+                    self.heap,
+                    (self.priority(self.classdb.get_class(label)), -found, label),
+                )
+        self.next_level.clear()
+        while self.heap:
+            _, _, label = heapq.heappop(self.heap)
+            if label not in self.ignore:
+                self.curr_level[0].append(label)
+                self.queue_sizes.append(1)
+                return
+        raise StopIteration
+
+    def status(self) -> str:
+        return (
+            f"Queue status (expanded {self.levels_completed:,d} classes by "
+            f"priority):\n    working: {len(self.working):,d}, current: "
+            f"{sum(map(len, self.curr_level)):,d}, waiting: "
+            f"{len(self.heap) + len(self.next_level):,d}\n"
+        )
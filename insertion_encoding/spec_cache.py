@@ -0,0 +1,131 @@
+"""A persistent on-disk cache of specifications found by the searchers.
+
+Entries are keyed by the canonical basis of the class, the type of insertion
+encoding and a fingerprint of the strategy pack, so the same class searched
+with the same pack is only ever searched once."""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from comb_spec_searcher import CombinatorialSpecification, StrategyPack
+from cayley_permutations import CayleyPermutation, string_to_basis
+
+DEFAULT_CACHE_DIRECTORY = Path.home() / ".cache" / "insertion_encoding"
+
+
+def canonical_basis(
+    basis: str | Iterable[CayleyPermutation],
+) -> Tuple[CayleyPermutation, ...]:
+    """Returns the canonical form of a basis, with duplicates and redundant
+    patterns (those containing another basis pattern) removed and the
+    remaining patterns sorted by length and then lexicographically.
+
+    Example:
+    >>> [list(cperm) for cperm in canonical_basis("012, 01, 10, 10")]
+    [[0, 1], [1, 0]]
+    """
+    patterns = string_to_basis(basis) if isinstance(basis, str) else tuple(basis)
+    unique = sorted(
+        {CayleyPermutation(list(cperm)) for cperm in patterns},
+        key=lambda cperm: (len(cperm), tuple(cperm)),
+    )
+    minimal: List[CayleyPermutation] = []
+    for cperm in unique:
+        if not minimal or not cperm.contains(minimal):
+            minimal.append(cperm)
+    return tuple(minimal)
+
+
+def pack_fingerprint(pack: StrategyPack) -> str:
+    """Returns a hash identifying the strategies in a strategy pack."""
+    return hashlib.sha256(repr(pack).encode()).hexdigest()
+
+
+class SpecificationCache:
+    """A directory of JSON files, one per searched class, each storing the
+    specification found and any counts computed for it."""
+
+    def __init__(self, directory: Optional[str | Path] = None):
+        if directory is None:
+            directory = os.environ.get(
+                "INSERTION_ENCODING_CACHE", DEFAULT_CACHE_DIRECTORY
+            )
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(
+        basis: Iterable[CayleyPermutation], encoding: str, pack: StrategyPack
+    ) -> str:
+        """Returns the cache key for a basis, encoding type and strategy pack."""
+        content = json.dumps(
+            {
+                "basis": [list(cperm) for cperm in canonical_basis(basis)],
+                "encoding": encoding,
+                "pack": pack_fingerprint(pack),
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def path(self, key: str) -> Path:
+        """Returns the path of the file storing the entry for the key."""
+        return self.directory / f"{key}.json"
+
+    def __contains__(self, key: str) -> bool:
+        return self.path(key).exists()
+
+    def _read(self, key: str) -> dict:
+        try:
+            with open(self.path(key), encoding="utf-8") as fp:
+                return json.load(fp)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"specification": None, "counts": []}
+
+    def _write(self, key: str, entry: dict) -> None:
+        """Writes to a temporary file first so readers never see a partial entry."""
+        tmp = self.path(key).with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as fp:
+            json.dump(entry, fp)
+        os.replace(tmp, self.path(key))
+
+    def get_specification(self, key: str) -> Optional[CombinatorialSpecification]:
+        """Returns the stored specification, or None if there isn't one."""
+        spec_dict = self._read(key)["specification"]
+        if spec_dict is None:
+            return None
+        return CombinatorialSpecification.from_dict(spec_dict)
+
+    def store_specification(
+        self, key: str, specification: CombinatorialSpecification
+    ) -> None:
+        """Stores a specification, keeping any counts already stored. A
+        specification which can not be serialised is not stored."""
+        try:
+            spec_dict = specification.to_jsonable()
+        except NotImplementedError:
+            return
+        entry = self._read(key)
+        entry["specification"] = spec_dict
+        self._write(key, entry)
+
+    def get_counts(self, key: str) -> List[int]:
+        """Returns the counts stored for sizes 0, 1, 2, ..."""
+        return list(self._read(key)["counts"])
+
+    def store_counts(self, key: str, counts: Iterable[int]) -> None:
+        """Stores counts for sizes 0, 1, 2, ... if there are more of them
+        than are currently stored."""
+        counts = list(counts)
+        entry = self._read(key)
+        if len(counts) > len(entry["counts"]):
+            entry["counts"] = counts
+            self._write(key, entry)
+
+    def clear(self) -> None:
+        """Removes every entry from the cache."""
+        for path in self.directory.glob("*.json"):
+            path.unlink()
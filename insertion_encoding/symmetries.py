@@ -0,0 +1,193 @@
+"""Symmetries of Cayley permutation classes.
+
+The reverse and complement of a class of Cayley permutations have the same
+enumeration as the class, so only one basis from each orbit of the symmetry
+group needs to be searched. The insertion encodings are not symmetric under
+the whole group: the vertical insertion encoding of the reverse of a class is
+the vertical insertion encoding of the class with the letters l and r swapped,
+and the horizontal insertion encoding of the complement is the horizontal
+insertion encoding with u and d swapped, but neither encoding is preserved by
+the other symmetry. The images of a basis under the symmetries preserving the
+encoding are all regular or all not, so only one of them is tried, while the
+image under another symmetry may have a regular encoding when the basis does
+not. The reverse or complement of a restricted growth function need not be
+one, so classes of restricted growth functions are only related by the
+identity.
+"""
+
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from cayley_permutations import CayleyPermutation, string_to_basis
+
+from .spec_cache import canonical_basis
+
+if TYPE_CHECKING:
+    from .tilescope.generic_searcher import GenericSearcher
+
+Basis = Tuple[CayleyPermutation, ...]
+
+
+def reverse(cperm: CayleyPermutation) -> CayleyPermutation:
+    """Returns the reverse of a Cayley permutation.
+
+    Example:
+    >>> list(reverse(CayleyPermutation([0, 1, 1, 2])))
+    [2, 1, 1, 0]
+    """
+    return CayleyPermutation(list(cperm)[::-1])
+
+
+def complement(cperm: CayleyPermutation) -> CayleyPermutation:
+    """Returns the complement of a Cayley permutation.
+
+    Example:
+    >>> list(complement(CayleyPermutation([0, 1, 1, 2])))
+    [2, 1, 1, 0]
+    """
+    if len(cperm) == 0:
+        return cperm
+    max_val = max(cperm)
+    return CayleyPermutation([max_val - val for val in cperm])
+
+
+def reverse_complement(cperm: CayleyPermutation) -> CayleyPermutation:
+    """Returns the reverse of the complement of a Cayley permutation.
+
+    Example:
+    >>> list(reverse_complement(CayleyPermutation([0, 2, 1, 1])))
+    [1, 1, 0, 2]
+    """
+    return reverse(complement(cperm))
+
+
+SYMMETRIES: Dict[str, Callable[[CayleyPermutation], CayleyPermutation]] = {
+    "identity": lambda cperm: cperm,
+    "reverse": reverse,
+    "complement": complement,
+    "reverse_complement": reverse_complement,
+}
+
+ENCODING_SYMMETRIES: Dict[str, Tuple[str, ...]] = {
+    "vertical": ("identity", "reverse"),
+    "horizontal": ("identity", "complement"),
+    "RGF vertical": ("identity",),
+    "RGF horizontal": ("identity",),
+    "RGFs of matchings horizontal": ("identity",),
+}
+
+COUNT_SYMMETRIES: Dict[str, Tuple[str, ...]] = {
+    "vertical": tuple(SYMMETRIES),
+    "horizontal": tuple(SYMMETRIES),
+    "RGF vertical": ("identity",),
+    "RGF horizontal": ("identity",),
+    "RGFs of matchings horizontal": ("identity",),
+}
+
+
+def symmetric_basis(basis: str | Iterable[CayleyPermutation], symmetry: str) -> Basis:
+    """Returns the canonical basis of the image of the class under the symmetry.
+
+    Example:
+    >>> [list(cperm) for cperm in symmetric_basis("001, 012", "reverse")]
+    [[1, 0, 0], [2, 1, 0]]
+    """
+    patterns = string_to_basis(basis) if isinstance(basis, str) else basis
+    return canonical_basis(SYMMETRIES[symmetry](cperm) for cperm in patterns)
+
+
+def _sort_key(basis: Basis) -> List[Tuple[int, Tuple[int, ...]]]:
+    return [(len(cperm), tuple(cperm)) for cperm in basis]
+
+
+def representative(
+    basis: str | Iterable[CayleyPermutation],
+    symmetries: Iterable[str] = tuple(SYMMETRIES),
+) -> Tuple[Basis, str]:
+    """Returns the representative of the orbit of the basis under the given
+    symmetries, with the symmetry mapping the basis to the representative.
+
+    Example:
+    >>> rep, symmetry = representative("100, 110")
+    >>> [list(cperm) for cperm in rep], symmetry
+    ([[0, 0, 1], [0, 1, 1]], 'reverse')
+    """
+    images = [(symmetric_basis(basis, symmetry), symmetry) for symmetry in symmetries]
+    return min(images, key=lambda image: _sort_key(image[0]))
+
+
+def group_by_orbit(
+    bases: Iterable[str | Iterable[CayleyPermutation]],
+    symmetries: Iterable[str] = tuple(SYMMETRIES),
+) -> Dict[Basis, List[Basis]]:
+    """Groups the canonical forms of the bases by the representative of their orbit."""
+    symmetries = tuple(symmetries)
+    orbits: Dict[Basis, List[Basis]] = {}
+    for basis in bases:
+        canonical = canonical_basis(
+            string_to_basis(basis) if isinstance(basis, str) else basis
+        )
+        rep, _ = representative(canonical, symmetries)
+        members = orbits.setdefault(rep, [])
+        if canonical not in members:
+            members.append(canonical)
+    return orbits
+
+
+def encoding_symmetries(searcher_class: Type["GenericSearcher"]) -> Tuple[str, ...]:
+    """Returns the symmetries preserving the encoding of the searcher class."""
+    return ENCODING_SYMMETRIES.get(searcher_class.type_of_encoding, ("identity",))
+
+
+def count_symmetries(searcher_class: Type["GenericSearcher"]) -> Tuple[str, ...]:
+    """Returns the symmetries preserving the counts of the classes enumerated
+    by the searcher class, which are all of them for Cayley permutations and
+    only the identity for restricted growth functions."""
+    return COUNT_SYMMETRIES.get(searcher_class.type_of_encoding, ("identity",))
+
+
+def search_orbits(
+    searcher_class: Type["GenericSearcher"],
+    bases: Iterable[str | Iterable[CayleyPermutation]],
+    n: int,
+    max_expansion_time: int = 600,
+    symmetries: Optional[Iterable[str]] = None,
+    **kwargs,
+) -> Dict[Basis, List[int]]:
+    """Returns the number of objects of each size less than n in the class of
+    every basis, searching one basis in each orbit of the symmetries and
+    reusing its counts for the others.
+
+    A specification describes a single class, so only the counts, which are
+    the same for every class in an orbit, are shared. The searched basis is
+    the first image of the representative of the orbit which the searcher can
+    enumerate, trying one image for each set of images related by the
+    symmetries preserving the encoding. The keys of the returned dictionary
+    are the canonical forms of the bases given, and bases whose orbit contains
+    no basis the searcher can enumerate, or whose search is stopped by the
+    budget or growth monitor given to the searcher, are left out.
+    The symmetries default to all four for the searchers of Cayley
+    permutations and to the identity for those of restricted growth
+    functions. The keyword arguments are passed to the searcher."""
+    if symmetries is None:
+        symmetries = count_symmetries(searcher_class)
+    symmetries = tuple(symmetries)
+    preserved = encoding_symmetries(searcher_class)
+    counts: Dict[Basis, List[int]] = {}
+    for rep, members in group_by_orbit(bases, symmetries).items():
+        candidates: Dict[Basis, Basis] = {}
+        for symmetry in symmetries:
+            image = symmetric_basis(rep, symmetry)
+            candidates.setdefault(representative(image, preserved)[0], image)
+        for candidate in candidates.values():
+            try:
+                searcher = searcher_class(candidate, **kwargs)
+            except ValueError:
+                continue
+            try:
+                orbit_counts = searcher.counts(n, max_expansion_time)
+            except ValueError:
+                break
+            for member in members:
+                counts[member] = orbit_counts
+            break
+    return counts
@@ -2,12 +2,31 @@
 restricted rgowth functions using the vertical and
 horizontal insertion encodings."""
 
-from .strategies import RequirementInsertionStrategy
-from .vertical_ins_enc_searcher import VerticalSearcher, RGFVerticalSearcher
-from .horizontal_ins_enc_searcher import (
-    HorizontalSearcher,
-    RGFHorizontalSearcher,
-    MatchingHorizontalSearcher,
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from .strategies import RequirementInsertionStrategy
+    from .vertical_ins_enc_searcher import VerticalSearcher, RGFVerticalSearcher
+    from .horizontal_ins_enc_searcher import (
+        HorizontalSearcher,
+        RGFHorizontalSearcher,
+        MatchingHorizontalSearcher,
+    )
+    from .multi_searcher import MultiBasisSearcher
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "RequirementInsertionStrategy": ".strategies",
+        "VerticalSearcher": ".vertical_ins_enc_searcher",
+        "RGFVerticalSearcher": ".vertical_ins_enc_searcher",
+        "HorizontalSearcher": ".horizontal_ins_enc_searcher",
+        "RGFHorizontalSearcher": ".horizontal_ins_enc_searcher",
+        "MatchingHorizontalSearcher": ".horizontal_ins_enc_searcher",
+        "MultiBasisSearcher": ".multi_searcher",
+    },
 )
 
 __all__ = [
@@ -17,4 +36,5 @@ __all__ = [
     "HorizontalSearcher",
     "RGFHorizontalSearcher",
     "MatchingHorizontalSearcher",
+    "MultiBasisSearcher",
 ]
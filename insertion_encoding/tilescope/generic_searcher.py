@@ -1,20 +1,58 @@
 """A generic searcher class for insertion encodings."""
 
 import abc
+import logging
 from functools import cached_property
-from comb_spec_searcher import (
-    CombinatorialSpecificationSearcher,
-    CombinatorialSpecification,
-)
+from typing import Any, Callable, Dict, List, Optional
+from comb_spec_searcher import CombinatorialSpecificationSearcher
+from comb_spec_searcher.class_db import ClassDB
 from gridded_cayley_permutations import Tiling, GriddedCayleyPerm
 from cayley_permutations import string_to_basis
+from comb_spec_searcher.rule_db.abstract import RuleDBAbstract
+from ..enumeration import InsertionEncodingSpecification
+from ..budget import PartialSearchResult, SearchBudget, SearchStopped
+from ..growth import GrowthMonitor
+from ..priority import Priority, PriorityQueue
+from ..instrumentation import (
+    InstrumentedMonitoredSpecificationSearcher,
+    InstrumentedSpecificationSearcher,
+    MonitoredSpecificationSearcher,
+    SearchMetrics,
+)
+from ..spec_cache import SpecificationCache
+from ..symmetries import count_symmetries, representative
+from ..warm_start import warm_start
+
+logger = logging.getLogger(__name__)
 
 
 class GenericSearcher(abc.ABC):
-    """A generic searcher class for insertion encodings."""
+    """A generic searcher class for insertion encodings.
 
-    def __init__(self, basis: str, debug=False):
+    Each searcher class sets type_of_encoding, the name of its encoding."""
+
+    type_of_encoding: str
+
+    def __init__(
+        self,
+        basis: str,
+        debug=False,
+        cache: Optional[SpecificationCache] = None,
+        instrument: bool = False,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        progress_interval: float = 1.0,
+        budget: Optional[SearchBudget] = None,
+        growth: Optional[GrowthMonitor] = None,
+        priority: Optional[Priority] = None,
+    ):
         self.debug = debug
+        self.cache = cache
+        self.instrument = instrument
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self.budget = budget
+        self.growth = growth
+        self.priority = priority
         if isinstance(basis, str):
             self.basis = string_to_basis(basis)
         else:
@@ -22,13 +60,9 @@ class GenericSearcher(abc.ABC):
         if not self.regular_check():
             raise ValueError(
                 f"The class Av{tuple(self.basis)} can not be enumerated with "
-                f"{self.type_of_encoding()} insertion encoding"
+                f"{self.type_of_encoding} insertion encoding"
             )
 
-    @abc.abstractmethod
-    def type_of_encoding(self):
-        """Returns the type of encoding."""
-
     @abc.abstractmethod
     def start_class(self):
         """Returns the starting class - a tiling or configuration avoiding a basis."""
@@ -41,20 +75,151 @@ class GenericSearcher(abc.ABC):
     def pack(self):
         """Returns the strategy pack."""
 
+    def ruledb(self) -> Optional[RuleDBAbstract]:
+        """Returns the rule database to search with, or None for the default."""
+        return None
+
     @cached_property
     def comb_spec_searcher(self) -> CombinatorialSpecificationSearcher:
-        """Returns the CombinatorialSpecificationSearcher object for this searcher."""
-        print(self.pack(), self.pack().name)
-        return CombinatorialSpecificationSearcher(
-            self.start_class(), self.pack(), debug=self.debug
-        )
+        """Returns the CombinatorialSpecificationSearcher object for this searcher.
 
-    def auto_search(self, max_expansion_time=600) -> CombinatorialSpecification:
-        """Search for a specification."""
-        return self.comb_spec_searcher.auto_search(
-            max_expansion_time=max_expansion_time
+        If the searcher is instrumented this records the metrics of the search,
+        if it has a progress callback it is called with the state of the
+        search every progress_interval seconds, and if it has a budget or a
+        growth monitor the search stops when it exceeds the budget or its
+        growth is unbounded. If it has a priority the class with the lowest
+        priority is always expanded next."""
+        pack = self.pack()
+        start_class = self.start_class()
+        kwargs: Dict[str, Any] = {"ruledb": self.ruledb(), "debug": self.debug}
+        if self.priority is not None:
+            kwargs["classdb"] = ClassDB(type(start_class))
+            kwargs["classqueue"] = PriorityQueue(pack, kwargs["classdb"], self.priority)
+        logger.info(
+            "Searching with %s",
+            pack.name,
+            extra={
+                "basis": [list(cperm) for cperm in self.basis],
+                "encoding": self.type_of_encoding,
+                "pack": repr(pack),
+            },
+        )
+        if self.progress is None and self.budget is None and self.growth is None:
+            searcher_class = (
+                InstrumentedSpecificationSearcher
+                if self.instrument
+                else CombinatorialSpecificationSearcher
+            )
+            return searcher_class(start_class, pack, **kwargs)
+        searcher_class = (
+            InstrumentedMonitoredSpecificationSearcher
+            if self.instrument
+            else MonitoredSpecificationSearcher
+        )
+        return searcher_class(
+            start_class,
+            pack,
+            progress=self.progress,
+            progress_interval=self.progress_interval,
+            budget=self.budget,
+            growth=self.growth,
+            **kwargs,
         )
 
+    @property
+    def metrics(self) -> Optional[SearchMetrics]:
+        """Returns the metrics recorded so far if the searcher is instrumented."""
+        if not self.instrument:
+            return None
+        return self.comb_spec_searcher.metrics
+
+    def extended(self, patterns, **kwargs) -> "GenericSearcher":
+        """Returns a searcher of the same type for the subclass which also
+        avoids the patterns, given as a string or as Cayley permutations, with
+        the keyword arguments of a new searcher.
+
+        If this searcher has found a specification, the search of the new
+        searcher starts from the rules given by applying its strategies to
+        the classes of the new search."""
+        if isinstance(patterns, str):
+            patterns = string_to_basis(patterns)
+        searcher = type(self)([*self.basis, *patterns], **kwargs)
+        if "comb_spec_searcher" in self.__dict__:
+            searcher.warm_start(self.comb_spec_searcher)
+        return searcher
+
+    def warm_start(self, previous: CombinatorialSpecificationSearcher) -> int:
+        """Adds the rules of the specification found by the previous search,
+        for a class containing this one, which still apply to the classes of
+        this search. Returns the number of rules added."""
+        added = warm_start(self.comb_spec_searcher, previous)
+        logger.info("Warm started the search with %s rules", added)
+        return added
+
+    def cache_key(self) -> str:
+        """Returns the key identifying the specification of this search in a
+        SpecificationCache, which is shared only by bases with the same
+        canonical form, as a specification describes one class."""
+        return SpecificationCache.key(self.basis, self.type_of_encoding, self.pack())
+
+    def counts_key(self) -> str:
+        """Returns the key identifying the counts of this class in a
+        SpecificationCache.
+
+        Bases whose classes are symmetric share a key, as the classes have the
+        same counts."""
+        basis, _ = representative(self.basis, count_symmetries(type(self)))
+        return SpecificationCache.key(basis, self.type_of_encoding, self.pack())
+
+    def auto_search(
+        self, max_expansion_time=600
+    ) -> InsertionEncodingSpecification | PartialSearchResult:
+        """Search for a specification.
+
+        If the searcher has a cache, a specification found before for the same
+        basis, encoding and strategy pack is returned without searching. If the
+        searcher has a budget and the search exceeds it, or a growth monitor which
+        finds its growth unbounded, a PartialSearchResult with the statistics
+        of the search is returned instead."""
+        if self.cache is not None:
+            spec = self.cache.get_specification(self.cache_key())
+            if spec is not None:
+                return InsertionEncodingSpecification.from_specification(spec)
+        try:
+            spec = self.comb_spec_searcher.auto_search(
+                max_expansion_time=max_expansion_time
+            )
+        except SearchStopped as error:
+            logger.warning("Search stopped: %s", error.result.reason)
+            return error.result
+        if self.metrics is not None:
+            logger.info("Strategy metrics:\n%s", self.metrics.to_json())
+        if self.cache is not None:
+            self.cache.store_specification(self.cache_key(), spec)
+        return InsertionEncodingSpecification.from_specification(spec)
+
+    def counts(
+        self, n: int, max_expansion_time=600, modulus: Optional[int] = None
+    ) -> List[int]:
+        """Returns the number of objects in the class of each size less than n,
+        reusing and extending the counts stored in the cache for this class or
+        a symmetric one. If a modulus is
+        given the counts are reduced modulo it and are not cached. A ValueError
+        is raised if the search is stopped by the budget or growth monitor."""
+        if self.cache is not None:
+            counts = self.cache.get_counts(self.counts_key())
+            if len(counts) >= n:
+                if modulus is None:
+                    return counts[:n]
+                return [count % modulus for count in counts[:n]]
+        spec = self.auto_search(max_expansion_time=max_expansion_time)
+        if isinstance(spec, PartialSearchResult):
+            raise ValueError(spec.reason)
+        counts = spec.counts(n, modulus)
+        if self.cache is not None and modulus is None:
+            self.cache.store_counts(self.counts_key(), counts)
+        return counts
+
 
 class GenericTilingsSearcher(GenericSearcher):
     """A generic searcher for methods which use tilings."""
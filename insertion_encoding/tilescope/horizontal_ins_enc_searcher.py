@@ -1,13 +1,11 @@
 """A searcher for the horizontal insertion encoding."""
 
-from functools import cached_property
 from cayley_permutations import CayleyPermutation
 from gridded_cayley_permutations import GriddedCayleyPerm
 from check_regular_ins_enc import (
     regular_horizontal_insertion_encoding,
 )
 from comb_spec_searcher import (
-    CombinatorialSpecificationSearcher,
     StrategyPack,
     AtomStrategy,
 )
@@ -31,17 +29,16 @@ from .generic_searcher import GenericTilingsSearcher
 class HorizontalSearcher(GenericTilingsSearcher):
     """A searcher for the horizontal insertion encoding."""
 
+    type_of_encoding = "horizontal"
+
     def regular_check(self):
         return regular_horizontal_insertion_encoding(self.basis)
 
-    def type_of_encoding(self):
-        return "horizontal"
-
     def pack(self):
         return StrategyPack(
             initial_strats=[
                 FactorStrategy(),
-                HorizontalInsertionEncodingRequirementInsertionFactory(),
+                HorizontalInsertionEncodingRequirementInsertionFactory(combined=True),
             ],
             inferral_strats=[RemoveEmptyRowsAndColumnsStrategy()],
             expansion_strats=[[HorizontalInsertionEncodingPlacementFactory()]],
@@ -56,17 +53,16 @@ class RGFHorizontalSearcher(HorizontalSearcher):
     """A searcher for the horizontal insertion encoding for
     enumerating restricted growth functions."""
 
+    type_of_encoding = "RGF horizontal"
+
     def regular_check(self):
         return rgf_regular_horizontal_insertion_encoding(self.basis)
 
-    def type_of_encoding(self):
-        return "RGF horizontal"
-
     def pack(self):
         return StrategyPack(
             initial_strats=[
                 RGFFactorStrategy(),
-                HorizontalInsertionEncodingRequirementInsertionFactory(),
+                HorizontalInsertionEncodingRequirementInsertionFactory(combined=True),
             ],
             inferral_strats=[RemoveEmptyRowsAndColumnsStrategy()],
             expansion_strats=[[RGFHorizontalInsertionEncodingPlacementFactory()]],
@@ -81,14 +77,13 @@ class MatchingHorizontalSearcher(RGFHorizontalSearcher):
     """A searcher for the horizontal insertion encoding for
     enumerating restricted growth functions."""
 
-    def type_of_encoding(self):
-        return "RGFs of matchings horizontal"
+    type_of_encoding = "RGFs of matchings horizontal"
 
     def pack(self):
         return StrategyPack(
             initial_strats=[
                 RGFFactorStrategy(),
-                MatchingRequirementInsertionFactory(),
+                MatchingRequirementInsertionFactory(combined=True),
             ],
             inferral_strats=[
                 RemoveEmptyRowsAndColumnsStrategy(),
@@ -112,10 +107,5 @@ class MatchingHorizontalSearcher(RGFHorizontalSearcher):
             )
         )
 
-    @cached_property
-    def comb_spec_searcher(self) -> CombinatorialSpecificationSearcher:
-        """Returns the CombinatorialSpecificationSearcher object for this searcher."""
-        print(self.pack(), self.pack().name)
-        return CombinatorialSpecificationSearcher(
-            self.start_class(), self.pack(), debug=self.debug, ruledb=RuleDBForest()
-        )
+    def ruledb(self):
+        return RuleDBForest()
@@ -0,0 +1,134 @@
+"""A searcher finding specifications for many classes in one search."""
+
+import logging
+import time
+from functools import cached_property
+from typing import Iterable, List, Optional, Type
+
+from comb_spec_searcher import CombinatorialSpecificationSearcher
+from ..budget import PartialSearchResult, SearchStopped
+from ..enumeration import InsertionEncodingSpecification
+from .generic_searcher import GenericSearcher
+
+logger = logging.getLogger(__name__)
+
+SearchResult = Optional[InsertionEncodingSpecification | PartialSearchResult]
+
+
+class MultiBasisSearcher:
+    """Searches for specifications of the classes with each of the bases at
+    once, with one class database and rule database, so a class found while
+    searching for more than one of them, such as a factor of a tiling, is
+    only expanded once.
+
+    The keyword arguments are those of the searchers, which are all of the
+    given type. The search starts from the start class of each searcher and
+    is configured by the first, with its strategy pack, rule database,
+    instrumentation, progress callback, budget, growth monitor and
+    priority."""
+
+    def __init__(
+        self, searcher_class: Type[GenericSearcher], bases: Iterable, **kwargs
+    ):
+        self.searchers: List[GenericSearcher] = [
+            searcher_class(basis, **kwargs) for basis in bases
+        ]
+        if not self.searchers:
+            raise ValueError("A MultiBasisSearcher needs at least one basis.")
+
+    @cached_property
+    def comb_spec_searcher(self) -> CombinatorialSpecificationSearcher:
+        """Returns the CombinatorialSpecificationSearcher of the first
+        searcher, with the start classes of the other searchers added."""
+        searcher = self.searchers[0].comb_spec_searcher
+        added = {searcher.start_label}
+        for label, other in zip(self.root_labels, self.searchers):
+            if label not in added:
+                added.add(label)
+                searcher.classqueue.add(label)
+                searcher.try_verify(other.start_class(), label)
+        return searcher
+
+    @cached_property
+    def root_labels(self) -> List[int]:
+        """Returns the label of the start class of each searcher."""
+        classdb = self.searchers[0].comb_spec_searcher.classdb
+        return [
+            classdb.get_label(searcher.start_class()) for searcher in self.searchers
+        ]
+
+    def specification(
+        self, index: int, minimization_time_limit: float = 0
+    ) -> Optional[InsertionEncodingSpecification]:
+        """Returns the specification found so far for the class of the searcher
+        with the index, or None if there is none yet."""
+        searcher = self.comb_spec_searcher
+        start_label = searcher.start_label
+        searcher.start_label = self.root_labels[index]
+        try:
+            if not searcher.has_specification():
+                return None
+            spec = searcher.get_specification(minimization_time_limit)
+        finally:
+            searcher.start_label = start_label
+        cache = self.searchers[index].cache
+        if cache is not None:
+            cache.store_specification(self.searchers[index].cache_key(), spec)
+        return InsertionEncodingSpecification.from_specification(spec)
+
+    def auto_search(self, max_expansion_time=600) -> List[SearchResult]:
+        """Search for a specification of each class, returning them in the
+        order of the bases.
+
+        Specifications in the cache of a searcher are returned without
+        searching for them. The classes are expanded until every class has a
+        specification, checking for them after each period of expansion, as
+        comb_spec_searcher does. If the search is stopped by the budget or
+        growth monitor the PartialSearchResult is returned for each class
+        without a specification, and when max_expansion_time seconds have
+        passed, or there are no more classes to expand, None is."""
+        results: List[SearchResult] = [None] * len(self.searchers)
+        pending = []
+        for index, searcher in enumerate(self.searchers):
+            spec = None
+            if searcher.cache is not None:
+                spec = searcher.cache.get_specification(searcher.cache_key())
+            if spec is None:
+                pending.append(index)
+            else:
+                results[index] = InsertionEncodingSpecification.from_specification(spec)
+        start = time.time()
+        expanding = True
+        while pending:
+            check_start = time.time()
+            for index in list(pending):
+                spec = self.specification(index, 0.01 * (check_start - start))
+                if spec is not None:
+                    results[index] = spec
+                    pending.remove(index)
+            elapsed = time.time() - start
+            if not (pending and expanding) or elapsed > max_expansion_time:
+                break
+            expansion_time = min(
+                100 * (time.time() - check_start),
+                3600.0,
+                max_expansion_time - elapsed,
+            )
+            try:
+                # pylint: disable=protected-access
+                expanding, _ = self.comb_spec_searcher._expand_classes_for(
+                    expansion_time, None, time.time(), start
+                )
+            except SearchStopped as error:
+                logger.warning("Search stopped: %s", error.result.reason)
+                for index in pending:
+                    results[index] = error.result
+                break
+        logger.info(
+            "Found %s of %s specifications",
+            sum(
+                isinstance(result, InsertionEncodingSpecification) for result in results
+            ),
+            len(results),
+        )
+        return results
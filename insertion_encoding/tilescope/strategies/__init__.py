@@ -2,6 +2,7 @@
 
 from .requirement_insertions import (
     RequirementInsertionStrategy,
+    MultiRowRequirementInsertionStrategy,
     VerticalInsertionEncodingRequirementInsertionFactory,
     HorizontalInsertionEncodingRequirementInsertionFactory,
     MatchingRequirementInsertionFactory,
@@ -21,6 +22,7 @@ from .factor import FactorStrategy, RGFFactorStrategy
 
 __all__ = [
     "RequirementInsertionStrategy",
+    "MultiRowRequirementInsertionStrategy",
     "VerticalInsertionEncodingRequirementInsertionFactory",
     "HorizontalInsertionEncodingRequirementInsertionFactory",
     "MatchingRequirementInsertionFactory",
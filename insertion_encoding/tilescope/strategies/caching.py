@@ -0,0 +1,65 @@
+"""Memoisation of the children of the strategies.
+
+The children of a rule are computed by the decomposition function, which is
+called again whenever the children are not passed in, for example when
+counting or by extra_parameters. As the decomposition function is pure, the
+children are memoised for each strategy and tiling.
+
+Strategies compare equal when they have the same class and attributes but are
+not hashable, so the memo is keyed by the class and attributes of the strategy
+rather than the strategy itself. The memo of each decomposition function keeps
+at most CHILDREN_CACHE_SIZE tilings and their children, and does not keep the
+strategies alive."""
+
+from functools import lru_cache, wraps
+from typing import Any, Callable, Hashable, Tuple
+
+CHILDREN_CACHE_SIZE = 2**14
+
+DecompositionFunction = Callable[[Any, Any], Tuple[Any, ...]]
+
+
+def strategy_key(strategy: Any) -> Hashable:
+    """Returns a hashable key which is equal for strategies which are equal."""
+    return (type(strategy), tuple(sorted(strategy.__dict__.items())))
+
+
+class _StrategyKey:
+    """The key of a strategy in the memo, holding the strategy until its
+    children are computed."""
+
+    __slots__ = ("key", "strategy")
+
+    def __init__(self, strategy: Any):
+        self.key = strategy_key(strategy)
+        self.strategy = strategy
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _StrategyKey) and self.key == other.key
+
+
+def cache_children(
+    decomposition_function: DecompositionFunction,
+) -> DecompositionFunction:
+    """Decorates the decomposition function of a strategy to memoise its
+    children. The decorated function has the cache_info and cache_clear
+    methods of functools.lru_cache."""
+
+    @lru_cache(maxsize=CHILDREN_CACHE_SIZE)
+    def children(key: _StrategyKey, comb_class: Any) -> Tuple[Any, ...]:
+        return decomposition_function(key.strategy, comb_class)
+
+    @wraps(decomposition_function)
+    def wrapper(self: Any, comb_class: Any) -> Tuple[Any, ...]:
+        key = _StrategyKey(self)
+        try:
+            return children(key, comb_class)
+        finally:
+            key.strategy = None
+
+    wrapper.cache_info = children.cache_info  # type: ignore[attr-defined]
+    wrapper.cache_clear = children.cache_clear  # type: ignore[attr-defined]
+    return wrapper
@@ -1,11 +1,24 @@
 """Factors the tiling into sections that are independent of each other."""
 
+from functools import lru_cache
 from typing import Dict, Optional, Tuple, Iterator
 from comb_spec_searcher import CartesianProductStrategy
 from comb_spec_searcher.exception import StrategyDoesNotApply
 from gridded_cayley_permutations import Tiling, GriddedCayleyPerm
 from gridded_cayley_permutations.factors import Factors
 
+FACTOR_CACHE_SIZE = 2**16
+
+
+@lru_cache(maxsize=FACTOR_CACHE_SIZE)
+def find_factors(tiling: Tiling, rgf: bool = False) -> Tuple[Tiling, ...]:
+    """Returns the factors of the tiling, memoised for all factor strategies.
+
+    The hits and misses of the memo are given by find_factors.cache_info()."""
+    if rgf:
+        return tuple(Factors(tiling).rgf_find_factors())
+    return tuple(Factors(tiling).find_factors())
+
 
 class FactorStrategy(CartesianProductStrategy[Tiling, GriddedCayleyPerm]):
     """Strategy for factoring tilings"""
@@ -20,7 +33,7 @@ class FactorStrategy(CartesianProductStrategy[Tiling, GriddedCayleyPerm]):
         )
 
     def decomposition_function(self, comb_class: Tiling) -> Tuple[Tiling, ...]:
-        factors = Factors(comb_class).find_factors()
+        factors = find_factors(comb_class)
         if not factors:
             raise StrategyDoesNotApply("No factors found.")
         return factors
@@ -30,8 +43,6 @@ class FactorStrategy(CartesianProductStrategy[Tiling, GriddedCayleyPerm]):
     ) -> Tuple[Dict[str, str], ...]:
         if children is None:
             children = self.decomposition_function(comb_class)
-            if children is None:
-                raise StrategyDoesNotApply("Strategy does not apply")
         return tuple({} for _ in children)
 
     def formal_step(self) -> str:
@@ -82,7 +93,7 @@ class RGFFactorStrategy(FactorStrategy):
     of RGFs."""
 
     def decomposition_function(self, comb_class: Tiling) -> Tuple[Tiling, ...]:
-        factors = Factors(comb_class).rgf_find_factors()
+        factors = find_factors(comb_class, rgf=True)
         if not factors:
             raise StrategyDoesNotApply("No factors found.")
         return factors
@@ -18,6 +18,8 @@ from gridded_cayley_permutations.point_placements import (
 )
 from cayley_permutations import CayleyPermutation
 
+from .caching import cache_children
+
 
 Cell = Tuple[int, int]
 
@@ -139,6 +141,7 @@ class RequirementPlacementStrategy(DisjointUnionStrategy[Tiling, GriddedCayleyPe
         """The point placement algorithm."""
         return PointPlacement(tiling)
 
+    @cache_children
     def decomposition_function(self, comb_class: Tiling) -> Tuple[Tiling, ...]:
         return (comb_class.add_obstructions(self.gcps),) + self.algorithm(
             comb_class
@@ -147,7 +150,9 @@ class RequirementPlacementStrategy(DisjointUnionStrategy[Tiling, GriddedCayleyPe
     def extra_parameters(
         self, comb_class: Tiling, children: Optional[Tuple[Tiling, ...]] = None
     ) -> Tuple[Dict[str, str], ...]:
-        return tuple({} for _ in self.decomposition_function(comb_class))
+        if children is None:
+            children = self.decomposition_function(comb_class)
+        return tuple({} for _ in children)
 
     def formal_step(self):
         return (
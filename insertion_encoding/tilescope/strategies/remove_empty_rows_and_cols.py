@@ -9,6 +9,8 @@ from comb_spec_searcher.exception import StrategyDoesNotApply
 
 from gridded_cayley_permutations import Tiling, GriddedCayleyPerm
 
+from .caching import cache_children
+
 Cell = Tuple[int, int]
 
 
@@ -24,6 +26,7 @@ class RemoveEmptyRowsAndColumnsStrategy(
     ):
         super().__init__(ignore_parent=ignore_parent, possibly_empty=possibly_empty)
 
+    @cache_children
     def decomposition_function(self, comb_class: Tiling) -> Tuple[Tiling, ...]:
         rows_and_cols = comb_class.find_empty_rows_and_columns()
         if len(rows_and_cols[0]) == 0 and len(rows_and_cols[1]) == 0:
@@ -33,7 +36,9 @@ class RemoveEmptyRowsAndColumnsStrategy(
     def extra_parameters(
         self, comb_class: Tiling, children: Optional[Tuple[Tiling, ...]] = None
     ) -> Tuple[Dict[str, str], ...]:
-        return tuple({} for _ in self.decomposition_function(comb_class))
+        if children is None:
+            children = self.decomposition_function(comb_class)
+        return tuple({} for _ in children)
 
     def formal_step(self):
         return "Remove empty rows and columns"
@@ -91,6 +96,7 @@ class MatchingsRemoveExtraReqsStrategy(
     ):
         super().__init__(ignore_parent=ignore_parent, possibly_empty=possibly_empty)
 
+    @cache_children
     def decomposition_function(self, comb_class: Tiling) -> Tuple[Tiling, ...]:
         new_requirements: list[tuple[GriddedCayleyPerm, ...]] = []
         for req_list in comb_class.requirements:
@@ -108,7 +114,9 @@ class MatchingsRemoveExtraReqsStrategy(
     def extra_parameters(
         self, comb_class: Tiling, children: Optional[Tuple[Tiling, ...]] = None
     ) -> Tuple[Dict[str, str], ...]:
-        return tuple({} for _ in self.decomposition_function(comb_class))
+        if children is None:
+            children = self.decomposition_function(comb_class)
+        return tuple({} for _ in children)
 
     def formal_step(self):
         return "Remove extra requirements from requirement lists."
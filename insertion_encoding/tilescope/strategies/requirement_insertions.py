@@ -1,11 +1,14 @@
 """Strategies for inserting requirements into a tiling."""
 
+from itertools import product
 from typing import Dict, Iterable, Iterator, Optional, Tuple
 from comb_spec_searcher import DisjointUnionStrategy, StrategyFactory
 
 from gridded_cayley_permutations import GriddedCayleyPerm, Tiling
 from cayley_permutations import CayleyPermutation
 
+from .caching import cache_children
+
 Cell = Tuple[int, int]
 
 
@@ -16,6 +19,7 @@ class RequirementInsertionStrategy(DisjointUnionStrategy[Tiling, GriddedCayleyPe
         super().__init__(ignore_parent=ignore_parent)
         self.gcps = frozenset(gcps)
 
+    @cache_children
     def decomposition_function(self, comb_class: Tiling) -> Tuple[Tiling, ...]:
         return (
             comb_class.add_obstructions(self.gcps),
@@ -25,7 +29,9 @@ class RequirementInsertionStrategy(DisjointUnionStrategy[Tiling, GriddedCayleyPe
     def extra_parameters(
         self, comb_class: Tiling, children: Optional[Tuple[Tiling, ...]] = None
     ) -> Tuple[Dict[str, str], ...]:
-        return tuple({} for _ in self.decomposition_function(comb_class))
+        if children is None:
+            children = self.decomposition_function(comb_class)
+        return tuple({} for _ in children)
 
     def formal_step(self):
         return f"Either avoid or contain {self.gcps}"
@@ -69,6 +75,100 @@ class RequirementInsertionStrategy(DisjointUnionStrategy[Tiling, GriddedCayleyPe
         return cls(gcps=gcps, **d)
 
 
+class MultiRowRequirementInsertionStrategy(
+    DisjointUnionStrategy[Tiling, GriddedCayleyPerm]
+):
+    """Strategy for deciding at once which of several rows of a tiling are
+    positive. Each requirement list is either avoided or contained, giving
+    one child for each of the 2^k choices for k requirement lists, in the
+    order of itertools.product with avoiding before containing."""
+
+    def __init__(
+        self,
+        gcps_list: Iterable[Iterable[GriddedCayleyPerm]],
+        ignore_parent: bool = False,
+    ):
+        super().__init__(ignore_parent=ignore_parent)
+        self.gcps_list = tuple(frozenset(gcps) for gcps in gcps_list)
+
+    def requirement_list(
+        self, gcps: Iterable[GriddedCayleyPerm]
+    ) -> Tuple[GriddedCayleyPerm, ...]:
+        """The requirement list added when the gcps are contained."""
+        return tuple(gcps)
+
+    @cache_children
+    def decomposition_function(self, comb_class: Tiling) -> Tuple[Tiling, ...]:
+        children = []
+        for contains in product((False, True), repeat=len(self.gcps_list)):
+            child = comb_class.add_obstructions(
+                [
+                    gcp
+                    for gcps, contained in zip(self.gcps_list, contains)
+                    if not contained
+                    for gcp in gcps
+                ]
+            )
+            for gcps, contained in zip(self.gcps_list, contains):
+                if contained:
+                    child = child.add_requirement_list(self.requirement_list(gcps))
+            children.append(child)
+        return tuple(children)
+
+    def extra_parameters(
+        self, comb_class: Tiling, children: Optional[Tuple[Tiling, ...]] = None
+    ) -> Tuple[Dict[str, str], ...]:
+        if children is None:
+            children = self.decomposition_function(comb_class)
+        return tuple({} for _ in children)
+
+    def formal_step(self):
+        return f"Either avoid or contain each of {list(self.gcps_list)}"
+
+    def backward_map(
+        self,
+        comb_class: Tiling,
+        objs: Tuple[Optional[GriddedCayleyPerm], ...],
+        children: Optional[Tuple[Tiling, ...]] = None,
+    ) -> Iterator[GriddedCayleyPerm]:
+        # pylint: disable=duplicate-code
+        if children is None:
+            children = self.decomposition_function(comb_class)
+        raise NotImplementedError
+
+    def forward_map(
+        self,
+        comb_class: Tiling,
+        obj: GriddedCayleyPerm,
+        children: Optional[Tuple[Tiling, ...]] = None,
+    ) -> Tuple[Optional[GriddedCayleyPerm], ...]:
+        if children is None:
+            children = self.decomposition_function(comb_class)
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(" f"ignore_parent={self.ignore_parent})"
+
+    def to_jsonable(self) -> dict:
+        """Return a dictionary form of the strategy."""
+        d: dict = super().to_jsonable()
+        d.pop("workable")
+        d.pop("inferrable")
+        d.pop("possibly_empty")
+        d["gcps_list"] = [
+            [gcp.to_jsonable() for gcp in gcps] for gcps in self.gcps_list
+        ]
+        return d
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "MultiRowRequirementInsertionStrategy":
+        gcps_list = tuple(
+            tuple(GriddedCayleyPerm.from_dict(gcp) for gcp in gcps)
+            for gcps in d.pop("gcps_list")
+        )
+        return cls(gcps_list=gcps_list, **d)
+
+
 class VerticalInsertionEncodingRequirementInsertionFactory(StrategyFactory[Tiling]):
     """Factory for creating RequirementInsertionStrategy to make columns positive
     for the vertical insertion encoding."""
@@ -99,17 +199,41 @@ class VerticalInsertionEncodingRequirementInsertionFactory(StrategyFactory[Tilin
 
 class HorizontalInsertionEncodingRequirementInsertionFactory(StrategyFactory[Tiling]):
     """Factory for creating RequirementInsertionStrategy to make rows positive
-    for the horizontal insertion encoding."""
+    for the horizontal insertion encoding.
 
-    def __call__(self, comb_class: Tiling) -> Iterator[RequirementInsertionStrategy]:
-        for row in range(comb_class.dimensions[1]):
-            if not comb_class.row_is_positive(row):
-                gcps = tuple(
-                    GriddedCayleyPerm(CayleyPermutation([0]), [cell])
-                    for cell in comb_class.cells_in_row(row)
-                )
-                strategy = RequirementInsertionStrategy(gcps, ignore_parent=True)
-                yield strategy
+    If combined is True, a single MultiRowRequirementInsertionStrategy deciding
+    the positivity of every row which is not positive is created instead of a
+    strategy for each row."""
+
+    strategy_class = RequirementInsertionStrategy
+    multi_row_strategy_class = MultiRowRequirementInsertionStrategy
+
+    def __init__(self, combined: bool = False):
+        self.combined = combined
+
+    def __call__(
+        self, comb_class: Tiling
+    ) -> Iterator[RequirementInsertionStrategy | MultiRowRequirementInsertionStrategy]:
+        gcps_list = [
+            tuple(
+                GriddedCayleyPerm(CayleyPermutation([0]), [cell])
+                for cell in comb_class.cells_in_row(row)
+            )
+            for row in range(comb_class.dimensions[1])
+            if not comb_class.row_is_positive(row)
+        ]
+        if self.combined:
+            if gcps_list:
+                yield self.multi_row_strategy_class(gcps_list, ignore_parent=True)
+            return
+        for gcps in gcps_list:
+            yield self.strategy_class(gcps, ignore_parent=True)
+
+    def to_jsonable(self) -> dict:
+        """Return a dictionary form of the strategy."""
+        d: dict = super().to_jsonable()
+        d["combined"] = self.combined
+        return d
 
     @classmethod
     def from_dict(
@@ -118,7 +242,7 @@ class HorizontalInsertionEncodingRequirementInsertionFactory(StrategyFactory[Til
         return cls(**d)
 
     def __repr__(self) -> str:
-        return f"{self.__class__.__name__}()"
+        return f"{self.__class__.__name__}(combined={self.combined})"
 
     def __str__(self) -> str:
         return "Make rows positive"
@@ -128,6 +252,7 @@ class MatchingsRequirementInsertionStrategy(RequirementInsertionStrategy):
     """Strategy for inserting requirements into a tiling
     for enumerating restricted growth functions of matchings."""
 
+    @cache_children
     def decomposition_function(self, comb_class: Tiling) -> Tuple[Tiling, ...]:
         reqs = [
             GriddedCayleyPerm(
@@ -141,6 +266,23 @@ class MatchingsRequirementInsertionStrategy(RequirementInsertionStrategy):
         )
 
 
+class MatchingsMultiRowRequirementInsertionStrategy(
+    MultiRowRequirementInsertionStrategy
+):
+    """Strategy for deciding at once which of several rows of a tiling are
+    positive for enumerating restricted growth functions of matchings."""
+
+    def requirement_list(
+        self, gcps: Iterable[GriddedCayleyPerm]
+    ) -> Tuple[GriddedCayleyPerm, ...]:
+        return tuple(
+            GriddedCayleyPerm(
+                CayleyPermutation([0, 0]), [gcp.positions[0], gcp.positions[0]]
+            )
+            for gcp in gcps
+        )
+
+
 class MatchingRequirementInsertionFactory(
     HorizontalInsertionEncodingRequirementInsertionFactory
 ):
@@ -148,14 +290,5 @@ class MatchingRequirementInsertionFactory(
     for the horizontal insertion encoding for enumerating restricted growth functions
     of matchings."""
 
-    def __call__(self, comb_class: Tiling) -> Iterator[RequirementInsertionStrategy]:
-        for row in range(comb_class.dimensions[1]):
-            if not comb_class.row_is_positive(row):
-                gcps = tuple(
-                    GriddedCayleyPerm(CayleyPermutation([0]), [cell])
-                    for cell in comb_class.cells_in_row(row)
-                )
-                strategy = MatchingsRequirementInsertionStrategy(
-                    gcps, ignore_parent=True
-                )
-                yield strategy
+    strategy_class = MatchingsRequirementInsertionStrategy
+    multi_row_strategy_class = MatchingsMultiRowRequirementInsertionStrategy
@@ -21,12 +21,11 @@ from .generic_searcher import GenericTilingsSearcher
 class VerticalSearcher(GenericTilingsSearcher):
     """A searcher for the vertical insertion encoding."""
 
+    type_of_encoding = "vertical"
+
     def regular_check(self):
         return regular_vertical_insertion_encoding(self.basis)
 
-    def type_of_encoding(self):
-        return "vertical"
-
     def pack(self):
         return StrategyPack(
             initial_strats=[
@@ -46,12 +45,11 @@ class RGFVerticalSearcher(VerticalSearcher):
     """A searcher for the vertical insertion encoding for
     enumerating restricted growth functions."""
 
+    type_of_encoding = "RGF vertical"
+
     def regular_check(self):
         return rgf_regular_vertical_insertion_encoding(self.basis)
 
-    def type_of_encoding(self):
-        return "RGF vertical"
-
     def pack(self):
         return StrategyPack(
             initial_strats=[
@@ -1,11 +1,36 @@
 """Module for doing the insertion encoding for Cayley
 permutations in a way more similar to Vatter's method for permutations."""
 
-from .vatter_searchers import VatterVerticalSearcher, VatterHorizontalSearcher
-from .hori_config import HorizontalConfiguration
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from .vatter_searchers import VatterVerticalSearcher, VatterHorizontalSearcher
+    from .hori_config import HorizontalConfiguration
+    from .automaton import ConfigurationAutomaton
+    from .sampling import Sampler
+    from .export import read_automaton, write_automaton
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "VatterVerticalSearcher": ".vatter_searchers",
+        "VatterHorizontalSearcher": ".vatter_searchers",
+        "HorizontalConfiguration": ".hori_config",
+        "ConfigurationAutomaton": ".automaton",
+        "Sampler": ".sampling",
+        "read_automaton": ".export",
+        "write_automaton": ".export",
+    },
+)
 
 __all__ = [
     "VatterVerticalSearcher",
     "VatterHorizontalSearcher",
     "HorizontalConfiguration",
+    "ConfigurationAutomaton",
+    "Sampler",
+    "read_automaton",
+    "write_automaton",
 ]
@@ -0,0 +1,504 @@
+"""The insertion encoding of a regular class as a finite automaton.
+
+Deleting an index of a configuration which can be deleted does not change the
+words completing it to a Cayley permutation in the class, so the states of the
+automaton are the configurations with every such index deleted. Each letter
+moves from a state to the reduced configuration it gives, unless no Cayley
+permutation in the class can be completed from it, and the states with no
+slots are accepting. The class has a regular insertion encoding exactly
+when there are finitely many states, and every word accepted by the automaton
+from the start state encodes one Cayley permutation in the class of the same
+size as the word."""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from cayley_permutations import CayleyPermutation, string_to_basis
+
+from .hori_config import HorizontalConfiguration
+from .vert_config import VerticalConfiguration
+
+MAX_STATES = 10000
+
+# A letter as its type, the index of the slot and whether it repeats a value.
+LetterKey = Tuple[str, int, int]
+
+
+def start_configuration(
+    encoding: str,
+) -> VerticalConfiguration | HorizontalConfiguration:
+    """Returns the configuration with a single slot for the encoding."""
+    if encoding == "vertical":
+        return VerticalConfiguration(["🔹"])
+    if encoding == "horizontal":
+        return HorizontalConfiguration(CayleyPermutation([]), [-0.5])
+    raise ValueError(f"Unknown encoding {encoding}, expected vertical or horizontal.")
+
+
+class ConfigurationAutomaton:
+    """The automaton recognising the insertion encoding of the Cayley
+    permutations avoiding the basis. States are numbered from 0, the start
+    state, and only states from which an accepting state can be reached are
+    kept.
+
+    A ValueError is raised if there are more than max_states states, which is
+    the case when the class does not have a regular insertion encoding."""
+
+    def __init__(
+        self,
+        basis: str | Iterable[CayleyPermutation],
+        encoding: str = "vertical",
+        max_states: int = MAX_STATES,
+    ):
+        if isinstance(basis, str):
+            basis = string_to_basis(basis)
+        self.basis = list(basis)
+        self.encoding = encoding
+        self.max_states = max_states
+        self._reduced: Dict = {}
+        self._empty: Dict = {}
+        self.states: List[VerticalConfiguration | HorizontalConfiguration] = []
+        self.transitions: List[List[Tuple[LetterKey, int]]] = []
+        self._build()
+        self._set_tables(
+            self.transitions, [config.is_cayley_perm() for config in self.states]
+        )
+
+    @classmethod
+    def from_tables(
+        cls,
+        basis: Iterable[CayleyPermutation],
+        encoding: str,
+        transitions: List[List[Tuple[LetterKey, int]]],
+        accepting: List[bool],
+        states: Optional[List] = None,
+    ) -> "ConfigurationAutomaton":
+        """Returns the automaton with the given transitions and accepting
+        states, without building it from the basis. The configurations of the
+        states are only known if they are given."""
+        automaton = cls.__new__(cls)
+        automaton.basis = list(basis)
+        automaton.encoding = encoding
+        automaton.max_states = MAX_STATES
+        automaton._reduced = {}
+        automaton._empty = {}
+        automaton.states = states if states is not None else []
+        automaton._set_tables(transitions, accepting)
+        return automaton
+
+    def _set_tables(
+        self, transitions: List[List[Tuple[LetterKey, int]]], accepting: List[bool]
+    ) -> None:
+        self.transitions = [sorted(out) for out in transitions]
+        self._accepting = list(accepting)
+        self._delta = [dict(out) for out in self.transitions]
+        self._counts = [[int(accept) for accept in self._accepting]]
+
+    def reduce(
+        self, config: VerticalConfiguration | HorizontalConfiguration
+    ) -> VerticalConfiguration | HorizontalConfiguration:
+        """Returns the configuration with deleteable indices deleted until
+        there are none left."""
+        if config not in self._reduced:
+            reduced = config
+            indices = reduced.deleteable_indices(self.basis)
+            while indices:
+                reduced = reduced.delete_index(indices[0])
+                indices = reduced.deleteable_indices(self.basis)
+            self._reduced[config] = reduced
+        return self._reduced[config]
+
+    def _is_empty(
+        self, config: VerticalConfiguration | HorizontalConfiguration
+    ) -> bool:
+        # comb_spec_searcher is only needed to build an automaton, not to load one.
+        # pylint: disable=import-outside-toplevel
+        from .strategies import ConfigAvoidingBasis
+
+        if config not in self._empty:
+            self._empty[config] = ConfigAvoidingBasis(config, self.basis).is_empty()
+        return self._empty[config]
+
+    def _build(self) -> None:
+        start = self.reduce(start_configuration(self.encoding))
+        index = {start: 0}
+        states = [start]
+        transitions: List[List[Tuple[LetterKey, int]]] = []
+        queue = deque([start])
+        while queue:
+            config = queue.popleft()
+            out = []
+            for letter in config.all_possible_letters():
+                child = letter.apply(config)
+                if not child.avoids_basis(self.basis):
+                    continue
+                child = self.reduce(child)
+                if child not in index and self._is_empty(child):
+                    continue
+                if child not in index:
+                    if len(states) == self.max_states:
+                        raise ValueError(
+                            f"The {self.encoding} insertion encoding of "
+                            f"Av({', '.join(str(cperm) for cperm in self.basis)}) "
+                            f"has more than {self.max_states} states."
+                        )
+                    index[child] = len(states)
+                    states.append(child)
+                    queue.append(child)
+                out.append(((letter.letter, letter.index, letter.repeat), index[child]))
+            transitions.append(out)
+        self._trim(states, transitions)
+
+    def _trim(self, states: List, transitions: List[List[Tuple[LetterKey, int]]]):
+        """Keeps the states from which an accepting state can be reached."""
+        predecessors: List[List[int]] = [[] for _ in states]
+        for state, out in enumerate(transitions):
+            for _, target in out:
+                predecessors[target].append(state)
+        alive = {
+            state for state, config in enumerate(states) if config.is_cayley_perm()
+        }
+        queue = deque(alive)
+        while queue:
+            for previous in predecessors[queue.popleft()]:
+                if previous not in alive:
+                    alive.add(previous)
+                    queue.append(previous)
+        if 0 not in alive:
+            alive = {0}
+        renumber = {state: idx for idx, state in enumerate(sorted(alive))}
+        self.states = [states[state] for state in sorted(alive)]
+        self.transitions = [
+            [
+                (letter, renumber[target])
+                for letter, target in transitions[state]
+                if target in renumber
+            ]
+            for state in sorted(alive)
+        ]
+
+    @property
+    def start(self) -> int:
+        """The start state."""
+        return 0
+
+    def is_accepting(self, state: int) -> bool:
+        """Returns True if the configuration of the state has no slots."""
+        return self._accepting[state]
+
+    def __len__(self) -> int:
+        return len(self.transitions)
+
+    def alphabet(self) -> List[LetterKey]:
+        """Returns the letters read by the automaton, sorted."""
+        return sorted({letter for out in self.transitions for letter, _ in out})
+
+    def minimise(self) -> "ConfigurationAutomaton":
+        """Returns the automaton with equivalent states merged, found by
+        Hopcroft's partition refinement. Each state keeps the configuration
+        of the first state merged into it.
+
+        Example:
+        >>> automaton = ConfigurationAutomaton("12, 21", "horizontal")
+        >>> len(automaton), len(automaton.minimise())
+        (3, 2)
+        """
+        size = len(self)
+        sink = size
+        alphabet = self.alphabet()
+        # The states reading each letter into each state, with the missing
+        # transitions going to the sink.
+        inverse: Dict[LetterKey, List[List[int]]] = {
+            letter: [[] for _ in range(size + 1)] for letter in alphabet
+        }
+        for letter in alphabet:
+            for state in range(size + 1):
+                target = self._delta[state].get(letter, sink) if state < size else sink
+                inverse[letter][target].append(state)
+        accepting = frozenset(state for state in range(size) if self._accepting[state])
+        rejecting = frozenset(range(size + 1)) - accepting
+        partition = {block for block in (accepting, rejecting) if block}
+        waiting = [min(partition, key=len)]
+        while waiting:
+            splitter = waiting.pop()
+            for letter in alphabet:
+                sources = {
+                    state for target in splitter for state in inverse[letter][target]
+                }
+                for block in list(partition):
+                    inside = block & sources
+                    if not inside or inside == block:
+                        continue
+                    outside = block - inside
+                    partition.remove(block)
+                    partition.update((inside, outside))
+                    if block in waiting:
+                        waiting.remove(block)
+                        waiting.extend((inside, outside))
+                    else:
+                        waiting.append(min(inside, outside, key=len))
+        block_of = {state: block for block in partition for state in block}
+        # Number the merged states in breadth first order from the start.
+        number = {block_of[self.start]: 0}
+        order = [block_of[self.start]]
+        for block in order:
+            for _, target in self.transitions[min(block)]:
+                if block_of[target] not in number:
+                    number[block_of[target]] = len(order)
+                    order.append(block_of[target])
+        return self.from_tables(
+            self.basis,
+            self.encoding,
+            [
+                [
+                    (letter, number[block_of[target]])
+                    for letter, target in self.transitions[min(block)]
+                ]
+                for block in order
+            ],
+            [self._accepting[min(block)] for block in order],
+            [self.states[min(block)] for block in order] if self.states else None,
+        )
+
+    def counts(self, n: int) -> List[int]:
+        """Returns the number of accepted words of length n from every state,
+        extending the table of counts up to n if needed."""
+        while len(self._counts) <= n:
+            previous = self._counts[-1]
+            self._counts.append(
+                [sum(previous[target] for _, target in out) for out in self.transitions]
+            )
+        return self._counts[n]
+
+    def count(self, n: int) -> int:
+        """Returns the number of Cayley permutations of size n in the class."""
+        return self.counts(n)[self.start]
+
+    def rank(self, cperm: CayleyPermutation) -> int:
+        """Returns the number of Cayley permutations in the class of the same
+        size whose words come before the word of the Cayley permutation in
+        lexicographic order, comparing letters as (type, index, repeat).
+
+        A ValueError is raised if the Cayley permutation is not in the class."""
+        word = self.encode(cperm)
+        self.counts(len(word))
+        rank = 0
+        state = self.start
+        for idx, letter in enumerate(word):
+            counts = self._counts[len(word) - idx - 1]
+            for other, target in self.transitions[state]:
+                if other == letter:
+                    break
+                rank += counts[target]
+            else:
+                raise ValueError(f"{cperm} is not in the class.")
+            state = target
+        if not self.is_accepting(state):
+            raise ValueError(f"{cperm} is not in the class.")
+        return rank
+
+    def unrank_word(self, rank: int, n: int) -> List[LetterKey]:
+        """Returns the accepted word of length n with the given rank."""
+        if not 0 <= rank < self.count(n):
+            raise ValueError(
+                f"The rank must be between 0 and {self.count(n) - 1}, got {rank}."
+            )
+        word = []
+        state = self.start
+        for remaining in range(n - 1, -1, -1):
+            counts = self._counts[remaining]
+            for letter, target in self.transitions[state]:
+                if rank < counts[target]:
+                    break
+                rank -= counts[target]
+            word.append(letter)
+            state = target
+        return word
+
+    def unrank(self, rank: int, n: int) -> CayleyPermutation:
+        """Returns the Cayley permutation of size n in the class with the given
+        rank, the inverse of rank."""
+        return self.decode(self.unrank_word(rank, n))
+
+    def encode(self, cperm: CayleyPermutation) -> List[LetterKey]:
+        """Returns the word of the insertion encoding of a Cayley permutation,
+        in time linear in its size times the number of slots."""
+        return list(self._encode(cperm))
+
+    def _encode(self, cperm: CayleyPermutation) -> Iterator[LetterKey]:
+        if self.encoding == "vertical":
+            return _encode_vertical(cperm)
+        return _encode_horizontal(cperm)
+
+    def accepts(self, word: Iterable[LetterKey]) -> bool:
+        """Returns True if the word is accepted from the start state."""
+        state = self.start
+        for letter in word:
+            state = self._delta[state].get(letter, -1)
+            if state == -1:
+                return False
+        return self._accepting[state]
+
+    def in_class(self, cperm: CayleyPermutation) -> bool:
+        """Returns True if the Cayley permutation is in the class.
+
+        The word of the Cayley permutation is run through the automaton as it
+        is encoded, so this takes time linear in its size, and stops at the
+        first letter which can not be read.
+
+        Example:
+        >>> automaton = ConfigurationAutomaton("231, 312, 2121", "vertical")
+        >>> automaton.in_class(CayleyPermutation([0, 0, 1, 0]))
+        True
+        >>> automaton.in_class(CayleyPermutation([1, 2, 0]))
+        False
+        """
+        return self.accepts(self._encode(cperm))
+
+    def __contains__(self, cperm: CayleyPermutation) -> bool:
+        return self.in_class(cperm)
+
+    def filter(
+        self, cperms: Iterable[CayleyPermutation]
+    ) -> Iterator[CayleyPermutation]:
+        """Yields the Cayley permutations in the class from a stream."""
+        in_class = self.in_class
+        return (cperm for cperm in cperms if in_class(cperm))
+
+    def decode(self, word: Iterable[LetterKey]) -> CayleyPermutation:
+        """Returns the Cayley permutation encoded by an accepted word. The
+        configurations are kept as linked lists, so this takes time linear in
+        the length of the word times the number of slots."""
+        if self.encoding == "vertical":
+            return _decode_vertical(word)
+        return _decode_horizontal(word)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}({[list(cperm) for cperm in self.basis]}, "
+            f"{self.encoding!r})"
+        )
+
+    def __str__(self) -> str:
+        return (
+            f"Automaton of the {self.encoding} insertion encoding of "
+            f"Av({', '.join(str(cperm) for cperm in self.basis)}) "
+            f"with {len(self)} states"
+        )
+
+
+def _encode_vertical(cperm: CayleyPermutation) -> Iterator[LetterKey]:
+    # The values are inserted from smallest to largest, and equal values from
+    # left to right, into the slot covering the run of indices not yet filled.
+    positions: List[List[int]] = [[] for _ in range(max(cperm, default=-1) + 1)]
+    for idx, val in enumerate(cperm):
+        positions[val].append(idx)
+    runs = [(0, len(cperm) - 1)]
+    for indices in positions:
+        for repeat, idx in enumerate(indices):
+            slot = next(
+                slot for slot, (first, last) in enumerate(runs) if first <= idx <= last
+            )
+            first, last = runs[slot]
+            left, right = first < idx, idx < last
+            letter = "m" if left and right else "r" if left else "l" if right else "f"
+            runs[slot : slot + 1] = [(first, idx - 1)] * left + [
+                (idx + 1, last)
+            ] * right
+            yield letter, slot + 1, int(repeat == 0)
+
+
+def _encode_horizontal(cperm: CayleyPermutation) -> Iterator[LetterKey]:
+    # The values are inserted from left to right. A slot is a run of values
+    # not yet inserted, or a single value which appears again later.
+    remaining = [0] * (max(cperm, default=-1) + 1)
+    for val in cperm:
+        remaining[val] += 1
+    slots: List[Tuple[int, int]] = [(0, len(remaining) - 1)]
+    for val in cperm:
+        slot = next(
+            slot for slot, (first, last) in enumerate(slots) if first <= val <= last
+        )
+        first, last = slots[slot]
+        remaining[val] -= 1
+        repeat = int(remaining[val] > 0)
+        below, above = first < val, val < last
+        letter = "m" if below and above else "u" if below else "d" if above else "f"
+        slots[slot : slot + 1] = (
+            [(first, val - 1)] * below
+            + [(val, val)] * repeat
+            + [(val + 1, last)] * above
+        )
+        yield letter, slot, repeat
+
+
+def _decode_vertical(word: Iterable[LetterKey]) -> CayleyPermutation:
+    # The configuration is a linked list of values, with None for a slot.
+    values: List = [None]
+    following: List[int] = [-1]
+    slots = [0]
+    max_value = -1
+    for letter, index, repeat in word:
+        node = slots[index - 1]
+        max_value += repeat
+        if letter in ("l", "f"):
+            values[node] = max_value
+            if letter == "f":
+                del slots[index - 1]
+        if letter in ("r", "m"):
+            values.append(max_value)
+            following.append(following[node])
+            following[node] = len(values) - 1
+        if letter in ("l", "m"):
+            previous = len(values) - 1 if letter == "m" else node
+            values.append(None)
+            following.append(following[previous])
+            following[previous] = len(values) - 1
+            if letter == "l":
+                slots[index - 1] = len(values) - 1
+            else:
+                slots.insert(index, len(values) - 1)
+    cperm = []
+    node = 0
+    while node != -1:
+        cperm.append(values[node])
+        node = following[node]
+    return CayleyPermutation(cperm)
+
+
+def _decode_horizontal(word: Iterable[LetterKey]) -> CayleyPermutation:
+    # The values and the gaps between them are a linked list from the bottom,
+    # and each point records the node of its value.
+    is_value: List[bool] = [False]
+    following: List[int] = [-1]
+    slots = [0]
+    points = []
+    for letter, index, repeat in word:
+        node = slots.pop(index)
+        if is_value[node]:
+            value = node
+            if repeat:
+                slots.insert(index, value)
+        else:
+            is_value.append(True)
+            following.append(following[node])
+            following[node] = value = len(is_value) - 1
+            new_slots = []
+            if letter in ("u", "m"):
+                new_slots.append(node)
+            if repeat:
+                new_slots.append(value)
+            if letter in ("d", "m"):
+                is_value.append(False)
+                following.append(following[value])
+                following[value] = len(is_value) - 1
+                new_slots.append(len(is_value) - 1)
+            slots[index:index] = new_slots
+        points.append(value)
+    ranks = {}
+    node = 0
+    while node != -1:
+        if is_value[node]:
+            ranks[node] = len(ranks)
+        node = following[node]
+    return CayleyPermutation([ranks[point] for point in points])
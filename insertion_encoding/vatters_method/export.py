@@ -0,0 +1,160 @@
+"""A compact binary file format for the automaton of a class, so that it can
+be loaded without building it again.
+
+All values are little endian. The file is laid out as
+    - the header, HEADER, holding MAGIC, the encoding (0 for vertical and 1 for
+      horizontal), the number of states, the number of letters and the length
+      of the basis,
+    - the basis as UTF-8 text, each Cayley permutation on a line with its
+      values separated by commas,
+    - the alphabet, an int32 array of shape (letters, 3) where each row is the
+      code point of the type of the letter, the index and the repeat,
+    - the accepting states, a uint8 array of shape (states,),
+    - the transition table, an int32 array of shape (states, letters) with the
+      target of each letter from each state, or -1 if it can not be read.
+Each array starts at a multiple of 8 bytes, at the offsets given by
+offsets, so the arrays can be opened with numpy.memmap. The start state is 0."""
+
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from cayley_permutations import CayleyPermutation
+
+from .automaton import ConfigurationAutomaton
+
+MAGIC = b"INSENC\x00\x01"
+HEADER = struct.Struct("<8s4I")
+ENCODINGS = ("vertical", "horizontal")
+
+
+def _align(offset: int) -> int:
+    return -(-offset // 8) * 8
+
+
+def offsets(num_states: int, num_letters: int, basis_length: int) -> Dict[str, int]:
+    """Returns the offsets of the sections of the file, and its total size."""
+    basis = HEADER.size
+    alphabet = _align(basis + basis_length)
+    accepting = _align(alphabet + 12 * num_letters)
+    transitions = _align(accepting + num_states)
+    end = transitions + 4 * num_states * num_letters
+    return {
+        "basis": basis,
+        "alphabet": alphabet,
+        "accepting": accepting,
+        "transitions": transitions,
+        "end": end,
+    }
+
+
+def write_automaton(automaton: ConfigurationAutomaton, path: str | Path) -> None:
+    """Writes the automaton to a file."""
+    alphabet = automaton.alphabet()
+    column = {letter: idx for idx, letter in enumerate(alphabet)}
+    basis = "\n".join(
+        ",".join(str(val) for val in cperm) for cperm in automaton.basis
+    ).encode()
+    table = array("i", [-1] * (len(automaton) * len(alphabet)))
+    for state, out in enumerate(automaton.transitions):
+        for letter, target in out:
+            table[state * len(alphabet) + column[letter]] = target
+    sections = offsets(len(automaton), len(alphabet), len(basis))
+    data = bytearray(sections["end"])
+    HEADER.pack_into(
+        data,
+        0,
+        MAGIC,
+        ENCODINGS.index(automaton.encoding),
+        len(automaton),
+        len(alphabet),
+        len(basis),
+    )
+    data[sections["basis"] : sections["basis"] + len(basis)] = basis
+    letters = array(
+        "i",
+        [val for letter, idx, repeat in alphabet for val in (ord(letter), idx, repeat)],
+    )
+    _put(data, sections["alphabet"], letters)
+    data[sections["accepting"] : sections["accepting"] + len(automaton)] = bytes(
+        automaton.is_accepting(state) for state in range(len(automaton))
+    )
+    _put(data, sections["transitions"], table)
+    Path(path).write_bytes(bytes(data))
+
+
+def _put(data: bytearray, offset: int, values: array) -> None:
+    if sys.byteorder != "little":
+        values.byteswap()
+    raw = values.tobytes()
+    data[offset : offset + len(raw)] = raw
+
+
+def _get(data: bytes, offset: int, length: int) -> array:
+    values = array("i")
+    values.frombytes(data[offset : offset + 4 * length])
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def read_header(path: str | Path) -> Tuple[str, int, int, int]:
+    """Returns the encoding, the number of states, the number of letters and
+    the length of the basis of a file written by write_automaton."""
+    with open(path, "rb") as fp:
+        magic, encoding, num_states, num_letters, basis_length = HEADER.unpack(
+            fp.read(HEADER.size)
+        )
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not an automaton file.")
+    return ENCODINGS[encoding], num_states, num_letters, basis_length
+
+
+def read_automaton(path: str | Path) -> ConfigurationAutomaton:
+    """Returns the automaton stored in a file. The configurations of the
+    states are not stored, so only the transitions are known."""
+    encoding, num_states, num_letters, basis_length = read_header(path)
+    sections = offsets(num_states, num_letters, basis_length)
+    data = Path(path).read_bytes()
+    text = data[sections["basis"] : sections["basis"] + basis_length].decode()
+    basis = [
+        CayleyPermutation([int(val) for val in line.split(",")])
+        for line in text.split()
+    ]
+    codes = _get(data, sections["alphabet"], 3 * num_letters)
+    alphabet = [
+        (chr(codes[3 * idx]), codes[3 * idx + 1], codes[3 * idx + 2])
+        for idx in range(num_letters)
+    ]
+    accepting = [
+        bool(val)
+        for val in data[sections["accepting"] : sections["accepting"] + num_states]
+    ]
+    table = _get(data, sections["transitions"], num_states * num_letters)
+    transitions: List[List[Tuple[Tuple[str, int, int], int]]] = [
+        [
+            (letter, table[state * num_letters + idx])
+            for idx, letter in enumerate(alphabet)
+            if table[state * num_letters + idx] != -1
+        ]
+        for state in range(num_states)
+    ]
+    return ConfigurationAutomaton.from_tables(basis, encoding, transitions, accepting)
+
+
+def transition_table(path: str | Path):
+    """Returns the transition table of a file as a read only numpy.memmap of
+    shape (states, letters)."""
+    # pylint: disable=import-outside-toplevel
+    import numpy
+
+    _, num_states, num_letters, basis_length = read_header(path)
+    return numpy.memmap(
+        path,
+        dtype="<i4",
+        mode="r",
+        offset=offsets(num_states, num_letters, basis_length)["transitions"],
+        shape=(num_states, num_letters),
+    )
@@ -0,0 +1,173 @@
+"""Random sampling of the Cayley permutations in a class with a regular
+insertion encoding.
+
+The Cayley permutations of size n in the class are in bijection with the words
+of length n accepted by the automaton of the encoding, so they are sampled by
+drawing words. For exact size sampling, a uniformly random rank is unranked
+by the automaton, which chooses each letter with probability proportional to
+the number of completions after it. For approximate size sampling, the
+Boltzmann sampler at x chooses each letter with probability proportional to x
+times the generating function of the state it leads to, which gives every
+word of length n probability proportional to x^n, and x is chosen so that the
+expected length is the target size. In both cases drawing and decoding a word
+takes time linear in its length."""
+
+import random
+from typing import List, Optional, Tuple
+
+from cayley_permutations import CayleyPermutation
+
+from .automaton import ConfigurationAutomaton, LetterKey
+
+BISECTION_STEPS = 100
+
+
+class Sampler:
+    """Draws Cayley permutations from the class recognised by the automaton.
+
+    Example:
+    >>> automaton = ConfigurationAutomaton("12, 21", "vertical")
+    >>> print(Sampler(automaton, seed=0).sample(5))
+    00000
+    """
+
+    def __init__(self, automaton: ConfigurationAutomaton, seed: Optional[int] = None):
+        self.automaton = automaton
+        self.random = random.Random(seed)
+        self._accepting = [
+            automaton.is_accepting(state) for state in range(len(automaton))
+        ]
+        self._boltzmann: Optional[Tuple[float, float, List[float]]] = None
+
+    def sample_word(self, n: int) -> List[LetterKey]:
+        """Returns a uniformly random accepted word of length n."""
+        total = self.automaton.count(n)
+        if total == 0:
+            raise ValueError(f"There are no Cayley permutations of size {n}.")
+        return self.automaton.unrank_word(self.random.randrange(total), n)
+
+    def sample(self, n: int) -> CayleyPermutation:
+        """Returns a uniformly random Cayley permutation of size n in the class."""
+        return self.automaton.decode(self.sample_word(n))
+
+    def samples(self, n: int, number: int) -> List[CayleyPermutation]:
+        """Returns independent uniformly random Cayley permutations of size n."""
+        return [self.sample(n) for _ in range(number)]
+
+    def _generating_functions(self, x: float) -> Optional[Tuple[List[float], ...]]:
+        """Returns the generating functions of the states at x and their
+        derivatives, or None if x is not less than the radius of convergence.
+
+        These solve (I - xA)F = accepting and (I - xA)F' = AF for the
+        transition matrix A. The matrix I - xA is an M-matrix, with positive
+        pivots in Gaussian elimination, exactly when x is small enough."""
+        size = len(self.automaton)
+        matrix = [[0.0] * size for _ in range(size)]
+        for state, out in enumerate(self.automaton.transitions):
+            matrix[state][state] += 1.0
+            for _, target in out:
+                matrix[state][target] -= x
+        factors = [[0.0] * size for _ in range(size)]
+        for col in range(size):
+            pivot = matrix[col][col]
+            if pivot <= 0:
+                return None
+            for row in range(col + 1, size):
+                factor = matrix[row][col] / pivot
+                if factor:
+                    factors[row][col] = factor
+                    for idx in range(col, size):
+                        matrix[row][idx] -= factor * matrix[col][idx]
+
+        def solve(values: List[float]) -> List[float]:
+            for row in range(size):
+                values[row] -= sum(
+                    factors[row][col] * values[col] for col in range(row)
+                )
+            for row in range(size - 1, -1, -1):
+                values[row] = (
+                    values[row]
+                    - sum(
+                        matrix[row][col] * values[col] for col in range(row + 1, size)
+                    )
+                ) / matrix[row][row]
+            return values
+
+        functions = solve([float(acc) for acc in self._accepting])
+        derivatives = solve(
+            [
+                sum(functions[target] for _, target in out)
+                for out in self.automaton.transitions
+            ]
+        )
+        return functions, derivatives
+
+    def _expected_size(self, x: float) -> float:
+        """Returns the expected length of a word from the Boltzmann sampler
+        at x, or infinity if x is not less than the radius of convergence."""
+        solution = self._generating_functions(x)
+        if solution is None:
+            return float("inf")
+        functions, derivatives = solution
+        start = self.automaton.start
+        return x * derivatives[start] / functions[start]
+
+    def boltzmann_parameter(self, size: float) -> float:
+        """Returns the x for which the Boltzmann sampler has the given
+        expected size, found by bisection."""
+        low, high = 0.0, 1.0
+        while self._expected_size(high) < size:
+            low, high = high, 2 * high
+            if high > 2**64:
+                raise ValueError(
+                    f"No Boltzmann sampler for the class has expected size {size}."
+                )
+        for _ in range(BISECTION_STEPS):
+            middle = (low + high) / 2
+            if self._expected_size(middle) < size:
+                low = middle
+            else:
+                high = middle
+        return low
+
+    def boltzmann_word(
+        self, size: float, max_size: Optional[int] = None
+    ) -> Optional[List[LetterKey]]:
+        """Returns a random accepted word from the Boltzmann sampler whose
+        expected length is the given size, so that words of the same length
+        are equally likely. If the word becomes longer than max_size then
+        None is returned."""
+        if self._boltzmann is None or self._boltzmann[0] != size:
+            x = self.boltzmann_parameter(size)
+            solution = self._generating_functions(x)
+            assert solution is not None
+            self._boltzmann = (size, x, solution[0])
+        _, x, functions = self._boltzmann
+        word: List[LetterKey] = []
+        state = self.automaton.start
+        while max_size is None or len(word) <= max_size:
+            choice = self.random.random() * functions[state]
+            if self._accepting[state]:
+                choice -= 1
+                if choice < 0:
+                    return word
+            for letter, target in self.automaton.transitions[state]:
+                choice -= x * functions[target]
+                if choice < 0:
+                    break
+            word.append(letter)
+            state = target
+        return None
+
+    def boltzmann(self, size: int, tolerance: float = 0.1) -> CayleyPermutation:
+        """Returns a random Cayley permutation whose size is within the
+        tolerance of the given size, with the Cayley permutations of the same
+        size equally likely. Words of the wrong length are rejected, so
+        Boltzmann sampling is only faster than sample when the tolerance
+        allows many sizes."""
+        min_size = int(size * (1 - tolerance))
+        max_size = int(size * (1 + tolerance))
+        while True:
+            word = self.boltzmann_word(size, max_size)
+            if word is not None and min_size <= len(word):
+                return self.automaton.decode(word)
@@ -35,11 +35,30 @@ class ConfigAvoidingBasis(CombinatorialClass[CPermutation]):
         return not any(True for cperm in self.config.cayley_perms(size, self.basis))
 
     def to_jsonable(self) -> dict:
-        raise NotImplementedError("TODO")
+        d = super().to_jsonable()
+        if isinstance(self.config, VerticalConfiguration):
+            d["config"] = {"type": "vertical", "config": self.config.config}
+        else:
+            d["config"] = {
+                "type": "horizontal",
+                "cperm": list(self.config.cperm),
+                "slots": self.config.slots,
+            }
+        d["basis"] = [list(cperm) for cperm in self.basis]
+        return d
 
     @classmethod
-    def from_dict(cls, d: dict):
-        pass
+    def from_dict(cls, d: dict) -> "ConfigAvoidingBasis":
+        config_dict = d["config"]
+        config: VerticalConfiguration | HorizontalConfiguration
+        if config_dict["type"] == "vertical":
+            config = VerticalConfiguration(config_dict["config"])
+        else:
+            config = HorizontalConfiguration(
+                CayleyPermutation(config_dict["cperm"]), config_dict["slots"]
+            )
+        basis = tuple(CayleyPermutation(cperm) for cperm in d["basis"])
+        return cls(config, basis)
 
     def __eq__(self, other):
         if not isinstance(other, ConfigAvoidingBasis):
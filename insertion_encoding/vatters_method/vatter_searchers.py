@@ -11,6 +11,8 @@ from check_regular_ins_enc import (
     regular_vertical_insertion_encoding,
 )
 from ..tilescope.generic_searcher import GenericSearcher
+from .automaton import MAX_STATES, ConfigurationAutomaton
+from .sampling import Sampler
 from .vert_config import VerticalConfiguration
 from .hori_config import HorizontalConfiguration
 from .strategies import (
@@ -21,15 +23,26 @@ from .strategies import (
 )
 
 
-class VatterVerticalSearcher(GenericSearcher):
+class GenericVatterSearcher(GenericSearcher):
+    """A generic searcher for methods which use configurations."""
+
+    def automaton(self, max_states: int = MAX_STATES) -> ConfigurationAutomaton:
+        """Returns the automaton of the reduced configurations of the encoding."""
+        return ConfigurationAutomaton(self.basis, self.type_of_encoding, max_states)
+
+    def sampler(self, seed=None) -> Sampler:
+        """Returns a sampler of uniformly random Cayley permutations in the class."""
+        return Sampler(self.automaton(), seed)
+
+
+class VatterVerticalSearcher(GenericVatterSearcher):
     """A searcher for the vertical insertion encoding adapted from Vatter's method."""
 
+    type_of_encoding = "vertical"
+
     def regular_check(self):
         return regular_vertical_insertion_encoding(self.basis)
 
-    def type_of_encoding(self):
-        return "vertical"
-
     def start_class(self):
         return ConfigAvoidingBasis(VerticalConfiguration(["🔹"]), self.basis)
 
@@ -43,15 +56,14 @@ class VatterVerticalSearcher(GenericSearcher):
         )
 
 
-class VatterHorizontalSearcher(GenericSearcher):
+class VatterHorizontalSearcher(GenericVatterSearcher):
     """A searcher for the horizontal insertion encoding adapted from Vatter's method."""
 
+    type_of_encoding = "horizontal"
+
     def regular_check(self):
         return regular_horizontal_insertion_encoding(self.basis)
 
-    def type_of_encoding(self):
-        return "horizontal"
-
     def start_class(self):
         return ConfigAvoidingBasis(
             HorizontalConfiguration(CayleyPermutation([]), [-0.5]), self.basis
@@ -0,0 +1,67 @@
+"""Starting a search from the specification found for a larger class.
+
+Searches for Av(B) and for Av(B + P), a subclass avoiding the extra patterns
+P, expand nearly the same classes: each tiling or configuration of the second
+search is one of the first with the patterns P also avoided. The strategies
+of a specification of Av(B) do not depend on those patterns, so they are
+applied again, starting with the class of the new search and following the
+children of each rule to the classes of the new search they correspond to.
+Each rule is applied to the new class, so every rule added is a rule of the
+new search, and a strategy which no longer applies, or now gives a different
+number of children, is skipped. The search then carries on as usual, and
+often needs only a few expansions to finish."""
+
+from collections import deque
+from typing import Any, Deque, Dict, Set, Tuple
+
+from comb_spec_searcher import CombinatorialSpecificationSearcher
+from comb_spec_searcher.strategies.rule import AbstractRule, VerificationRule
+
+
+def specification_rules(
+    searcher: CombinatorialSpecificationSearcher,
+) -> Dict[Any, AbstractRule]:
+    """Returns the rules of the specification found by the search for each
+    class, with equivalence paths split into their rules, or an empty
+    dictionary if the search has not found a specification."""
+    if not searcher.ruledb.has_specification():
+        return {}
+    rules: Dict[Any, AbstractRule] = {}
+    for rule in searcher.ruledb.get_specification_rules(minimization_time_limit=0):
+        for part in getattr(rule, "rules", (rule,)):
+            rules.setdefault(part.comb_class, part)
+    return rules
+
+
+def warm_start(
+    searcher: CombinatorialSpecificationSearcher,
+    previous: CombinatorialSpecificationSearcher,
+) -> int:
+    """Adds the rules given by applying the strategies of the specification
+    found by the previous search to the corresponding classes of the search,
+    returning the number of rules added."""
+    rules = specification_rules(previous)
+    queue: Deque[Tuple[Any, int]] = deque(
+        [(previous.start_class, searcher.start_label)]
+    )
+    seen: Set[Any] = {previous.start_class}
+    added = 0
+    while queue:
+        old_class, label = queue.popleft()
+        rule = rules.get(old_class)
+        if rule is None or isinstance(rule, VerificationRule) or not rule.children:
+            continue
+        comb_class = searcher.classdb.get_class(label)
+        # pylint: disable=protected-access
+        for start_label, end_labels, new_rule in searcher._expand_class_with_strategy(
+            comb_class, rule.strategy, label
+        ):
+            if start_label != label or len(end_labels) != len(rule.children):
+                continue
+            searcher.add_rule(start_label, end_labels, new_rule)
+            added += 1
+            for old_child, child_label in zip(rule.children, end_labels):
+                if old_child not in seen:
+                    seen.add(old_child)
+                    queue.append((old_child, child_label))
+    return added
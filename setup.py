@@ -12,4 +12,8 @@ setup(
         "comb_spec_searcher",
         "cayley_perms @ git+https://github.com/Ollson2921/CayleyPerms",
     ],
+    extras_require={"numpy": ["numpy"]},
+    entry_points={
+        "console_scripts": ["insertion-encoding=insertion_encoding.cli:main"],
+    },
 )
@@ -0,0 +1,88 @@
+import asyncio
+import contextlib
+
+import pytest
+
+from insertion_encoding.async_search import async_search, search_events
+
+
+async def collect(events):
+    return [event async for event in events]
+
+
+@pytest.fixture
+def processes(monkeypatch):
+    """Records the subprocesses started by the searches."""
+    started = []
+    create_subprocess_exec = asyncio.create_subprocess_exec
+
+    async def spy(*args, **kwargs):
+        process = await create_subprocess_exec(*args, **kwargs)
+        started.append(process)
+        return process
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", spy)
+    return started
+
+
+def test_search_events():
+    events = asyncio.run(
+        collect(search_events("12_11", "vatter-horizontal", progress_interval=0))
+    )
+    assert events[-1]["event"] == "result"
+    assert "specification" in events[-1]["result"]
+    assert all(event["event"] == "progress" for event in events[:-1])
+
+
+def test_async_search():
+    events = []
+    spec = asyncio.run(
+        async_search(
+            "12_11", "vatter-horizontal", progress=events.append, progress_interval=0
+        )
+    )
+    assert spec.counts(10) == [0, 1, 1, 1, 1, 1, 1, 1, 1, 1]
+    assert all(event["event"] == "progress" for event in events)
+
+
+def test_async_search_error():
+    with pytest.raises(ValueError):
+        asyncio.run(async_search("12_11", "no such searcher"))
+
+
+def test_cancel_async_search(processes):
+    async def cancel_after_first_event():
+        first_event = asyncio.Event()
+        task = asyncio.create_task(
+            async_search(
+                "231, 312, 2121",
+                "vertical",
+                progress=lambda event: first_event.set(),
+                progress_interval=0,
+            )
+        )
+        await asyncio.wait(
+            [task, asyncio.ensure_future(first_event.wait())],
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        assert first_event.is_set()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert task.cancelled()
+
+    asyncio.run(cancel_after_first_event())
+    assert len(processes) == 1
+    assert processes[0].returncode is not None
+
+
+def test_break_out_of_search_events(processes):
+    async def first_event():
+        async with contextlib.aclosing(
+            search_events("231, 312, 2121", "vertical", progress_interval=0)
+        ) as events:
+            async for event in events:
+                return event
+
+    assert asyncio.run(first_event())["event"] == "progress"
+    assert len(processes) == 1
+    assert processes[0].returncode is not None
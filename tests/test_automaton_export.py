@@ -0,0 +1,42 @@
+import pytest
+
+from insertion_encoding import ConfigurationAutomaton, read_automaton, write_automaton
+from insertion_encoding.vatters_method.export import transition_table
+
+
+@pytest.mark.parametrize(
+    "basis, encoding", [("231, 312, 2121", "vertical"), ("12, 21", "horizontal")]
+)
+def test_minimise(basis, encoding):
+    automaton = ConfigurationAutomaton(basis, encoding)
+    minimised = automaton.minimise()
+    assert len(minimised) <= len(automaton)
+    assert len(minimised.minimise()) == len(minimised)
+    assert [minimised.count(n) for n in range(20)] == [
+        automaton.count(n) for n in range(20)
+    ]
+
+
+def test_write_and_read(tmp_path):
+    automaton = ConfigurationAutomaton("231, 312, 2121", "vertical").minimise()
+    path = tmp_path / "automaton.bin"
+    write_automaton(automaton, path)
+    loaded = read_automaton(path)
+    assert loaded.basis == automaton.basis
+    assert loaded.encoding == automaton.encoding
+    assert loaded.transitions == automaton.transitions
+    cperm = automaton.unrank(1000, 12)
+    assert loaded.in_class(cperm)
+    assert loaded.rank(cperm) == 1000
+
+
+def test_transition_table(tmp_path):
+    numpy = pytest.importorskip("numpy")
+    automaton = ConfigurationAutomaton("231, 312, 2121", "vertical")
+    path = tmp_path / "automaton.bin"
+    write_automaton(automaton, path)
+    table = transition_table(path)
+    assert table.shape == (len(automaton), len(automaton.alphabet()))
+    assert numpy.count_nonzero(table != -1) == sum(
+        len(out) for out in automaton.transitions
+    )
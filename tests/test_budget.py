@@ -0,0 +1,45 @@
+import pytest
+
+from insertion_encoding import (
+    HorizontalSearcher,
+    PartialSearchResult,
+    SearchBudget,
+    VerticalSearcher,
+)
+
+
+def test_exceeded():
+    budget = SearchBudget(max_classes=10, max_class_seconds=0.5)
+    assert budget.exceeded({"classes": 10, "class_seconds": 0.1}) is None
+    assert budget.exceeded({"classes": 11})[0] == "max_classes"
+    assert budget.exceeded({"classes": 1, "class_seconds": 1.0})[0] == (
+        "max_class_seconds"
+    )
+    assert SearchBudget().exceeded({"classes": 10**9, "memory": 2**40}) is None
+
+
+def test_class_budget():
+    searcher = HorizontalSearcher("210, 012, 100", budget=SearchBudget(max_classes=5))
+    result = searcher.auto_search()
+    assert isinstance(result, PartialSearchResult)
+    assert result.exceeded == "max_classes"
+    assert result.statistics["classes"] > 5
+    assert set(result.to_jsonable()) == {"exceeded", "reason", "statistics", "metrics"}
+
+
+def test_rule_budget_with_metrics():
+    searcher = VerticalSearcher(
+        "210, 012, 100", instrument=True, budget=SearchBudget(max_rules=2)
+    )
+    result = searcher.auto_search()
+    assert isinstance(result, PartialSearchResult)
+    assert result.exceeded == "max_rules"
+    assert result.metrics
+    with pytest.raises(ValueError):
+        VerticalSearcher("210, 012, 100", budget=SearchBudget(max_rules=2)).counts(5)
+
+
+def test_budget_not_exceeded():
+    budget = SearchBudget(max_memory=2**40, max_classes=10**6, max_rules=10**6)
+    spec = VerticalSearcher("210, 012, 100", budget=budget).auto_search()
+    assert spec.counts(8) == VerticalSearcher("210, 012, 100").auto_search().counts(8)
@@ -0,0 +1,46 @@
+from cayley_permutations import CayleyPermutation
+from gridded_cayley_permutations import GriddedCayleyPerm, Tiling
+
+from insertion_encoding import HorizontalSearcher, VerticalSearcher
+from insertion_encoding.tilescope.strategies import RequirementInsertionStrategy
+
+
+def test_children_memoised():
+    tiling = Tiling(
+        [GriddedCayleyPerm(CayleyPermutation([0, 1]), [(0, 0), (0, 0)])],
+        [],
+        (1, 1),
+    )
+    strategy = RequirementInsertionStrategy(
+        [GriddedCayleyPerm(CayleyPermutation([0]), [(0, 0)])]
+    )
+    decomposition_function = RequirementInsertionStrategy.decomposition_function
+    decomposition_function.cache_clear()
+    rule = strategy(tiling)
+    assert strategy.extra_parameters(tiling) == ({}, {})
+    assert strategy.decomposition_function(tiling) == rule.children
+    assert decomposition_function.cache_info().misses == 1
+    assert decomposition_function.cache_info().hits == 2
+
+
+def test_equal_strategies_share_children():
+    tiling = Tiling(
+        [GriddedCayleyPerm(CayleyPermutation([0, 1]), [(0, 0), (0, 0)])],
+        [],
+        (1, 1),
+    )
+    gcps = [GriddedCayleyPerm(CayleyPermutation([0]), [(0, 0)])]
+    decomposition_function = RequirementInsertionStrategy.decomposition_function
+    decomposition_function.cache_clear()
+    children = RequirementInsertionStrategy(gcps).decomposition_function(tiling)
+    assert RequirementInsertionStrategy(gcps).decomposition_function(tiling) == children
+    assert decomposition_function.cache_info().hits == 1
+
+
+def test_search_through_cache():
+    decomposition_function = RequirementInsertionStrategy.decomposition_function
+    decomposition_function.cache_clear()
+    vertical = VerticalSearcher("210, 012, 100").auto_search()
+    horizontal = HorizontalSearcher("210, 012, 100").auto_search()
+    assert vertical.counts(8) == horizontal.counts(8)
+    assert decomposition_function.cache_info().currsize > 0
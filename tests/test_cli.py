@@ -0,0 +1,76 @@
+import json
+import socket
+import threading
+import urllib.request
+
+from insertion_encoding.cli import WorkerPool, handle, main, make_server
+
+
+def test_check_command(capsys):
+    assert main(["check", "231, 312, 2121", "--check", "vertical"]) == 0
+    assert json.loads(capsys.readouterr().out) == {"vertical": True}
+
+
+def test_count_command(capsys, tmp_path):
+    argv = ["count", "12_11", "10", "--searcher", "vatter-horizontal"]
+    assert main(argv + ["--cache", str(tmp_path)]) == 0
+    assert json.loads(capsys.readouterr().out) == {
+        "counts": [0, 1, 1, 1, 1, 1, 1, 1, 1, 1]
+    }
+
+
+def test_invalid_requests():
+    assert "error" in handle({"command": "nope", "id": 3})
+    assert handle({"command": "nope", "id": 3})["id"] == 3
+    assert "error" in handle({"command": "count", "basis": "12_11"})
+    assert "error" in handle([])
+
+
+def test_unix_socket_server(tmp_path):
+    pool = WorkerPool(2, cache=str(tmp_path / "cache"))
+    path = str(tmp_path / "server.sock")
+    server = make_server(pool, socket_path=path)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with socket.socket(socket.AF_UNIX) as client:
+            client.connect(path)
+            stream = client.makefile("rwb")
+            for idx in range(3):
+                request = {
+                    "command": "count",
+                    "basis": "12_11",
+                    "searcher": "vatter-horizontal",
+                    "n": 5,
+                    "id": idx,
+                }
+                stream.write(json.dumps(request).encode() + b"\n")
+            stream.write(b"not json\n")
+            stream.flush()
+            responses = [json.loads(stream.readline()) for _ in range(4)]
+        assert [response["id"] for response in responses] == [0, 1, 2, None]
+        assert all(
+            response["result"]["counts"] == [0, 1, 1, 1, 1]
+            for response in responses[:3]
+        )
+        assert "error" in responses[3]
+    finally:
+        server.shutdown()
+        server.server_close()
+        pool.shutdown()
+
+
+def test_http_server():
+    pool = WorkerPool(1)
+    server = make_server(pool, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{server.server_address[1]}",
+            data=json.dumps({"command": "check", "basis": "231, 312, 2121"}).encode(),
+        )
+        with urllib.request.urlopen(request) as response:
+            assert json.loads(response.read())["result"]["vertical"] is True
+    finally:
+        server.shutdown()
+        server.server_close()
+        pool.shutdown()
@@ -0,0 +1,67 @@
+import pytest
+
+from insertion_encoding import (
+    MatchingHorizontalSearcher,
+    VatterHorizontalSearcher,
+    VerticalSearcher,
+)
+
+
+def test_counts_match_count_objects_of_size():
+    spec = VerticalSearcher("231, 312, 2121").auto_search(max_expansion_time=600)
+    counts = spec.counts(12)
+    assert counts == [spec.count_objects_of_size(i) for i in range(12)]
+    assert spec.counts(12, modulus=101) == [count % 101 for count in counts]
+
+
+def test_counts_of_configurations():
+    spec = VatterHorizontalSearcher("12_11").auto_search(max_expansion_time=6000)
+    assert spec.counts(10) == [0, 1, 1, 1, 1, 1, 1, 1, 1, 1]
+
+
+def test_counts_of_forest_specification():
+    # Found with a forest rule database, so it can use complement and
+    # quotient rules.
+    spec = MatchingHorizontalSearcher("1201,1320").auto_search(max_expansion_time=600)
+    counts = spec.counts(11)
+    assert counts == [1, 0, 1, 0, 3, 0, 12, 0, 45, 0, 165]
+    assert counts == [spec.count_objects_of_size(i) for i in range(11)]
+    assert spec.counts(11, modulus=7) == [count % 7 for count in counts]
+
+
+def test_recurrence():
+    spec = VerticalSearcher("231, 312, 2121").auto_search(max_expansion_time=600)
+    recurrence = spec.recurrence()
+    counts = spec.counts(40)
+    assert recurrence.terms(40) == counts
+    assert [recurrence.nth_term(n) for n in range(40)] == counts
+    assert recurrence.nth_term(10**4) % 1009 == spec.recurrence(1009).nth_term(
+        10**4
+    )
+
+
+def test_rational_generating_function():
+    spec = VerticalSearcher("231, 312, 2121").auto_search(max_expansion_time=600)
+    genf = spec.rational_generating_function()
+    assert genf == spec.rational_generating_function(modular=True)
+    assert genf.series(20) == spec.counts(20)
+    numerator, denominator = genf
+    assert denominator[0] == 1
+
+
+def test_asymptotics():
+    pytest.importorskip("numpy")
+    spec = VerticalSearcher("231, 312, 2121").auto_search(max_expansion_time=600)
+    growth_rate, exponent = spec.asymptotics()
+    counts = spec.counts(60)
+    assert abs(counts[-1] / counts[-2] - growth_rate) < 1e-6
+    assert exponent == 0
+
+
+@pytest.mark.parametrize("method", ["recurrence", "system"])
+def test_standalone_module(method):
+    spec = VerticalSearcher("231, 312, 2121").auto_search(max_expansion_time=600)
+    namespace: dict = {}
+    exec(spec.standalone_module(method), namespace)
+    assert namespace["counts"](30) == spec.counts(30)
+    assert namespace["count"](29) == spec.counts(30)[29]
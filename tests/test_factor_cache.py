@@ -0,0 +1,19 @@
+from cayley_permutations import CayleyPermutation
+from gridded_cayley_permutations import GriddedCayleyPerm, Tiling
+
+from insertion_encoding.tilescope.strategies.factor import find_factors
+
+
+def test_find_factors_memoised():
+    tiling = Tiling(
+        [GriddedCayleyPerm(CayleyPermutation([0, 1]), [(0, 0), (1, 1)])],
+        [],
+        (2, 2),
+    )
+    find_factors.cache_clear()
+    factors = find_factors(tiling)
+    assert find_factors(tiling) == factors
+    assert find_factors.cache_info().hits == 1
+    assert find_factors.cache_info().misses == 1
+    find_factors(tiling, rgf=True)
+    assert find_factors.cache_info().misses == 2
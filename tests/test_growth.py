@@ -0,0 +1,48 @@
+from insertion_encoding import GrowthMonitor, PartialSearchResult, VerticalSearcher
+
+
+def test_growing_measure():
+    monitor = GrowthMonitor(window=2, patience=3)
+    diagnoses = []
+    for size in range(8):
+        monitor.observe_measures({"cells": size // 2, "obstructions": 4})
+        monitor.observe_verified()
+        diagnoses.append(monitor.observe_expansion())
+    assert diagnoses[:5] == [None] * 5
+    assert "number of cells" in diagnoses[5]
+    assert monitor.maxima == {"cells": 3, "obstructions": 4}
+    assert monitor.streaks["obstructions"] == 0
+    assert len(monitor.to_jsonable()["history"]) == 4
+
+
+def test_bounded_measure():
+    monitor = GrowthMonitor(window=1, patience=2)
+    for size in [3, 1, 2, 3, 1, 2, 3]:
+        monitor.observe_measures({"length": size})
+        monitor.observe_verified()
+        assert monitor.observe_expansion() is None
+
+
+def test_unverified():
+    monitor = GrowthMonitor(window=1, patience=2, min_verified_fraction=0.5)
+    monitor.observe_measures({})
+    monitor.observe_measures({})
+    monitor.observe_verified()
+    assert monitor.observe_expansion() is None
+    for _ in range(2):
+        monitor.observe_measures({})
+        diagnosis = monitor.observe_expansion()
+    assert diagnosis.startswith("Fewer than 50%")
+
+
+def test_search_stopped_on_growth():
+    growth = GrowthMonitor(window=1, patience=1, min_verified_fraction=1.0)
+    result = VerticalSearcher("210, 012, 100", growth=growth).auto_search()
+    assert isinstance(result, PartialSearchResult)
+    assert result.exceeded == "growth"
+    assert result.statistics["maxima"] == growth.maxima
+
+
+def test_search_not_stopped():
+    spec = VerticalSearcher("210, 012, 100", growth=GrowthMonitor()).auto_search()
+    assert spec.counts(8) == VerticalSearcher("210, 012, 100").auto_search().counts(8)
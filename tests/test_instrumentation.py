@@ -0,0 +1,30 @@
+import json
+
+from insertion_encoding import HorizontalSearcher, VerticalSearcher
+
+
+def test_metrics_recorded():
+    searcher = HorizontalSearcher("210, 012, 100", instrument=True)
+    searcher.auto_search()
+    metrics = searcher.metrics.to_jsonable()
+    assert metrics
+    assert all(value["calls"] > 0 for value in metrics.values())
+    assert json.loads(searcher.metrics.to_json()) == metrics
+    prometheus = searcher.metrics.to_prometheus()
+    assert all(f'strategy="{name}"' in prometheus for name in metrics)
+
+
+def test_not_instrumented():
+    assert VerticalSearcher("210, 012, 100").metrics is None
+
+
+def test_progress_reported():
+    events = []
+    searcher = VerticalSearcher(
+        "210, 012, 100", progress=events.append, progress_interval=0
+    )
+    searcher.auto_search()
+    assert events
+    assert all(event["event"] == "progress" for event in events)
+    assert [event["expanded"] for event in events] == list(range(1, len(events) + 1))
+    assert events[-1]["classes"] >= events[0]["classes"]
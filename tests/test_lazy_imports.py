@@ -0,0 +1,53 @@
+import json
+import subprocess
+import sys
+
+import insertion_encoding
+
+SEARCHER_MODULES = [
+    "insertion_encoding.tilescope",
+    "insertion_encoding.vatters_method",
+    "insertion_encoding.enumeration",
+    "insertion_encoding.spec_cache",
+    "insertion_encoding.symmetries",
+]
+
+
+def imported_modules(statement):
+    """Returns the modules imported by the statement in a new interpreter."""
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import json, sys\n{statement}\nprint(json.dumps(list(sys.modules)))",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    return set(json.loads(output))
+
+
+def test_package_import_is_lazy():
+    modules = imported_modules("import insertion_encoding")
+    assert all(module not in modules for module in SEARCHER_MODULES)
+
+
+def test_regularity_check_import_is_lazy():
+    modules = imported_modules(
+        "from insertion_encoding import rgf_regular_horizontal_insertion_encoding"
+    )
+    assert "insertion_encoding.check_regular.check_regular_hori" in modules
+    assert "insertion_encoding.check_regular.census" not in modules
+    assert all(module not in modules for module in SEARCHER_MODULES)
+
+
+def test_lazy_attributes():
+    from insertion_encoding.tilescope import horizontal_ins_enc_searcher
+
+    assert (
+        insertion_encoding.HorizontalSearcher
+        is horizontal_ins_enc_searcher.HorizontalSearcher
+    )
+    assert set(insertion_encoding.__all__) <= set(dir(insertion_encoding))
+    assert insertion_encoding.tilescope.__name__ == "insertion_encoding.tilescope"
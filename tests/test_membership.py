@@ -0,0 +1,18 @@
+import pytest
+from cayley_permutations import Av, CayleyPermutation, string_to_basis
+
+from insertion_encoding import ConfigurationAutomaton
+
+
+@pytest.mark.parametrize(
+    "basis, encoding", [("231, 312, 2121", "vertical"), ("12_11", "horizontal")]
+)
+def test_in_class(basis, encoding):
+    automaton = ConfigurationAutomaton(basis, encoding)
+    av = Av(string_to_basis(basis))
+    for n in range(1, 6):
+        cperms = CayleyPermutation.of_size(n)
+        assert [automaton.in_class(cperm) for cperm in cperms] == [
+            av.in_class(cperm) for cperm in cperms
+        ]
+        assert set(automaton.filter(cperms)) == set(av.generate_cperms(n))
@@ -0,0 +1,45 @@
+from cayley_permutations import CayleyPermutation
+from comb_spec_searcher.strategies.strategy import strategy_from_dict
+from gridded_cayley_permutations import GriddedCayleyPerm, Tiling
+
+from insertion_encoding import HorizontalSearcher, VerticalSearcher
+from insertion_encoding.tilescope.strategies import (
+    HorizontalInsertionEncodingRequirementInsertionFactory,
+    MultiRowRequirementInsertionStrategy,
+)
+
+
+def test_combined_factory():
+    tiling = Tiling(
+        [GriddedCayleyPerm(CayleyPermutation([0, 1]), [(0, 0), (1, 1)])],
+        [],
+        (2, 2),
+    )
+    rows = list(HorizontalInsertionEncodingRequirementInsertionFactory()(tiling))
+    (strategy,) = HorizontalInsertionEncodingRequirementInsertionFactory(combined=True)(
+        tiling
+    )
+    assert len(rows) == 2
+    assert len(strategy.decomposition_function(tiling)) == 4
+    assert strategy_from_dict(strategy.to_jsonable()) == strategy
+
+
+def test_combined_children_memoised():
+    tiling = Tiling(
+        [GriddedCayleyPerm(CayleyPermutation([0, 1]), [(0, 0), (1, 1)])],
+        [],
+        (2, 2),
+    )
+    decomposition_function = MultiRowRequirementInsertionStrategy.decomposition_function
+    decomposition_function.cache_clear()
+    factory = HorizontalInsertionEncodingRequirementInsertionFactory(combined=True)
+    (strategy,) = factory(tiling)
+    (equal_strategy,) = factory(tiling)
+    children = strategy.decomposition_function(tiling)
+    assert equal_strategy.decomposition_function(tiling) == children
+    assert decomposition_function.cache_info().hits == 1
+
+
+def test_combined_search():
+    spec = HorizontalSearcher("210, 012, 100").auto_search()
+    assert spec.counts(8) == VerticalSearcher("210, 012, 100").auto_search().counts(8)
@@ -0,0 +1,52 @@
+import pytest
+
+from insertion_encoding import (
+    HorizontalSearcher,
+    MultiBasisSearcher,
+    PartialSearchResult,
+    SearchBudget,
+    SpecificationCache,
+    VerticalSearcher,
+)
+
+BASES = ["231, 312, 2121", "231, 312, 2121, 1111", "210, 012, 100", "231, 312, 2121"]
+
+
+def test_same_counts():
+    searcher = MultiBasisSearcher(VerticalSearcher, BASES)
+    specs = searcher.auto_search()
+    assert len(specs) == len(BASES)
+    for basis, spec in zip(BASES, specs):
+        assert spec.counts(8) == VerticalSearcher(basis).auto_search().counts(8)
+    assert searcher.root_labels[0] == searcher.root_labels[3]
+
+
+def test_shared_classes():
+    searcher = MultiBasisSearcher(HorizontalSearcher, ["210, 012, 100", "210, 012"])
+    searcher.auto_search()
+    separate = 0
+    for basis in ["210, 012, 100", "210, 012"]:
+        single = HorizontalSearcher(basis)
+        single.auto_search()
+        separate += len(single.comb_spec_searcher.classdb.label_to_info)
+    shared = len(searcher.comb_spec_searcher.classdb.label_to_info)
+    assert shared < separate
+
+
+def test_budget_and_cache(tmp_path):
+    cache = SpecificationCache(tmp_path)
+    VerticalSearcher("210, 012, 100", cache=cache).auto_search()
+    searcher = MultiBasisSearcher(
+        VerticalSearcher,
+        ["210, 012, 100", "231, 312, 2121"],
+        cache=cache,
+        budget=SearchBudget(max_classes=3),
+    )
+    cached, partial = searcher.auto_search()
+    assert cached.counts(6) == VerticalSearcher("210, 012, 100").auto_search().counts(6)
+    assert isinstance(partial, PartialSearchResult)
+
+
+def test_no_bases():
+    with pytest.raises(ValueError):
+        MultiBasisSearcher(VerticalSearcher, [])
@@ -0,0 +1,33 @@
+from insertion_encoding import (
+    HorizontalSearcher,
+    VatterVerticalSearcher,
+    VerticalSearcher,
+)
+from insertion_encoding.priority import PriorityQueue, expansion_cost
+
+
+def test_expansion_cost():
+    searcher = VerticalSearcher("231, 312, 2121")
+    assert expansion_cost(searcher.start_class())[0] == 1
+    config_class = VatterVerticalSearcher("231, 312, 2121").start_class()
+    assert len(expansion_cost(config_class)) == 2
+
+
+def test_same_counts():
+    for searcher_class in (VerticalSearcher, HorizontalSearcher):
+        searcher = searcher_class("210, 012, 100", priority=expansion_cost)
+        assert isinstance(searcher.comb_spec_searcher.classqueue, PriorityQueue)
+        spec = searcher.auto_search()
+        assert spec.counts(8) == searcher_class("210, 012, 100").auto_search().counts(8)
+
+
+def test_custom_priority():
+    seen = []
+
+    def priority(comb_class):
+        seen.append(comb_class)
+        return -len(comb_class.active_cells)
+
+    spec = VerticalSearcher("231, 312, 2121", priority=priority).auto_search()
+    assert seen
+    assert spec.counts(6) == [1, 1, 3, 11, 41, 151]
@@ -0,0 +1,25 @@
+import pytest
+from cayley_permutations import CayleyPermutation
+
+from insertion_encoding import ConfigurationAutomaton
+
+
+@pytest.mark.parametrize(
+    "basis, encoding", [("231, 312, 2121", "vertical"), ("12_11", "horizontal")]
+)
+def test_rank_unrank(basis, encoding):
+    automaton = ConfigurationAutomaton(basis, encoding)
+    for n in range(1, 7):
+        cperms = [automaton.unrank(rank, n) for rank in range(automaton.count(n))]
+        assert len(set(cperms)) == len(cperms)
+        assert [automaton.rank(cperm) for cperm in cperms] == list(
+            range(automaton.count(n))
+        )
+
+
+def test_rank_outside_class():
+    automaton = ConfigurationAutomaton("231, 312, 2121", "vertical")
+    with pytest.raises(ValueError):
+        automaton.rank(CayleyPermutation([1, 2, 0]))
+    with pytest.raises(ValueError):
+        automaton.unrank(automaton.count(5), 5)
@@ -0,0 +1,24 @@
+from itertools import chain, combinations
+
+from cayley_permutations import CayleyPermutation
+from check_regular_ins_enc import regular_vertical_insertion_encoding
+
+from insertion_encoding.check_regular import census
+
+
+def test_census_matches_brute_force(tmp_path):
+    patterns = list(chain(CayleyPermutation.of_size(2), CayleyPermutation.of_size(3)))
+    total = regular = 0
+    for size in range(1, len(patterns) + 1):
+        for basis in combinations(patterns, size):
+            if any(
+                patt.contains([other]) or other.contains([patt])
+                for patt, other in combinations(basis, 2)
+            ):
+                continue
+            total += 1
+            regular += regular_vertical_insertion_encoding(basis)
+    output = tmp_path / "census.jsonl"
+    tallies = census(patterns, ["vertical"], output=output, processes=2)
+    assert tallies == {"total": total, "any": regular, "vertical": regular}
+    assert census(patterns, ["vertical"], output=output) == tallies
@@ -1,8 +1,17 @@
+from cayley_permutations import CayleyPermutation
+
 from insertion_encoding import rgf_regular_vertical_insertion_encoding
+from insertion_encoding.check_regular import rgf_vert_regular_check
 from insertion_encoding.check_regular.rgf_vert_regular_check import (
+    FULL_MASK,
+    PREDICATES,
+    _pattern_mask,
     greedy_grid_left,
     grid_inc_con,
     grid_inc_dec,
+    load_predicate_table,
+    pattern_mask,
+    write_predicate_table,
 )
 
 
@@ -22,3 +31,43 @@ def test_bases():
     assert rgf_regular_vertical_insertion_encoding(basis)
     basis = "120, 110, 000"
     assert rgf_regular_vertical_insertion_encoding(basis)
+
+
+def test_predicate_table(tmp_path):
+    path = tmp_path / "predicates.json"
+    write_predicate_table(path, max_length=4)
+    load_predicate_table(path)
+    assert pattern_mask([0, 1]) | pattern_mask([1, 0]) == FULL_MASK
+    assert pattern_mask([0, 0, 1, 0]) == _pattern_mask((0, 0, 1, 0))
+
+
+def test_single_pass_mask():
+    for length in range(7):
+        for cperm in CayleyPermutation.of_size(length):
+            seq = list(cperm)
+            expected = sum(
+                1 << bit
+                for bit, (_, predicate) in enumerate(PREDICATES)
+                if predicate(seq)
+            )
+            assert _pattern_mask(tuple(cperm)) == expected
+
+
+def test_predicate_table_loaded_on_first_use(tmp_path, monkeypatch):
+    path = tmp_path / "predicate_table.json"
+    write_predicate_table(path, max_length=3)
+    monkeypatch.setattr(rgf_vert_regular_check, "PREDICATE_TABLE_PATH", path)
+    monkeypatch.setattr(rgf_vert_regular_check, "_PREDICATE_TABLE", {})
+    monkeypatch.setattr(rgf_vert_regular_check, "_TABLE_LOADED", False)
+    assert pattern_mask([1, 0]) == _pattern_mask((1, 0))
+    assert (0, 1, 0) in rgf_vert_regular_check._PREDICATE_TABLE
+
+
+def test_stale_predicate_table_ignored(tmp_path, monkeypatch):
+    path = tmp_path / "predicate_table.json"
+    path.write_text('{"predicates": [], "max_length": 0, "masks": {"": 0}}')
+    monkeypatch.setattr(rgf_vert_regular_check, "PREDICATE_TABLE_PATH", path)
+    monkeypatch.setattr(rgf_vert_regular_check, "_PREDICATE_TABLE", {})
+    monkeypatch.setattr(rgf_vert_regular_check, "_TABLE_LOADED", False)
+    assert pattern_mask([0, 1]) == _pattern_mask((0, 1))
+    assert not rgf_vert_regular_check._PREDICATE_TABLE
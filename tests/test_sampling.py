@@ -0,0 +1,27 @@
+from collections import Counter
+
+from cayley_permutations import Av, string_to_basis
+
+from insertion_encoding import ConfigurationAutomaton, Sampler
+
+
+def test_automaton_counts():
+    basis = "231, 312, 2121"
+    automaton = ConfigurationAutomaton(basis, "vertical")
+    assert [automaton.count(n) for n in range(1, 8)] == [1, 3, 11, 41, 151, 553, 2023]
+
+
+def test_samples_are_uniform():
+    basis = "231, 312, 2121"
+    sampler = Sampler(ConfigurationAutomaton(basis, "vertical"), seed=0)
+    samples = Counter(sampler.samples(4, 4100))
+    av = Av(string_to_basis(basis))
+    assert set(samples) == set(av.generate_cperms(4))
+    assert all(50 < count < 150 for count in samples.values())
+
+
+def test_large_samples():
+    sampler = Sampler(ConfigurationAutomaton("231, 312, 2121", "vertical"), seed=0)
+    assert all(len(cperm) == 1000 for cperm in sampler.samples(1000, 5))
+    cperm = sampler.boltzmann(200, tolerance=0.2)
+    assert 160 <= len(cperm) <= 240
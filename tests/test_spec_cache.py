@@ -0,0 +1,45 @@
+from insertion_encoding import SpecificationCache, VerticalSearcher
+from insertion_encoding.spec_cache import canonical_basis
+
+
+def test_canonical_basis():
+    assert canonical_basis("10, 01, 012") == canonical_basis("01, 10")
+    assert canonical_basis("210, 012, 100") == canonical_basis("012, 100, 210")
+
+
+def test_cache_counts(tmp_path):
+    cache = SpecificationCache(tmp_path)
+    pack = VerticalSearcher("210, 012, 100").pack()
+    key = SpecificationCache.key(canonical_basis("210, 012, 100"), "vertical", pack)
+    assert key == SpecificationCache.key(
+        canonical_basis("100, 210, 012"), "vertical", pack
+    )
+    assert key != SpecificationCache.key(
+        canonical_basis("100, 210, 012"), "horizontal", pack
+    )
+    assert key not in cache
+    cache.store_counts(key, [1, 1, 3])
+    cache.store_counts(key, [1, 1])
+    assert cache.get_counts(key) == [1, 1, 3]
+    assert cache.get_specification(key) is None
+
+
+def test_searcher_uses_cache(tmp_path):
+    cache = SpecificationCache(tmp_path)
+    counts = VerticalSearcher("210, 012, 100", cache=cache).counts(6)
+    searcher = VerticalSearcher("100, 012, 210", cache=cache)
+    assert searcher.counts(6) == counts
+    assert "comb_spec_searcher" not in searcher.__dict__
+
+
+def test_symmetric_bases_share_counts_only(tmp_path):
+    cache = SpecificationCache(tmp_path)
+    searcher = VerticalSearcher("210, 012, 100", cache=cache)
+    counts = searcher.counts(6)
+    reverse = VerticalSearcher("012, 210, 001", cache=cache)
+    assert reverse.counts_key() == searcher.counts_key()
+    assert reverse.cache_key() != searcher.cache_key()
+    assert reverse.counts(6) == counts
+    assert "comb_spec_searcher" not in reverse.__dict__
+    spec = reverse.auto_search()
+    assert spec.root == reverse.start_class()
@@ -0,0 +1,47 @@
+from cayley_permutations import CayleyPermutation
+
+from insertion_encoding import RGFVerticalSearcher, VerticalSearcher
+
+from insertion_encoding.spec_cache import canonical_basis
+from insertion_encoding.symmetries import (
+    SYMMETRIES,
+    count_symmetries,
+    encoding_symmetries,
+    group_by_orbit,
+    representative,
+    search_orbits,
+    symmetric_basis,
+)
+
+
+def test_symmetries_are_involutions():
+    for cperm in CayleyPermutation.of_size(4):
+        for symmetry in SYMMETRIES.values():
+            assert symmetry(symmetry(cperm)) == cperm
+
+
+def test_orbits():
+    bases = ["012, 100", "210, 001", "210, 011", "012, 011"]
+    orbits = group_by_orbit(bases)
+    assert len(orbits) == 2
+    assert sorted(map(len, orbits.values())) == [1, 3]
+    rep, symmetry = representative("210, 001")
+    assert symmetric_basis("210, 001", symmetry) == rep
+    assert representative("210, 001", ("identity",))[0] == canonical_basis("210, 001")
+
+
+def test_encoding_symmetries():
+    assert encoding_symmetries(VerticalSearcher) == ("identity", "reverse")
+    assert encoding_symmetries(RGFVerticalSearcher) == ("identity",)
+    assert count_symmetries(VerticalSearcher) == tuple(SYMMETRIES)
+    assert count_symmetries(RGFVerticalSearcher) == ("identity",)
+
+
+def test_search_orbits_counts():
+    # The reverse and complement of the first basis are in its orbit.
+    bases = ["210, 012, 100", "012, 210, 001", "012, 210, 011"]
+    assert len(group_by_orbit(bases, count_symmetries(VerticalSearcher))) == 1
+    counts = search_orbits(VerticalSearcher, bases, 8)
+    assert len(counts) == 3
+    expected = VerticalSearcher("210, 012, 100").counts(8)
+    assert all(orbit_counts == expected for orbit_counts in counts.values())
@@ -0,0 +1,25 @@
+from insertion_encoding import HorizontalSearcher, VerticalSearcher
+
+
+def test_extended_vertical():
+    searcher = VerticalSearcher("231, 312, 2121")
+    searcher.auto_search()
+    extended = searcher.extended("1111")
+    assert len(extended.basis) == 4
+    fresh = VerticalSearcher("231, 312, 2121, 1111")
+    assert fresh.warm_start(searcher.comb_spec_searcher) > 0
+    assert extended.auto_search().counts(9) == fresh.auto_search().counts(9)
+
+
+def test_extended_horizontal():
+    searcher = HorizontalSearcher("210, 012, 100")
+    searcher.auto_search()
+    extended = searcher.extended("000")
+    cold = HorizontalSearcher("210, 012, 100, 000").auto_search()
+    assert extended.auto_search().counts(8) == cold.counts(8)
+
+
+def test_not_searched():
+    extended = VerticalSearcher("231, 312, 2121").extended("1111", instrument=True)
+    assert extended.instrument
+    assert "comb_spec_searcher" not in extended.__dict__